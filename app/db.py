@@ -1,3 +1,258 @@
+"""
+Paylaşılan Prisma client'ı, sorgu ölçümü yapan ince bir proxy ile sarılı.
+
+db.user.find_unique(...), db.code.update_many(...), db.query_first(...) gibi her
+çağrının süresi ve adı:
+  - istek bazında bir contextvar'a (QueryStats) yazılır, middleware bunu
+    debug header'larına / metriklere çevirir (bkz. app/utils/middleware.py)
+  - add_query_listener ile kayıtlı dinleyicilere bildirilir (metrikler,
+    testlerdeki query_budget fixture'ı)
+
+Attribute atamaları (testlerdeki monkeypatch.setattr(db, "user", ...)) asıl
+client'a yazılır; proxy okurken yeniden sarar.
+
+Backend DB_BACKEND ile seçilir:
+
+    DB_BACKEND=postgres   Prisma query engine (varsayılan)
+    DB_BACKEND=memory     bellekteki stand-in, app/memory_db.py (testler, benchmark'lar)
+
+Postgres'te havuz ve timeout ayarları DATABASE_URL'e query parametresi olarak
+eklenir (URL'de zaten verilmişse URL'deki kalır):
+
+    DB_POOL_SIZE                 connection_limit (0: Prisma varsayılanı, cpu * 2 + 1)
+    DB_POOL_TIMEOUT_SECONDS      havuzdan bağlantı bekleme süresi, pool_timeout
+    DB_CONNECT_TIMEOUT_SECONDS   connect_timeout, ayrıca query engine'in açılması
+    DB_QUERY_TIMEOUT_SECONDS     socket_timeout, ayrıca engine'e giden HTTP isteği
+
+Okuma replica'sı için bkz. app/replica.py; yazma yapan istekler QueryStats.wrote
+ile işaretlenir, o istekteki okumalar primary'de kalır.
+"""
+
+import inspect
+import os
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 from prisma import Client
 
-db = Client()
+DB_BACKEND = os.getenv("DB_BACKEND", "postgres")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "0"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+DB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+DB_QUERY_TIMEOUT_SECONDS = float(os.getenv("DB_QUERY_TIMEOUT_SECONDS", "30"))
+
+# Model dışında ölçülen client metotları
+RAW_METHODS = frozenset({"query_raw", "query_first", "execute_raw"})
+# Primary'de çağrılınca isteği "yazdı" sayan metotlar. Raw SQL'ler (auth akışı)
+# yazıyor, hepsi yazma sayılır.
+WRITE_METHODS = frozenset(
+    {
+        "create",
+        "create_many",
+        "update",
+        "update_many",
+        "upsert",
+        "delete",
+        "delete_many",
+        *RAW_METHODS,
+    }
+)
+
+QueryListener = Callable[[str, float], None]
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    operations: Counter = field(default_factory=Counter)
+    # istek primary'e yazdı mı (read-your-writes, bkz. app/replica.py)
+    wrote: bool = False
+
+    def record(self, operation: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.operations[operation] += 1
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_listeners: list[QueryListener] = []
+# model adı -> bu process'te primary'e son yazma zamanı (monotonic); raw SQL "*"
+_last_writes: dict[str, float] = {}
+
+
+def start_query_stats() -> QueryStats:
+    """Mevcut context (istek) için yeni bir sayaç başlatır."""
+    stats = QueryStats()
+    _query_stats.set(stats)
+    return stats
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    _listeners.append(listener)
+
+
+def remove_query_listener(listener: QueryListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _record(operation: str, seconds: float) -> None:
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(operation, seconds)
+    for listener in _listeners:
+        listener(operation, seconds)
+
+
+def last_write_at(model: str) -> float:
+    """Bu process'te model'e (ya da raw SQL ile herhangi bir tabloya) son yazma."""
+    return max(
+        _last_writes.get(model, float("-inf")), _last_writes.get("*", float("-inf"))
+    )
+
+
+def _mark_write(model: str) -> None:
+    _last_writes[model] = time.monotonic()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.wrote = True
+
+
+def _timed(operation: str, fn, writes: str | None = None):
+    async def call(*args, **kwargs):
+        if writes is not None:
+            _mark_write(writes)
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _record(operation, time.perf_counter() - started)
+
+    call.__wrapped__ = fn
+    return call
+
+
+class InstrumentedModel:
+    """db.<model> sarmalayıcısı; async metotlar ölçülerek çağrılır."""
+
+    def __init__(self, name: str, target, label: str = "", primary: bool = True):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_methods", {})
+        object.__setattr__(self, "_label", label)
+        object.__setattr__(self, "_primary", primary)
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._target, attr)
+        if attr.startswith("_") or not inspect.iscoroutinefunction(value):
+            return value
+        cached = self._methods.get(attr)
+        if cached is None or cached.__wrapped__ != value:
+            cached = self._methods[attr] = _timed(
+                f"{self._label}{self._name}.{attr}",
+                value,
+                writes=self._name if self._primary and attr in WRITE_METHODS else None,
+            )
+        return cached
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._target, attr, getattr(value, "__wrapped__", value))
+        self._methods.pop(attr, None)
+
+
+class InstrumentedClient:
+    """
+    label sorgu adlarının önüne eklenir (replica için "replica."). primary=False
+    olan client'taki çağrılar isteği yazmış saymaz.
+    """
+
+    def __init__(self, client, label: str = "", primary: bool = True):
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "_models", {})
+        object.__setattr__(self, "_label", label)
+        object.__setattr__(self, "_primary", primary)
+
+    def __getattr__(self, name: str):
+        value = getattr(self._client, name)
+        if name.startswith("_"):
+            return value
+        if name in RAW_METHODS:
+            writes = "*" if self._primary else None
+            return _timed(f"{self._label}raw.{name}", value, writes=writes)
+        if callable(value) or isinstance(value, (str, bytes, int, float, bool)):
+            return value
+
+        cached = self._models.get(name)
+        if cached is None or cached._target is not value:
+            cached = self._models[name] = InstrumentedModel(
+                name, value, self._label, self._primary
+            )
+        return cached
+
+    def __setattr__(self, name: str, value) -> None:
+        if isinstance(value, InstrumentedModel):
+            value = value._target
+        setattr(self._client, name, getattr(value, "__wrapped__", value))
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._client, name)
+        self._models.pop(name, None)
+
+    def swap_client(self, client):
+        """Asıl client'ı değiştirir, öncekini döner (testlerde memory backend)."""
+        previous = self._client
+        object.__setattr__(self, "_client", client)
+        self._models.clear()
+        return previous
+
+
+def _seconds(value: float) -> str:
+    # Prisma URL parametreleri tam saniye
+    return str(max(round(value), 1))
+
+
+def datasource_url(url: str | None) -> str | None:
+    """DATABASE_URL'e havuz / timeout parametrelerini ekler."""
+    if not url:
+        return url
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    defaults = {
+        "pool_timeout": _seconds(DB_POOL_TIMEOUT_SECONDS),
+        "connect_timeout": _seconds(DB_CONNECT_TIMEOUT_SECONDS),
+        "socket_timeout": _seconds(DB_QUERY_TIMEOUT_SECONDS),
+    }
+    if DB_POOL_SIZE > 0:
+        defaults["connection_limit"] = str(DB_POOL_SIZE)
+    for key, value in defaults.items():
+        params.setdefault(key, value)
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def create_client(url: str | None = None):
+    """url verilmezse DATABASE_URL (schema.prisma'daki datasource) kullanılır."""
+    if DB_BACKEND == "memory":
+        from app.memory_db import MemoryClient
+
+        return MemoryClient()
+    options = {
+        "connect_timeout": timedelta(seconds=DB_CONNECT_TIMEOUT_SECONDS),
+        "http": {"timeout": DB_QUERY_TIMEOUT_SECONDS},
+    }
+    url = datasource_url(url or os.getenv("DATABASE_URL"))
+    if url:
+        options["datasource"] = {"url": url}
+    return Client(**options)
+
+
+db = InstrumentedClient(create_client())
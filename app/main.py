@@ -1,19 +1,59 @@
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from contextlib import asynccontextmanager
 from app.db import db
-from app.routers.index import setup_app
+from app.modules.health.health_controller import (
+    check_manual_indexes,
+    readiness,
+    warm_up_db,
+)
+from app.modules.user import user_controller
+from app.modules.user.user_schema import UserPage
+from app.replica import replica
+from app.utils.email_outbox import email_outbox
+from app.utils.pubsub import hub
+from app.utils.sweeper import sweeper
+from app.routers.index import setup_app, warm_up_routes
+from app.utils.openapi import use_openapi_cache
+from app.utils.responses import FastJSONResponse, model_response
+from app.utils.security import require_roles
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db.connect()
+    # DATABASE_REPLICA_URL yoksa bir şey yapmaz; replica açılamazsa okumalar primary'de
+    await replica.connect()
+    await email_outbox.start()
+    await hub.start()
+    sweeper.start()
+    await warm_up_routes(app)
+    # havuzu aç, sıcak sorguları hazırla; /readyz ancak bundan sonra 200 döner
+    await warm_up_db()
+    # schema.prisma dışındaki partial index'ler eksikse uyarır
+    await check_manual_indexes()
+    readiness.mark_started()
     yield
+    readiness.mark_stopping()
+    await sweeper.stop()
+    # açık SSE bağlantıları kapanır
+    await hub.stop()
+    # kuyruktaki mailleri gönder, sonra kapat
+    await email_outbox.stop()
+    await replica.disconnect()
     await db.disconnect()
 
-app = FastAPI(title="AI Website Backend", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="AI Website Backend",
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson varsa onunla encode eder (app/utils/responses.py)
+    default_response_class=FastJSONResponse,
+)
 
 # Bütün uygulamayı bu metot başlatıyor routers, headers, vs.
 setup_app(app)
+# OPENAPI_CACHE_PATH verildiyse /openapi.json build'de üretilen dosyadan gelir
+use_openapi_cache(app)
 
 
 @app.get("/")
@@ -21,10 +61,16 @@ def root():
     return {"message": "API is working!"}
 
 
-@app.get("/prisma-users")
-async def get_prisma_users():
-    users = await db.user.find_many()
-    return users
+@app.get("/prisma-users", response_model=UserPage, deprecated=True)
+async def get_prisma_users(
+    cursor: int | None = None,
+    limit: int = 50,
+    current_user=Depends(require_roles("ADMIN")),
+):
+    # Eski endpoint: artık sınırsız find_many yerine /users ile aynı sayfayı
+    # (items + nextCursor) döner. Tam liste için /users/export kullanılmalı.
+    page = await user_controller.list_users(cursor, max(limit, 1))
+    return model_response(page, UserPage)
 
 
 @app.get("/ping")
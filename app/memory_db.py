@@ -0,0 +1,727 @@
+"""
+Prisma client'ının bu uygulamanın kullandığı alt kümesini bellekte taklit eden
+backend. DB_BACKEND=memory ile seçilir (bkz. app/db.py); testler ve
+benchmark'lar bütün akışı Postgres olmadan çalıştırabilsin diye var.
+
+Modeller, alanlar, varsayılanlar, unique alanlar ve ilişkiler
+prisma/schema.prisma'dan okunur, elle tutulan ayrı bir tanım yok.
+
+Desteklenenler:
+  - find_unique / find_first / find_many / count / group_by
+  - create / update / update_many / delete / delete_many
+  - where: eşitlik, None, equals / not / in / not_in / gt / gte / lt / lte /
+    contains / startswith / endswith, AND / OR / NOT
+  - update data'sında set / increment / decrement / multiply / divide
+  - order (dict ya da dict listesi), take / skip, include (ilişkiler)
+  - query_first / query_raw: sadece RAW_HANDLERS'ta karşılığı olan SQL'ler
+    (app/modules/auth/auth_queries.py, app/modules/health/health_queries.py)
+
+Unique alanlar (@id, @unique, @@unique) için hash index tutulur; where'de
+unique bir alana eşitlik ya da "in" varsa tablo taranmaz. Foreign key ve
+cascade kontrolü yok. İşlemlerin gövdesinde await olmadığı için her çağrı
+event loop'ta atomik çalışır (Postgres'teki tek statement gibi).
+"""
+
+import asyncio
+import operator
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+from prisma.errors import UniqueViolationError
+
+from app.modules.auth.auth_queries import (
+    REVOKE_USER_SESSIONS_SQL,
+    ROTATE_REFRESH_TOKEN_SQL,
+    SEND_CODE_SQL,
+    SIGNIN_SQL,
+)
+from app.modules.health.health_queries import (
+    MISSING_INDEXES_SQL,
+    PING_SQL,
+    REPLICA_LAG_SQL,
+)
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "prisma" / "schema.prisma"
+
+_MODEL_RE = re.compile(r"^model\s+(\w+)\s*\{(.*?)^\}", re.MULTILINE | re.DOTALL)
+_FIELD_RE = re.compile(r"^(\w+)\s+(\w+)(\[\])?(\?)?(.*)$")
+_DEFAULT_RE = re.compile(r"@default\(([^()]*(?:\(\))?)\)")
+_RELATION_RE = re.compile(
+    r"@relation\([^)]*fields:\s*\[([^\]]*)\][^)]*references:\s*\[([^\]]*)\]"
+)
+_UNIQUE_RE = re.compile(r"^@@(?:unique|id)\(\[([^\]]*)\]")
+
+_COMPARE = {
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+}
+_UPDATE_OPS = {
+    "increment": operator.add,
+    "decrement": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+}
+
+Row = dict
+# (client, parametreler)
+RawHandler = Callable[["MemoryClient", tuple], list[dict]]
+
+
+# ========== ŞEMA ==========
+
+
+@dataclass
+class Relation:
+    model: str
+    many: bool
+    # hedef satırlar: target[remote[i]] == self[local[i]]
+    local: tuple[str, ...] = ()
+    remote: tuple[str, ...] = ()
+
+
+@dataclass
+class FieldSpec:
+    name: str
+    optional: bool = False
+    is_list: bool = False
+    default: Callable[[], object] | None = None
+    autoincrement: bool = False
+    updated_at: bool = False
+
+
+@dataclass
+class ModelSpec:
+    name: str
+    fields: dict[str, FieldSpec] = field(default_factory=dict)
+    id_field: str = "id"
+    unique: list[tuple[str, ...]] = field(default_factory=list)
+    relations: dict[str, Relation] = field(default_factory=dict)
+
+
+def _now() -> datetime:
+    return _plain(datetime.now(timezone.utc))
+
+
+def _split_names(raw: str) -> tuple[str, ...]:
+    # "createdAt(sort: Desc), id" -> ("createdAt", "id")
+    return tuple(part.split("(")[0].strip() for part in raw.split(",") if part.strip())
+
+
+def _default_factory(expr: str) -> Callable[[], object]:
+    if expr == "now()":
+        return _now
+    if expr in ("true", "false"):
+        return lambda: expr == "true"
+    if re.fullmatch(r"-?\d+", expr):
+        return lambda: int(expr)
+    if re.fullmatch(r"-?\d+\.\d+", expr):
+        return lambda: float(expr)
+    # "metin" ya da enum değeri (STUDENT)
+    return lambda: expr.strip('"')
+
+
+@lru_cache
+def load_schema(path: Path = SCHEMA_PATH) -> dict[str, ModelSpec]:
+    text = path.read_text(encoding="utf-8")
+    blocks = {name: body for name, body in _MODEL_RE.findall(text)}
+    models: dict[str, ModelSpec] = {}
+    for name, body in blocks.items():
+        spec = models[name] = ModelSpec(name)
+        for line in body.splitlines():
+            line = line.split("//")[0].strip()
+            unique = _UNIQUE_RE.match(line)
+            if unique:
+                spec.unique.append(_split_names(unique.group(1)))
+                continue
+            match = _FIELD_RE.match(line)
+            if not match:
+                continue
+            fname, ftype, is_list, optional, attrs = match.groups()
+            if ftype in blocks:
+                relation = _RELATION_RE.search(attrs)
+                spec.relations[fname] = Relation(ftype, bool(is_list))
+                if relation:
+                    spec.relations[fname].local = _split_names(relation.group(1))
+                    spec.relations[fname].remote = _split_names(relation.group(2))
+                continue
+
+            fspec = spec.fields[fname] = FieldSpec(
+                fname, optional=bool(optional), is_list=bool(is_list)
+            )
+            default = _DEFAULT_RE.search(attrs)
+            if default and default.group(1) == "autoincrement()":
+                fspec.autoincrement = True
+            elif default:
+                fspec.default = _default_factory(default.group(1))
+            elif is_list:
+                fspec.default = list
+            fspec.updated_at = "@updatedAt" in attrs
+            if "@id" in attrs:
+                spec.id_field = fname
+                spec.unique.append((fname,))
+            elif "@unique" in attrs:
+                spec.unique.append((fname,))
+
+    # karşı taraf (fields'sız) ilişkileri, ileri ilişkinin tersi
+    for spec in models.values():
+        for relation in spec.relations.values():
+            if relation.local:
+                continue
+            for other in models[relation.model].relations.values():
+                if other.model == spec.name and other.local:
+                    relation.local, relation.remote = other.remote, other.local
+                    break
+    return models
+
+
+# ========== DEĞERLER / FİLTRELER ==========
+
+
+def _plain(value):
+    """Enum -> değeri, datetime -> UTC ve milisaniye (timestamp(3) gibi)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _check(value, filters: dict) -> bool:
+    for op, arg in filters.items():
+        if op == "mode":
+            continue
+        if op == "not":
+            if isinstance(arg, dict):
+                ok = not _check(value, arg)
+            else:
+                # SQL'deki gibi: NULL hiçbir değere "eşit değil" sayılmaz
+                ok = value is not None and (arg is None or value != _plain(arg))
+        elif op == "equals":
+            ok = value == _plain(arg)
+        elif op == "in":
+            ok = value in _plain(arg)
+        elif op == "not_in":
+            ok = value is not None and value not in _plain(arg)
+        elif op in _COMPARE:
+            ok = value is not None and _COMPARE[op](value, _plain(arg))
+        elif op == "contains":
+            ok = value is not None and arg in value
+        elif op == "startswith":
+            ok = value is not None and value.startswith(arg)
+        elif op == "endswith":
+            ok = value is not None and value.endswith(arg)
+        elif op == "has":
+            ok = value is not None and _plain(arg) in value
+        else:
+            raise NotImplementedError(f"memory backend: unsupported filter {op!r}")
+        if not ok:
+            return False
+    return True
+
+
+def _matches(row: Row, where: dict | None) -> bool:
+    for key, cond in (where or {}).items():
+        if key == "AND":
+            ok = all(_matches(row, w) for w in _as_list(cond))
+        elif key == "OR":
+            ok = any(_matches(row, w) for w in _as_list(cond))
+        elif key == "NOT":
+            ok = not any(_matches(row, w) for w in _as_list(cond))
+        elif key not in row:
+            raise NotImplementedError(f"memory backend: cannot filter on {key!r}")
+        elif isinstance(cond, dict):
+            ok = _check(row[key], cond)
+        else:
+            ok = row[key] == _plain(cond)
+        if not ok:
+            return False
+    return True
+
+
+def _sort_key(value):
+    # Postgres gibi: NULL'lar artan sırada sonda, azalan sırada başta
+    return (value is None, value)
+
+
+def _sort(rows: list[Row], order) -> list[Row]:
+    for spec in reversed(_as_list(order)):
+        for name, direction in reversed(list(spec.items())):
+            rows.sort(
+                key=lambda r, n=name: _sort_key(r[n]), reverse=direction == "desc"
+            )
+    return rows
+
+
+def _unique_violation(model: str, fields: tuple[str, ...]) -> UniqueViolationError:
+    return UniqueViolationError(
+        {
+            "user_facing_error": {
+                "error_code": "P2002",
+                "message": f"Unique constraint failed on {model}({', '.join(fields)})",
+                "meta": {"target": list(fields)},
+            }
+        }
+    )
+
+
+# ========== TABLO ==========
+
+
+class MemoryModel:
+    """db.<model>; satırlar birincil anahtara göre dict'te tutulur."""
+
+    def __init__(self, client: "MemoryClient", spec: ModelSpec):
+        self._client = client
+        self._spec = spec
+        self._rows: dict[object, Row] = {}
+        self._indexes: dict[tuple[str, ...], dict[tuple, object]] = {
+            key: {} for key in spec.unique
+        }
+        self._next_id = 1
+
+    # ---- senkron çekirdek (raw handler'lar da bunları kullanır) ----
+
+    def _clear(self) -> None:
+        self._rows.clear()
+        for index in self._indexes.values():
+            index.clear()
+        self._next_id = 1
+
+    def _index_key(self, row: Row, key: tuple[str, ...]) -> tuple | None:
+        values = tuple(row.get(f) for f in key)
+        # SQL'deki gibi NULL'lar birbirinin kopyası sayılmaz
+        return None if None in values else values
+
+    def _candidates(self, where: dict | None) -> list[Row]:
+        """Unique bir alana eşitlik / "in" varsa index'ten, yoksa tam tarama."""
+        for key, index in self._indexes.items():
+            if len(key) != 1 or key[0] not in (where or {}):
+                continue
+            cond = where[key[0]]
+            if isinstance(cond, dict):
+                if set(cond) == {"in"}:
+                    values = _plain(cond["in"])
+                elif set(cond) == {"equals"}:
+                    values = [_plain(cond["equals"])]
+                else:
+                    continue
+            elif cond is None:
+                continue
+            else:
+                values = [_plain(cond)]
+            pks = (index.get((v,)) for v in dict.fromkeys(values))
+            return [self._rows[pk] for pk in pks if pk is not None]
+        return list(self._rows.values())
+
+    def _select(
+        self,
+        where: dict | None = None,
+        order=None,
+        take: int | None = None,
+        skip: int | None = None,
+    ) -> list[Row]:
+        rows = [r for r in self._candidates(where) if _matches(r, where)]
+        if order:
+            rows = _sort(rows, order)
+        if skip:
+            rows = rows[skip:]
+        if take is not None:
+            rows = rows[:take]
+        return rows
+
+    def _unique_row(self, where: dict) -> Row | None:
+        where = dict(where)
+        for key in self._spec.unique:
+            # bileşik unique: {"projectId_userId": {"projectId": 1, "userId": 2}}
+            compound = "_".join(key)
+            if len(key) > 1 and isinstance(where.get(compound), dict):
+                where.update(where.pop(compound))
+        for key, index in self._indexes.items():
+            if all(f in where and not isinstance(where[f], dict) for f in key):
+                pk = index.get(tuple(_plain(where[f]) for f in key))
+                row = self._rows.get(pk) if pk is not None else None
+                # extended where-unique: kalan alanlar da tutmalı
+                return row if row is not None and _matches(row, where) else None
+        raise ValueError(
+            f"{self._spec.name}: where must include a unique field, got {list(where)}"
+        )
+
+    def _check_unique(self, row: Row, pk) -> None:
+        for key, index in self._indexes.items():
+            value = self._index_key(row, key)
+            if value is not None and index.get(value, pk) != pk:
+                raise _unique_violation(self._spec.name, key)
+
+    def _store(self, pk, row: Row, old: Row | None = None) -> None:
+        for key, index in self._indexes.items():
+            if old is not None:
+                index.pop(self._index_key(old, key), None)
+            value = self._index_key(row, key)
+            if value is not None:
+                index[value] = pk
+        self._rows[pk] = row
+
+    def _insert(self, data: dict) -> Row:
+        spec = self._spec
+        unknown = data.keys() - spec.fields.keys()
+        if unknown:
+            raise NotImplementedError(
+                f"memory backend: nested writes are not supported ({sorted(unknown)})"
+            )
+        row: Row = {}
+        for name, fspec in spec.fields.items():
+            if name in data:
+                row[name] = _plain(data[name])
+                if fspec.autoincrement:
+                    self._next_id = max(self._next_id, row[name] + 1)
+            elif fspec.autoincrement:
+                row[name] = self._next_id
+                self._next_id += 1
+            elif fspec.updated_at:
+                row[name] = _now()
+            elif fspec.default is not None:
+                row[name] = fspec.default()
+            elif fspec.optional:
+                row[name] = None
+            else:
+                raise ValueError(f"{spec.name}.{name} is required")
+
+        pk = row[spec.id_field]
+        self._check_unique(row, pk)
+        self._store(pk, row)
+        return row
+
+    def _update_row(self, row: Row, data: dict) -> Row:
+        spec = self._spec
+        new = dict(row)
+        for name, value in data.items():
+            if name not in spec.fields:
+                raise NotImplementedError(
+                    f"memory backend: nested writes are not supported ({name!r})"
+                )
+            if isinstance(value, dict):
+                for op, arg in value.items():
+                    if op == "set":
+                        new[name] = _plain(arg)
+                    elif op in _UPDATE_OPS:
+                        new[name] = _UPDATE_OPS[op](new[name], arg)
+                    else:
+                        raise NotImplementedError(
+                            f"memory backend: unsupported update {op!r}"
+                        )
+            else:
+                new[name] = _plain(value)
+        for fspec in spec.fields.values():
+            if fspec.updated_at and fspec.name not in data:
+                new[fspec.name] = _now()
+
+        pk = row[spec.id_field]
+        if new[spec.id_field] != pk:
+            raise NotImplementedError("memory backend: primary keys are immutable")
+        self._check_unique(new, pk)
+        self._store(pk, new, old=row)
+        return new
+
+    def _delete_row(self, row: Row) -> None:
+        for key, index in self._indexes.items():
+            index.pop(self._index_key(row, key), None)
+        del self._rows[row[self._spec.id_field]]
+
+    def _record(self, row: Row, include: dict | None = None) -> SimpleNamespace:
+        data = {k: list(v) if isinstance(v, list) else v for k, v in row.items()}
+        # Prisma gibi: include edilmeyen ilişkiler None
+        for name in self._spec.relations:
+            data[name] = None
+        for name, arg in (include or {}).items():
+            if arg:
+                data[name] = self._related(row, name, arg)
+        return SimpleNamespace(**data)
+
+    def _related(self, row: Row, name: str, arg):
+        relation = self._spec.relations.get(name)
+        if relation is None:
+            raise ValueError(f"{self._spec.name} has no relation {name!r}")
+        target = getattr(self._client, relation.model.lower())
+        nested = arg.get("include") if isinstance(arg, dict) else None
+        if not relation.local:
+            # örtük many-to-many (Idea.owners) tutulmuyor
+            return [] if relation.many else None
+        where = {r: row[f] for f, r in zip(relation.local, relation.remote)}
+        if None in where.values():
+            rows = []
+        else:
+            rows = target._select(where)
+        records = [target._record(r, nested) for r in rows]
+        if relation.many:
+            return records
+        return records[0] if records else None
+
+    # ---- Prisma API ----
+
+    async def find_unique(self, where: dict, include: dict | None = None):
+        row = self._unique_row(where)
+        return self._record(row, include) if row is not None else None
+
+    async def find_first(
+        self,
+        where: dict | None = None,
+        order=None,
+        skip: int | None = None,
+        include: dict | None = None,
+    ):
+        rows = self._select(where, order, take=1, skip=skip)
+        return self._record(rows[0], include) if rows else None
+
+    async def find_many(
+        self,
+        where: dict | None = None,
+        order=None,
+        take: int | None = None,
+        skip: int | None = None,
+        include: dict | None = None,
+    ) -> list:
+        return [
+            self._record(r, include) for r in self._select(where, order, take, skip)
+        ]
+
+    async def count(self, where: dict | None = None) -> int:
+        return len(self._select(where))
+
+    async def group_by(
+        self, by: list[str], where: dict | None = None, count: bool = False
+    ) -> list[dict]:
+        groups = Counter(tuple(r[f] for f in by) for r in self._select(where))
+        results = []
+        for key, n in groups.items():
+            result = dict(zip(by, key))
+            if count:
+                result["_count"] = {"_all": n}
+            results.append(result)
+        return results
+
+    async def create(self, data: dict, include: dict | None = None):
+        return self._record(self._insert(data), include)
+
+    async def update(self, where: dict, data: dict, include: dict | None = None):
+        row = self._unique_row(where)
+        if row is None:
+            return None
+        return self._record(self._update_row(row, data), include)
+
+    async def update_many(self, where: dict, data: dict) -> int:
+        rows = self._select(where)
+        for row in rows:
+            self._update_row(row, data)
+        return len(rows)
+
+    async def delete(self, where: dict, include: dict | None = None):
+        row = self._unique_row(where)
+        if row is None:
+            return None
+        record = self._record(row, include)
+        self._delete_row(row)
+        return record
+
+    async def delete_many(self, where: dict | None = None) -> int:
+        rows = self._select(where)
+        for row in rows:
+            self._delete_row(row)
+        return len(rows)
+
+
+# ========== RAW SQL ==========
+# auth_queries'deki statement'ların aynı semantikle Python karşılıkları.
+
+
+def _send_code(db: "MemoryClient", args: tuple) -> list[dict]:
+    email, hashed_code, expiry, now = args
+    now = _plain(now)
+    live = db.code._select({"email": email, "type": "VERIFICATION", "used": False})
+    resend = any(c["expiry"] > now for c in live)
+
+    for row in db.code._select({"email": email, "type": "VERIFICATION", "used": True}):
+        db.code._delete_row(row)
+    retired = {"email": email, "type": {"not": "VERIFICATION"}, "used": False}
+    for row in db.code._select(retired):
+        db.code._update_row(row, {"used": True})
+
+    fresh = {"hashedCode": hashed_code, "expiry": expiry, "attempts": 0}
+    if live:
+        db.code._update_row(live[0], {**fresh, "createdAt": _now()})
+    else:
+        db.code._insert({**fresh, "email": email, "type": "VERIFICATION"})
+    return [{"resend": resend}]
+
+
+def _signin(db: "MemoryClient", args: tuple) -> list[dict]:
+    email, hashed_code, now, key, token, expires_at, family_id = args
+    now = _plain(now)
+    candidate = db.code._select(
+        {
+            "email": email,
+            "hashedCode": hashed_code,
+            "type": "VERIFICATION",
+            "used": False,
+        },
+        order={"createdAt": "desc"},
+        take=1,
+    )
+    if not candidate:
+        return []
+    if candidate[0]["expiry"] < now:
+        db.code._update_row(candidate[0], {"used": True})
+        return []
+    db.code._delete_row(candidate[0])
+
+    user = db.user._unique_row({"email": email})
+    if user is None:
+        user = db.user._insert({"email": email, "key": key, "updatedAt": now})
+    db.refreshtoken._insert(
+        {
+            "token": token,
+            "userId": user["id"],
+            "familyId": family_id,
+            "expiresAt": expires_at,
+        }
+    )
+    return [
+        {"id": user["id"], "role": user["role"], "tokenVersion": user["tokenVersion"]}
+    ]
+
+
+def _rotate_refresh_token(db: "MemoryClient", args: tuple) -> list[dict]:
+    token, now, new_token, new_expires_at, replay_before = args
+    tokens = db.refreshtoken
+    current = tokens._unique_row({"token": token})
+    if current is None:
+        return []
+
+    if current["revoked"] or current["expiresAt"] <= _plain(now):
+        revoked_at = current["revokedAt"]
+        if current["revoked"] and (
+            revoked_at is None or revoked_at < _plain(replay_before)
+        ):
+            # replay: aynı ailedeki bütün aktif token'lar düşer
+            family = {"familyId": current["familyId"], "revoked": False}
+            for row in tokens._select(family):
+                tokens._update_row(row, {"revoked": True, "revokedAt": now})
+        return []
+
+    tokens._update_row(current, {"revoked": True, "revokedAt": now})
+    tokens._insert(
+        {
+            "token": new_token,
+            "userId": current["userId"],
+            "familyId": current["familyId"],
+            "expiresAt": new_expires_at,
+        }
+    )
+    user = db.user._rows.get(current["userId"])
+    if user is None:
+        return []
+    return [
+        {"id": user["id"], "role": user["role"], "tokenVersion": user["tokenVersion"]}
+    ]
+
+
+def _revoke_user_sessions(db: "MemoryClient", args: tuple) -> list[dict]:
+    user_id, now = args
+    tokens = db.refreshtoken
+    revoked = []
+    for row in tokens._select({"userId": user_id, "revoked": False}):
+        tokens._update_row(row, {"revoked": True, "revokedAt": now})
+        revoked.append({"id": row["id"]})
+    return revoked
+
+
+def _ping(db: "MemoryClient", args: tuple) -> list[dict]:
+    return [{"ok": 1}]
+
+
+def _missing_indexes(db: "MemoryClient", args: tuple) -> list[dict]:
+    # index yok ama kısıtları (ör. email başına tek canlı kod) handler'lar uyguluyor
+    return []
+
+
+def _replica_lag(db: "MemoryClient", args: tuple) -> list[dict]:
+    return [{"lag": db.replication_lag}]
+
+
+RAW_HANDLERS: dict[str, RawHandler] = {
+    SEND_CODE_SQL: _send_code,
+    SIGNIN_SQL: _signin,
+    ROTATE_REFRESH_TOKEN_SQL: _rotate_refresh_token,
+    REVOKE_USER_SESSIONS_SQL: _revoke_user_sessions,
+    PING_SQL: _ping,
+    REPLICA_LAG_SQL: _replica_lag,
+    MISSING_INDEXES_SQL: _missing_indexes,
+}
+
+
+# ========== CLIENT ==========
+
+
+class MemoryClient:
+    def __init__(self, schema_path: Path = SCHEMA_PATH):
+        self._connected = False
+        self._models: dict[str, MemoryModel] = {}
+        # replica olarak kullanılırken REPLICA_LAG_SQL'in döndüğü değer (testler)
+        self.replication_lag: float | None = 0.0
+        for spec in load_schema(schema_path).values():
+            model = self._models[spec.name] = MemoryModel(self, spec)
+            setattr(self, spec.name.lower(), model)
+
+    async def connect(self, timeout=None) -> None:
+        self._connected = True
+
+    async def disconnect(self, timeout=None) -> None:
+        self._connected = False
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def reset(self) -> None:
+        """Bütün tabloları boşaltır (testler arası)."""
+        for model in self._models.values():
+            model._clear()
+
+    async def _raw(self, query: str, args: tuple) -> list[dict]:
+        handler = RAW_HANDLERS.get(query)
+        if handler is None:
+            raise NotImplementedError(
+                "memory backend: no handler for raw query "
+                f"{query.strip().splitlines()[0]!r}"
+            )
+        # round-trip yerine bir tur bekler, sonra statement atomik çalışır. Her
+        # statement öncekilerin commit'ini görür; Postgres'te snapshot'ı
+        # paylaşan eşzamanlı istekler yok, yani en kötü durum taklit edilir.
+        await asyncio.sleep(0)
+        return handler(self, args)
+
+    async def query_raw(self, query: str, *args) -> list[dict]:
+        return await self._raw(query, args)
+
+    async def query_first(self, query: str, *args) -> dict | None:
+        rows = await self._raw(query, args)
+        return rows[0] if rows else None
+
+    async def execute_raw(self, query: str, *args) -> int:
+        # handler etkilenen satırları döner, Postgres'teki gibi sayısı verilir
+        return len(await self._raw(query, args))
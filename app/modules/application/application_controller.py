@@ -1,11 +1,165 @@
+import base64
+import binascii
+import os
+from datetime import datetime, timedelta, timezone
+
 from fastapi import HTTPException, status
 from app.db import db
+from app.modules.application.application_counters import application_counters
+from app.modules.application.application_schema import (
+    Application,
+    ApplicationCounts,
+    ApplicationPage,
+    ApplicationStatus,
+    ApplicationType,
+    MarkReadResult,
+)
+from app.utils.pubsub import hub
+
+# Admin SSE akışının (GET /application/events) topic'i
+APPLICATION_EVENTS_TOPIC = "applications"
+
+APPLICATION_PAGE_MAX_SIZE = int(os.getenv("APPLICATION_PAGE_MAX_SIZE", "100"))
+APPLICATION_MARK_READ_MAX_IDS = int(os.getenv("APPLICATION_MARK_READ_MAX_IDS", "500"))
+
+# Alt başvurular listeleme sorgusunun içinde geliyor (ayrı sorgu yok)
+APPLICATION_INCLUDE = {"ideaApplication": True, "teamMemberApplication": True}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _encode_cursor(app) -> str:
+    created_at = app.createdAt
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    millis = (created_at - _EPOCH) // timedelta(milliseconds=1)
+    raw = f"{millis}:{app.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        millis, app_id = raw.split(":")
+        return _EPOCH + timedelta(milliseconds=int(millis)), int(app_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+async def list_applications(
+    cursor: str | None = None,
+    limit: int = 50,
+    app_type: ApplicationType | None = None,
+    app_status: ApplicationStatus | None = None,
+    is_read: bool | None = None,
+) -> ApplicationPage:
+    limit = min(limit, APPLICATION_PAGE_MAX_SIZE)
+    where: dict = {"deletedAt": None}
+    if app_type is not None:
+        where["type"] = app_type.value
+    if app_status is not None:
+        where["status"] = app_status.value
+    if is_read is not None:
+        where["isRead"] = is_read
+    if cursor is not None:
+        # keyset: (createdAt, id) cursor'dan küçük olanlar, en yeniler önce
+        created_at, app_id = _decode_cursor(cursor)
+        where["OR"] = [
+            {"createdAt": {"lt": created_at}},
+            {"createdAt": created_at, "id": {"lt": app_id}},
+        ]
+
+    rows = await db.application.find_many(
+        where=where,
+        order=[{"createdAt": "desc"}, {"id": "desc"}],
+        take=limit + 1,
+        include=APPLICATION_INCLUDE,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return ApplicationPage(
+        items=[Application.model_validate(a) for a in rows],
+        nextCursor=_encode_cursor(rows[-1]) if has_more else None,
+    )
 
 
 async def mark_read(application_id: int):
-    app = await db.application.find_unique(where={"id": application_id})
-    if app is None:
+    # Sadece okunmamışsa günceller; dönen satır sayaçlar için type/status'u verir
+    app = await db.application.update(
+        where={"id": application_id, "isRead": False}, data={"isRead": True}
+    )
+    if app is not None:
+        application_counters.record_read(app.type, app.status)
+        await hub.publish(
+            APPLICATION_EVENTS_TOPIC, "application.read", {"ids": [application_id]}
+        )
+    elif await db.application.find_unique(where={"id": application_id}) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
 
-    await db.application.update(where={"id": application_id}, data={"isRead": True})
     return {"id": application_id, "isRead": True}
+
+
+async def mark_many_read(ids: list[int]) -> MarkReadResult:
+    """Tek UPDATE ... WHERE id IN (...); zaten okunmuş olanlar sayılmaz."""
+    updated = await db.application.update_many(
+        where={"id": {"in": list(set(ids))}, "isRead": False, "deletedAt": None},
+        data={"isRead": True},
+    )
+    if updated:
+        # hangi type/status'tan kaç tane olduğu bilinmiyor, sonraki okumada sayılır
+        application_counters.mark_stale()
+        await hub.publish(
+            APPLICATION_EVENTS_TOPIC, "application.read", {"ids": sorted(set(ids))}
+        )
+    return MarkReadResult(updated=updated)
+
+
+async def update_status(application_id: int, new_status: ApplicationStatus):
+    app = await db.application.find_unique(where={"id": application_id})
+    if app is None or app.deletedAt is not None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
+
+    old_status = getattr(app.status, "value", app.status)
+    if old_status != new_status.value:
+        # status hâlâ okuduğumuz değerse güncelle, araya giren değişikliği ezme
+        updated = await db.application.update(
+            where={"id": application_id, "status": old_status},
+            data={"status": new_status.value},
+        )
+        if updated is None:
+            # yarışı kaybettik: status'u başka bir istek değiştirdi (ya da kayıt
+            # silindi). Olmayan bir geçişi bildirmek yerine istemci tekrar okusun
+            application_counters.mark_stale()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Application status was changed concurrently, reload and retry",
+            )
+        application_counters.record_status_change(
+            app.type, old_status, new_status, app.isRead
+        )
+        await hub.publish(
+            APPLICATION_EVENTS_TOPIC,
+            "application.status",
+            {"id": application_id, "status": new_status.value},
+        )
+    return {"id": application_id, "status": new_status.value}
+
+
+async def application_created(app) -> None:
+    """Başvuru oluşturan kod yolu, kayıt yazıldıktan sonra bunu çağırmalı."""
+    application_counters.record_created(app.type, app.status, app.isRead)
+    await hub.publish(
+        APPLICATION_EVENTS_TOPIC,
+        "application.created",
+        {
+            "id": app.id,
+            "type": getattr(app.type, "value", app.type),
+            "status": getattr(app.status, "value", app.status),
+        },
+    )
+
+
+async def get_counters() -> ApplicationCounts:
+    return await application_counters.snapshot()
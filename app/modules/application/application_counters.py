@@ -0,0 +1,137 @@
+"""
+Başvuru sayaçları (type / status / isRead kırılımında), process içinde tutulur.
+
+Dashboard rozeti her sayfa yüklemesinde COUNT(*) yapmasın diye sayaçlar
+controller'daki hook'larla (okundu, durum değişikliği, oluşturma) artırılıp
+azaltılır. Sayaçlar periyodik olarak tek bir GROUP BY sorgusuyla gerçek
+değerlerle eşitlenir; bu sayede başka worker'lardaki değişiklikler en geç
+APPLICATION_COUNTERS_RECONCILE_SECONDS sonra burada da görünür. Hangi satırı
+etkilediği bilinmeyen toplu işlemler (update_many) sonrası mark_stale()
+çağrılır ve bir sonraki okumada yeniden sayılır.
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from app.db import db
+from app.modules.application.application_schema import (
+    ApplicationCounts,
+    ApplicationStatus,
+    ApplicationType,
+    CountPair,
+)
+
+APPLICATION_COUNTERS_RECONCILE_SECONDS = float(
+    os.getenv("APPLICATION_COUNTERS_RECONCILE_SECONDS", "300")
+)
+
+CounterKey = tuple[str, str, bool]
+
+
+def _value(enum_or_str) -> str:
+    return getattr(enum_or_str, "value", enum_or_str)
+
+
+class ApplicationCounters:
+    def __init__(
+        self, reconcile_seconds: float = APPLICATION_COUNTERS_RECONCILE_SECONDS
+    ):
+        self.reconcile_seconds = reconcile_seconds
+        self._counts: Counter[CounterKey] = Counter()
+        self._loaded_at: float | None = None
+        self._stale = True
+        self._changed = False
+        self._reload_task: asyncio.Task | None = None
+        self.reconciled_at: datetime | None = None
+        self.reconciles = 0
+        # son eşitlemede hook'larla tutulan değerin gerçekten ne kadar saptığı
+        self.last_drift = 0
+
+    # ---- hook'lar ----
+
+    def _apply(self, key: CounterKey, delta: int) -> None:
+        self._counts[key] += delta
+        self._changed = True
+
+    def record_created(self, app_type, status="PENDING", is_read: bool = False) -> None:
+        self._apply((_value(app_type), _value(status), is_read), 1)
+
+    def record_read(self, app_type, status) -> None:
+        app_type, status = _value(app_type), _value(status)
+        self._apply((app_type, status, False), -1)
+        self._apply((app_type, status, True), 1)
+
+    def record_status_change(
+        self, app_type, old_status, new_status, is_read: bool
+    ) -> None:
+        app_type = _value(app_type)
+        self._apply((app_type, _value(old_status), is_read), -1)
+        self._apply((app_type, _value(new_status), is_read), 1)
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    # ---- okuma / eşitleme ----
+
+    def _needs_reconcile(self) -> bool:
+        if self._stale or self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at >= self.reconcile_seconds
+
+    async def _reconcile(self) -> None:
+        self._changed = False
+        rows = await db.application.group_by(
+            by=["type", "status", "isRead"],
+            where={"deletedAt": None},
+            count=True,
+        )
+        counts: Counter[CounterKey] = Counter()
+        for row in rows:
+            key = (_value(row["type"]), _value(row["status"]), row["isRead"])
+            counts[key] = row["_count"]["_all"]
+
+        if self._loaded_at is not None:
+            keys = counts.keys() | self._counts.keys()
+            self.last_drift = sum(abs(counts[k] - self._counts[k]) for k in keys)
+        self._counts = counts
+        self._loaded_at = time.monotonic()
+        self.reconciled_at = datetime.now(timezone.utc)
+        self.reconciles += 1
+        # sorgu sürerken hook çalıştıysa sonuç onu içermeyebilir, sonra tekrar say
+        self._stale = self._changed
+
+    async def reconcile(self) -> None:
+        """Aynı anda gelen okumalar tek GROUP BY sorgusunu paylaşır."""
+        loop = asyncio.get_running_loop()
+        task = self._reload_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._reload_task = loop.create_task(self._reconcile())
+        await asyncio.shield(task)
+
+    async def snapshot(self) -> ApplicationCounts:
+        if self._needs_reconcile():
+            await self.reconcile()
+
+        by_type = {t: CountPair() for t in ApplicationType}
+        by_status = {s: CountPair() for s in ApplicationStatus}
+        for (app_type, status, is_read), n in self._counts.items():
+            for pair in (
+                by_type[ApplicationType(app_type)],
+                by_status[ApplicationStatus(status)],
+            ):
+                pair.total += n
+                pair.unread += 0 if is_read else n
+
+        return ApplicationCounts(
+            total=sum(p.total for p in by_type.values()),
+            unread=sum(p.unread for p in by_type.values()),
+            byType=by_type,
+            byStatus=by_status,
+            reconciledAt=self.reconciled_at,
+        )
+
+
+application_counters = ApplicationCounters()
@@ -1,10 +1,80 @@
-from fastapi import APIRouter, Path, Depends
+from fastapi import APIRouter, Body, Path, Depends, Query
+from fastapi.responses import StreamingResponse
 from app.utils.security import require_roles
+from app.utils.pubsub import hub, sse_stream
+from app.utils.responses import model_response
 from app.modules.application import application_controller
+from app.modules.application.application_controller import (
+    APPLICATION_MARK_READ_MAX_IDS,
+    APPLICATION_PAGE_MAX_SIZE,
+)
+from app.modules.application.application_schema import (
+    ApplicationCounts,
+    ApplicationPage,
+    ApplicationStatus,
+    ApplicationType,
+    MarkReadResult,
+)
 
 router = APIRouter(prefix="/application", tags=["application"])
 
 
+@router.get("", response_model=ApplicationPage)
+async def list_applications(
+    cursor: str | None = Query(None, description="Önceki sayfanın nextCursor'ı"),
+    limit: int = Query(50, ge=1, le=APPLICATION_PAGE_MAX_SIZE),
+    type: ApplicationType | None = None,
+    status: ApplicationStatus | None = None,
+    isRead: bool | None = None,
+    current_user=Depends(require_roles("ADMIN")),
+):
+    """Admin başvuru kutusu: en yeniler önce, alt başvurular (idea / team member) dahil."""
+    page = await application_controller.list_applications(
+        cursor, limit, type, status, isRead
+    )
+    return model_response(page, ApplicationPage)
+
+
+@router.get("/counters", response_model=ApplicationCounts)
+async def get_counters(current_user=Depends(require_roles("ADMIN"))):
+    """Dashboard rozeti için okunmamış / durum sayaçları (COUNT(*) yapılmaz)."""
+    return model_response(await application_controller.get_counters(), ApplicationCounts)
+
+
+@router.get("/events")
+async def application_events(current_user=Depends(require_roles("ADMIN"))):
+    """
+    Yeni / okunan / durumu değişen başvurular için Server-Sent Events akışı
+    (polling yerine). Yavaş istemcinin bağlantısı kapatılır, EventSource
+    yeniden bağlanır.
+    """
+    sub = hub.subscribe(application_controller.APPLICATION_EVENTS_TOPIC)
+    return StreamingResponse(
+        sse_stream(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.patch("/mark-read", response_model=MarkReadResult)
+async def mark_many_read(
+    ids: list[int] = Body(
+        ..., embed=True, min_length=1, max_length=APPLICATION_MARK_READ_MAX_IDS
+    ),
+    current_user=Depends(require_roles("ADMIN")),
+):
+    return await application_controller.mark_many_read(ids)
+
+
 @router.patch("/{id}/mark-read")
 async def mark_read(id: int = Path(..., ge=1), current_user=Depends(require_roles("ADMIN"))):
     return await application_controller.mark_read(id)
+
+
+@router.patch("/{id}/status")
+async def update_status(
+    id: int = Path(..., ge=1),
+    status: ApplicationStatus = Body(..., embed=True),
+    current_user=Depends(require_roles("ADMIN")),
+):
+    return await application_controller.update_status(id, status)
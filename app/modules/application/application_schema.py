@@ -0,0 +1,72 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ApplicationType(str, Enum):
+    IDEA = "IDEA"
+    TEAM_MEMBER = "TEAM_MEMBER"
+
+
+class ApplicationStatus(str, Enum):
+    PENDING = "PENDING"
+    CONTACTED = "CONTACTED"
+    ACCEPTED = "ACCEPTED"
+    REJECTED = "REJECTED"
+
+
+class IdeaApplication(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    description: str
+
+
+class TeamMemberApplication(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workAreas: list[str]
+    bio: str
+    expectations: str
+    portfolioURL: str | None = None
+
+
+class Application(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    ownerId: int
+    type: ApplicationType
+    status: ApplicationStatus
+    isRead: bool
+    createdAt: datetime
+    # type'a göre biri dolu, aynı sorguda include ediliyor
+    ideaApplication: IdeaApplication | None = None
+    teamMemberApplication: TeamMemberApplication | None = None
+
+
+class ApplicationPage(BaseModel):
+    items: list[Application]
+    # opak cursor, bir sonraki sayfa için ?cursor= ile geri gönderilir
+    nextCursor: str | None = None
+
+
+class MarkReadResult(BaseModel):
+    updated: int
+
+
+class CountPair(BaseModel):
+    total: int = 0
+    unread: int = 0
+
+
+class ApplicationCounts(BaseModel):
+    total: int
+    unread: int
+    byType: dict[ApplicationType, CountPair]
+    byStatus: dict[ApplicationStatus, CountPair]
+    # sayaçların en son GROUP BY ile eşitlendiği an
+    reconciledAt: datetime | None = None
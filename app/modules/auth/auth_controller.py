@@ -2,6 +2,7 @@ from datetime import datetime, timedelta, timezone
 import secrets
 import hashlib
 import random
+from types import SimpleNamespace
 
 from fastapi import HTTPException, status, Request, Response, Body
 
@@ -9,13 +10,23 @@ from prisma.errors import RecordNotFoundError
 from prisma.enums import CodeType
 
 from app.db import db
+from app.utils.email_outbox import OutboxFullError, OutgoingEmail, email_outbox
 from app.utils.security import (
+    access_token_claims,
     create_access_token,
     create_refresh_token,
+    invalidate_user,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS,
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS,
 )
 
+from app.modules.auth.auth_queries import (
+    REVOKE_USER_SESSIONS_SQL,
+    ROTATE_REFRESH_TOKEN_SQL,
+    SEND_CODE_SQL,
+    SIGNIN_SQL,
+)
 from app.modules.auth.auth_schema import (
     SendCodeRequest,
     SendCodeResponse,
@@ -49,6 +60,17 @@ def _hash_code(code: str) -> str:
     return hashlib.sha256(code.encode()).hexdigest()
 
 
+def _verification_email(email: str, code: str, expiry: datetime) -> OutgoingEmail:
+    return OutgoingEmail(
+        to=email,
+        subject="Doğrulama kodunuz",
+        body=(
+            f"Doğrulama kodunuz: {code}\n"
+            f"Kod {CODE_TTL_MINUTES} dakika geçerlidir (son: {expiry:%H:%M} UTC)."
+        ),
+    )
+
+
 def _set_access_cookie(response: Response, token: str) -> None:
     response.set_cookie(
         key=ACCESS_COOKIE_NAME,
@@ -81,6 +103,11 @@ def _new_session_id() -> str:
     return secrets.token_urlsafe(48)
 
 
+def _new_token_family_id() -> str:
+    # signin/reset_key ile başlayan refresh token zincirinin kimliği
+    return secrets.token_urlsafe(16)
+
+
 # ========== PUBLIC CONTROLLER FONKSİYONLARI ==========
 
 
@@ -91,149 +118,64 @@ async def send_code(payload: SendCodeRequest) -> SendCodeResponse:
 
     expiry = _now_utc() + timedelta(minutes=CODE_TTL_MINUTES)
 
-    existing_code = await db.code.find_first(
-        where={
-            "email": payload.email,
-            "used": False,
-            "type": CodeType.VERIFICATION,
-            "expiry": {"gt": _now_utc()},
-        }
-    )
-
-    resend = existing_code is not None
-
-    # Aynı email için kullanılmamış eski kodları "used=True" yap
-    await db.code.update_many(
-        where={
-            "email": payload.email,
-            "used": False,
-        },
-        data={
-            "used": True,
-        },
-    )
-
-    # Aynı email ve type için kullanılmış eski kodları sil
-    await db.code.delete_many(
-        where={
-            "email": payload.email,
-            "used": True,
-            "type": CodeType.VERIFICATION,
-        }
-    )
-
-    # Yeni kodu oluştur ve kaydet
-    await db.code.create(
-        data={
-            "email": payload.email,
-            "hashedCode": hashed,
-            "type": CodeType.VERIFICATION,
-            "expiry": expiry,
-        }
-    )
+    # Kuyrukta yer kod yazılmadan önce ayrılır: outbox doluysa 503 döner ve
+    # eski kodlar geçersiz kılınmış, yenisi mail'e hiç çıkmamış olmaz
+    try:
+        reservation = email_outbox.reserve()
+    except OutboxFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Email service is busy, try again later",
+        )
 
-    # GERÇEK MAIL ENTEGRASYONU İÇİN YER
+    with reservation:
+        # Eski kodları temizleme + yeni kodu yazma tek statement / tek round-trip
+        result = await db.query_first(
+            SEND_CODE_SQL, payload.email, hashed, expiry, _now_utc()
+        )
+        resend = bool(result and result.get("resend"))
 
-    # Debug için konsol
-    print(
-        f"[DEBUG] Verification code for {payload.email}: {raw_code} (expires at {expiry})"
-    )
+        # Mail isteği bekletmez: outbox kuyruğuna bırakılır, worker gönderir
+        reservation.put(_verification_email(payload.email, raw_code, expiry))
 
     return SendCodeResponse(resend=resend, expiry=expiry)
 
 
 async def signin(payload: SignInRequest, response: Response) -> SignInResponse:
 
-    # Kod kaydını bul
-    record = await db.code.find_first(
-        where={
-            "email": payload.email,
-            "hashedCode": _hash_code(payload.code),
-            "used": False,
-            "type": CodeType.VERIFICATION,
-        },
-        order={
-            "createdAt": "desc",
-        },
-    )
-
-    if record is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired code",
-        )
+    # REFRESH TOKEN
+    session_id = _new_session_id()
+    session_expires_at = _now_utc() + timedelta(days=int(REFRESH_TOKEN_EXPIRE_DAYS))
 
-    # Süresi dolmuş mu?
-    if record.expiry < _now_utc():
-        try:
-            # dolmamışsa
-            await db.code.update(
-                where={"id": record.id},
-                data={"used": True},
-            )
-        except RecordNotFoundError:
-            pass
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired code",
-        )
+    # Kodu tüket + kullanıcıyı upsert et + refresh token yaz: tek statement.
+    # Kod yoksa, süresi dolmuşsa ya da eşzamanlı başka bir signin onu
+    # tükettiyse satır dönmez.
+    row = await db.query_first(
+        SIGNIN_SQL,
+        payload.email,
+        _hash_code(payload.code),
+        _now_utc(),
+        secrets.token_hex(32),
+        session_id,
+        session_expires_at,
+        _new_token_family_id(),
+    )
 
-    # Kod yanlışsa attempts + used ayarla
-    if record.hashedCode != _hash_code(payload.code):
-        try:
-            await db.code.update(
-                where={"id": record.id},
-                data={
-                    "used": True,
-                    "attempts": record.attempts + 1,
-                },
-            )
-        except RecordNotFoundError:
-            pass
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired code",
         )
-    else:
-        # Kod doğru ise tamamen sil
-        try:
-            await db.code.delete(where={"id": record.id})
-        except RecordNotFoundError:
-            pass
-
-    # email'i eşleşen kullanıcıyı bul / oluştur
-    user = await db.user.find_unique(
-        where={"email": payload.email},
-    )
 
-    if user is None:
-        user = await db.user.create(
-            data={
-                "email": payload.email,
-                "key": secrets.token_hex(32),
-                # "role": "STUDENT"  # default zaten
-            }
-        )
+    user = SimpleNamespace(**row)
 
     # ACCESS TOKEN
     access_token_expires = timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data=access_token_claims(user),
         expires_delta=access_token_expires,
     )
 
-    # REFRESH TOKEN
-    session_id = _new_session_id()
-    session_expires_at = _now_utc() + timedelta(days=int(REFRESH_TOKEN_EXPIRE_DAYS))
-
-    await db.refreshtoken.create(
-        data={
-            "token": session_id,
-            "userId": user.id,
-            "expiresAt": session_expires_at,
-        }
-    )
-
     _set_access_cookie(response, access_token)
     _set_session_cookie(response, session_id)
 
@@ -258,17 +200,23 @@ async def refresh(
             detail="Refresh token not provided",
         )
 
-    token_record = await db.refreshtoken.find_unique(
-        where={"token": session_id},
-        include={"user": True},
+    new_session_id = _new_session_id()
+    new_session_expires_at = _now_utc() + timedelta(days=int(REFRESH_TOKEN_EXPIRE_DAYS))
+
+    # Koşullu revoke + yeni token tek statement'ta. Paralel refresh'lerden
+    # sadece biri satır alır; grace penceresinden önce rotate edilmiş token
+    # tekrar gelirse bütün token ailesi revoke edilir ve satır dönmez.
+    now = _now_utc()
+    row = await db.query_first(
+        ROTATE_REFRESH_TOKEN_SQL,
+        session_id,
+        now,
+        new_session_id,
+        new_session_expires_at,
+        now - timedelta(seconds=REFRESH_TOKEN_REUSE_GRACE_SECONDS),
     )
 
-    if (
-        token_record is None
-        or token_record.revoked
-        or token_record.expiresAt < _now_utc()
-        or token_record.user is None
-    ):
+    if not row:
         # clear cookies if present
         if response is not None:
             _clear_cookie(response, ACCESS_COOKIE_NAME)
@@ -278,26 +226,11 @@ async def refresh(
             detail="Invalid or expired session",
         )
 
-    # db'deki refresh token'in içindeki user'ı al
-    user = token_record.user
+    # refresh token'ın sahibi olan user
+    user = SimpleNamespace(**row)
 
-    await db.refreshtoken.update(
-        where={"id": token_record.id},
-        data={"revoked": True},
-    )
-
-    new_session_id = _new_session_id()
-    new_session_expires_at = _now_utc() + timedelta(days=int(REFRESH_TOKEN_EXPIRE_DAYS))
-
-    await db.refreshtoken.create(
-        data={
-            "token": new_session_id,
-            "userId": user.id,
-            "expiresAt": new_session_expires_at,
-        }
-    )
     new_access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data=access_token_claims(user),
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
@@ -352,15 +285,14 @@ async def reset_key(payload: ResetKeyRequest, response: Response) -> ResetKeyRes
 
     new_key = create_refresh_token({"sub": str(user.id)})
 
-    await db.user.update(
+    # tokenVersion artışı claims modundaki eski access token'ları da geçersiz kılar
+    user = await db.user.update(
         where={"id": user.id},
-        data={"key": new_key},
+        data={"key": new_key, "tokenVersion": {"increment": 1}},
     )
+    invalidate_user(user.id)
 
-    await db.refreshtoken.update_many(
-        where={"userId": user.id, "revoked": False},
-        data={"revoked": True},
-    )
+    await db.execute_raw(REVOKE_USER_SESSIONS_SQL, user.id, _now_utc())
 
     session_id = _new_session_id()
     session_expires_at = _now_utc() + timedelta(days=int(REFRESH_TOKEN_EXPIRE_DAYS))
@@ -369,12 +301,13 @@ async def reset_key(payload: ResetKeyRequest, response: Response) -> ResetKeyRes
         data={
             "token": session_id,
             "userId": user.id,
+            "familyId": _new_token_family_id(),
             "expiresAt": session_expires_at,
         }
     )
 
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data=access_token_claims(user),
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
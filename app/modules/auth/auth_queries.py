@@ -0,0 +1,135 @@
+"""
+Auth akışının sıcak yolundaki tek round-trip'lik SQL ifadeleri.
+
+Her biri tek bir statement olduğu için Postgres'te atomik çalışır ve
+Prisma query engine'e tek istekle gider. Zaman parametreleri her zaman
+UTC datetime olarak verilir (Prisma da kolonları UTC saklıyor).
+"""
+
+# send_code
+# $1 email, $2 hashedCode, $3 expiry, $4 now
+#
+# - Email'in kullanılmış VERIFICATION kodlarını siler
+# - Kullanılmamış diğer kodları (RESET_KEY) used=true yapar
+# - Canlı VERIFICATION kodunu yenisiyle değiştirir. "Code_email_live_verification_key"
+#   partial unique index'i sayesinde ON CONFLICT, aynı email için eşzamanlı
+#   isteklerde bile tek canlı kod bırakır.
+# - resend: yenilenen kodun süresi henüz dolmamış mıydı
+SEND_CODE_SQL = """
+WITH previous AS (
+    SELECT "expiry" FROM "Code"
+    WHERE "email" = $1 AND "type" = 'VERIFICATION' AND "used" = false
+),
+purged AS (
+    DELETE FROM "Code"
+    WHERE "email" = $1 AND "type" = 'VERIFICATION' AND "used" = true
+),
+retired AS (
+    UPDATE "Code" SET "used" = true
+    WHERE "email" = $1 AND "type" <> 'VERIFICATION' AND "used" = false
+),
+issued AS (
+    INSERT INTO "Code" ("email", "hashedCode", "type", "expiry")
+    VALUES ($1, $2, 'VERIFICATION', $3::timestamp(3))
+    ON CONFLICT ("email") WHERE "type" = 'VERIFICATION' AND "used" = false
+    DO UPDATE SET
+        "hashedCode" = EXCLUDED."hashedCode",
+        "expiry" = EXCLUDED."expiry",
+        "attempts" = 0,
+        "createdAt" = CURRENT_TIMESTAMP
+    RETURNING "id"
+)
+SELECT EXISTS (
+    SELECT 1 FROM previous WHERE "expiry" > $4::timestamp(3)
+) AS "resend"
+"""
+
+# signin
+# $1 email, $2 hashedCode, $3 now, $4 yeni kullanıcı için key,
+# $5 refresh token (session id), $6 refresh token expiresAt, $7 token familyId
+#
+# - Eşleşen en yeni canlı VERIFICATION kodunu siler. Aynı kodla eşzamanlı iki
+#   signin'de ikinci DELETE satır kilidini bekler, satır silinmiş olduğu için
+#   hiçbir şey silemez ve boş sonuç döner; yani sadece biri başarılı olur.
+# - Süresi dolmuş kodu used=true yapar (boş sonuç döner).
+# - Kullanıcıyı email üzerinden upsert eder, refresh token'ı yazar.
+# Sonuç: başarılıysa kullanıcının id, role, tokenVersion'ı; değilse satır yok.
+SIGNIN_SQL = """
+WITH candidate AS (
+    SELECT "id", "expiry" FROM "Code"
+    WHERE "email" = $1 AND "hashedCode" = $2
+      AND "type" = 'VERIFICATION' AND "used" = false
+    ORDER BY "createdAt" DESC
+    LIMIT 1
+),
+consumed AS (
+    DELETE FROM "Code"
+    WHERE "id" IN (SELECT "id" FROM candidate WHERE "expiry" >= $3::timestamp(3))
+      AND "used" = false
+    RETURNING "id"
+),
+expired AS (
+    UPDATE "Code" SET "used" = true
+    WHERE "id" IN (SELECT "id" FROM candidate WHERE "expiry" < $3::timestamp(3))
+),
+account AS (
+    INSERT INTO "User" ("email", "key", "updatedAt")
+    SELECT $1, $4, $3::timestamp(3) FROM consumed
+    ON CONFLICT ("email") DO UPDATE SET "email" = EXCLUDED."email"
+    RETURNING "id", "role", "tokenVersion"
+),
+session AS (
+    INSERT INTO "RefreshToken" ("token", "userId", "familyId", "expiresAt")
+    SELECT $5, "id", $7, $6::timestamp(3) FROM account
+)
+SELECT "id", "role", "tokenVersion" FROM account
+"""
+
+# refresh
+# $1 gelen refresh token, $2 now, $3 yeni refresh token, $4 yeni token expiresAt,
+# $5 replay sınırı (now - REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+#
+# - Token sadece revoke edilmemiş ve süresi dolmamışsa revoke edilir (koşullu
+#   UPDATE). Paralel refresh'lerde ikinci UPDATE satır kilidini bekler, commit
+#   sonrası revoked=true gördüğü için hiçbir şey yapmaz: tek kazanan olur.
+# - Kazanan için aynı familyId ile yeni token yazılır.
+# - Token $5'ten önce revoke edilmişse (ya da revokedAt'i yoksa) bu bir
+#   replay'dir; ailedeki bütün aktif token'lar revoke edilir. Yarışı kaybeden
+#   paralel istekler token'ı ya snapshot'ında aktif görür ya da (kazanan
+#   commit ettikten sonra başladılarsa, ör. havuzda bağlantı beklerken)
+#   grace penceresi içinde revoke edilmiş görür; ikisinde de aile düşmez.
+# Sonuç: başarılıysa token sahibinin id, role, tokenVersion'ı; değilse satır yok.
+ROTATE_REFRESH_TOKEN_SQL = """
+WITH rotated AS (
+    UPDATE "RefreshToken" SET "revoked" = true, "revokedAt" = $2::timestamp(3)
+    WHERE "token" = $1 AND "revoked" = false AND "expiresAt" > $2::timestamp(3)
+    RETURNING "userId", "familyId"
+),
+issued AS (
+    INSERT INTO "RefreshToken" ("token", "userId", "familyId", "expiresAt")
+    SELECT $3, "userId", "familyId", $4::timestamp(3) FROM rotated
+),
+replayed AS (
+    UPDATE "RefreshToken" SET "revoked" = true, "revokedAt" = $2::timestamp(3)
+    WHERE "revoked" = false
+      AND "familyId" IN (
+          SELECT "familyId" FROM "RefreshToken"
+          WHERE "token" = $1 AND "revoked" = true
+            AND ("revokedAt" IS NULL OR "revokedAt" < $5::timestamp(3))
+      )
+      AND NOT EXISTS (SELECT 1 FROM rotated)
+)
+SELECT u."id", u."role", u."tokenVersion"
+FROM rotated r
+JOIN "User" u ON u."id" = r."userId"
+"""
+
+# reset_key
+# $1 userId, $2 now
+#
+# Kullanıcının aktif bütün oturumlarını kapatır; "RefreshToken_userId_revoked_idx"
+# üzerinden gider. revokedAt sweeper'ın saklama süresi için yazılır.
+REVOKE_USER_SESSIONS_SQL = """
+UPDATE "RefreshToken" SET "revoked" = true, "revokedAt" = $2::timestamp(3)
+WHERE "userId" = $1::int AND "revoked" = false
+"""
@@ -0,0 +1,181 @@
+"""
+Liveness / readiness ve startup'taki DB warm-up'ı.
+
+    GET /livez    process ayakta mı; DB'ye gitmez, sadece event loop cevap veriyor
+    GET /readyz   trafik alınabilir mi: startup bitti (warm-up dahil), shutdown
+                  başlamadı ve DB health check'i başarılı
+
+DB kontrolünün sonucu HEALTH_CHECK_CACHE_SECONDS boyunca (başarısızsa da)
+tekrar kullanılır; aynı anda gelen probe'lar tek sorguyu bekler. Böylece her
+pod'a birkaç saniyede bir gelen kubelet / load balancer probe'ları Postgres'e
+probe başına bir sorgu olarak yansımaz.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from app.db import DB_POOL_SIZE, db
+from app.modules.health.health_queries import (
+    MANUAL_INDEXES,
+    MISSING_INDEXES_SQL,
+    PING_SQL,
+)
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_CACHE_SECONDS = float(os.getenv("HEALTH_CHECK_CACHE_SECONDS", "2"))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "1"))
+# warm-up'ta aynı anda açılacak bağlantı sayısı (0: DB_POOL_SIZE, o da yoksa 1)
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "0"))
+DB_WARMUP_TIMEOUT_SECONDS = float(os.getenv("DB_WARMUP_TIMEOUT_SECONDS", "10"))
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        result = {"ok": self.ok, "latencyMs": round(self.latency_ms, 2)}
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+class DatabaseHealth:
+    def __init__(
+        self,
+        ttl: float = HEALTH_CHECK_CACHE_SECONDS,
+        timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._clock = clock
+        self._result: CheckResult | None = None
+        self._inflight: asyncio.Future | None = None
+        self.checks = 0
+
+    def clear(self) -> None:
+        self._result = None
+
+    async def _run(self) -> CheckResult:
+        self.checks += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(db.query_first(PING_SQL), self.timeout)
+            error = None
+        except TimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as exc:  # noqa: BLE001 - probe'un cevabı, log yeterli
+            logger.warning("database health check failed: %r", exc)
+            error = type(exc).__name__
+        latency_ms = (time.perf_counter() - started) * 1000
+        return CheckResult(error is None, latency_ms, self._clock(), error)
+
+    async def check(self) -> CheckResult:
+        result = self._result
+        if result is not None and self._clock() - result.checked_at < self.ttl:
+            return result
+        # devam eden kontrol varsa onu bekle
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._run())
+        inflight = self._inflight
+        try:
+            self._result = await asyncio.shield(inflight)
+        finally:
+            if self._inflight is inflight and inflight.done():
+                self._inflight = None
+        return self._result
+
+
+class Readiness:
+    """Startup / shutdown durumu; lifespan tarafından işaretlenir."""
+
+    def __init__(self, database: DatabaseHealth):
+        self.database = database
+        self.started = False
+        self.stopping = False
+
+    def mark_started(self) -> None:
+        self.started, self.stopping = True, False
+
+    def mark_stopping(self) -> None:
+        # load balancer yeni istek göndermeyi bıraksın, açık istekler bitsin
+        self.stopping = True
+        self.database.clear()
+
+    async def check(self) -> tuple[bool, dict]:
+        if not self.started or self.stopping:
+            state = "stopping" if self.stopping else "starting"
+            return False, {"status": state}
+        database = await self.database.check()
+        return database.ok, {
+            "status": "ready" if database.ok else "unavailable",
+            "checks": {"database": database.as_dict()},
+        }
+
+
+readiness = Readiness(DatabaseHealth())
+
+
+# Hot path'teki okumalar; prepared statement'lar ilk istekten önce hazırlansın.
+# Raw SQL'ler (send-code / signin / refresh) yazdığı için burada çalıştırılmaz.
+async def _hot_queries() -> None:
+    # get_current_user -> user_loader: id IN (...), en sık tek id'lik batch
+    await db.user.find_many(where={"id": {"in": [0]}})
+    await db.user.find_many(where={"deletedAt": None}, order={"id": "asc"}, take=1)
+    await db.application.find_unique(where={"id": 0})
+
+
+async def _warm_up(connections: int) -> None:
+    # Prisma bağlantıları ihtiyaç oldukça açıyor: aynı anda gönderilen
+    # sorgular havuzu `connections` bağlantıya kadar doldurur ve her
+    # bağlantıda statement'lar bir kez hazırlanmış olur.
+    await asyncio.gather(*(db.query_first(PING_SQL) for _ in range(connections)))
+    await asyncio.gather(*(_hot_queries() for _ in range(connections)))
+
+
+async def warm_up_db(connections: int | None = None) -> bool:
+    """
+    Havuzu açar ve sıcak sorguları bir kez çalıştırır. Başarısız olursa
+    startup'ı durdurmaz (uyarı loglanır), /readyz DB'yi ayrıca kontrol eder.
+    """
+    if connections is None:
+        connections = DB_WARMUP_CONNECTIONS or DB_POOL_SIZE or 1
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(_warm_up(connections), DB_WARMUP_TIMEOUT_SECONDS)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("database warm-up failed: %r", exc)
+        return False
+    logger.info(
+        "database warm-up: %d connection(s) in %.1f ms",
+        connections,
+        (time.perf_counter() - started) * 1000,
+    )
+    return True
+
+
+async def check_manual_indexes() -> list[str]:
+    """
+    Migration'larda elle tanımlı index'lerden eksik olanları döner ve uyarı
+    loglar. Startup'ı durdurmaz; kontrol yapılamazsa da sadece loglanır.
+    """
+    try:
+        rows = await db.query_raw(MISSING_INDEXES_SQL, list(MANUAL_INDEXES))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("manual index check failed: %r", exc)
+        return []
+    missing = [row["name"] for row in rows]
+    if missing:
+        logger.warning(
+            "indexes missing from the database (run `prisma migrate deploy`): %s",
+            ", ".join(missing),
+        )
+    return missing
@@ -0,0 +1,35 @@
+"""
+Health check sorguları. Tek statement, tabloya dokunmaz; sadece havuzdan bir
+bağlantı alınabildiğini ve Postgres'in cevap verdiğini gösterir.
+"""
+
+PING_SQL = 'SELECT 1 AS "ok"'
+
+# Replica gecikmesi (saniye). Primary'e bağlıysak ya da replica alınan bütün
+# WAL'ı uyguladıysa 0; primary boşta kaldığında son replay zamanı eskir, o
+# yüzden sadece uygulanmamış WAL varken zamana bakılır. Hiç replay yoksa NULL.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END::float8 AS "lag"
+"""
+
+# schema.prisma'da ifade edilemeyen, migration'larda elle yazılmış index'ler.
+# `prisma db push` ya da elle kurulan bir veritabanında bunlar olmaz; send_code
+# ON CONFLICT için Code_email_live_verification_key'e dayanıyor.
+MANUAL_INDEXES = (
+    # 20261018091000_add_live_verification_code_index
+    "Code_email_live_verification_key",
+    # 20261018093000_add_auth_query_indexes
+    "Code_used_idx",
+    # 20261019091000_index_revoked_refresh_tokens_by_revoked_at
+    "RefreshToken_revoked_revokedAt_idx",
+)
+
+# Verilen index isimlerinden mevcut şemada olmayanlar
+MISSING_INDEXES_SQL = """
+SELECT "name" FROM unnest($1::text[]) AS "name"
+WHERE to_regclass(quote_ident("name")) IS NULL
+"""
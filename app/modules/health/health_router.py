@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.modules.health.health_controller import readiness
+
+router = APIRouter(tags=["health"])
+
+
+# Orchestrator probe'ları için; şemada görünmesine gerek yok
+@router.get("/livez", include_in_schema=False)
+async def livez():
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readyz():
+    ready, body = await readiness.check()
+    return JSONResponse(body, status_code=200 if ready else 503)
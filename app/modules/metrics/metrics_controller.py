@@ -0,0 +1,124 @@
+from collections.abc import Iterable
+
+from app.modules.application.application_counters import application_counters
+from app.replica import replica
+from app.utils import security
+from app.utils.dataloader import team_member_loader, user_loader
+from app.utils.email_outbox import email_outbox
+from app.utils.metrics import MetricFamily, metrics
+from app.utils.pubsub import hub
+from app.utils.sweeper import sweeper
+
+
+def _gauge(name: str, help_text: str, samples) -> MetricFamily:
+    return (name, "gauge", help_text, [("", labels, v) for labels, v in samples])
+
+
+def _counter(name: str, help_text: str, samples) -> MetricFamily:
+    return (name, "counter", help_text, [("", labels, v) for labels, v in samples])
+
+
+def collect_app_stats() -> Iterable[MetricFamily]:
+    """Uygulama içi sayaçlar; sadece scrape sırasında okunur."""
+    caches = {
+        "user": security.user_cache.stats(),
+        "token_version": security.token_version_cache.stats(),
+        "jwt_claims": security.claims_cache.stats(),
+    }
+    yield _gauge(
+        "app_cache_entries",
+        "Entries currently held in in-process caches.",
+        [({"cache": c}, s["size"]) for c, s in caches.items()],
+    )
+    for field in ("hits", "misses", "evictions"):
+        yield _counter(
+            f"app_cache_{field}_total",
+            f"In-process cache {field}.",
+            [({"cache": c}, s[field]) for c, s in caches.items()],
+        )
+
+    loaders = {"user": user_loader.stats(), "team_member": team_member_loader.stats()}
+    yield _counter(
+        "app_dataloader_loads_total",
+        "DataLoader.load calls.",
+        [({"loader": name}, s["loads"]) for name, s in loaders.items()],
+    )
+    yield _counter(
+        "app_dataloader_batches_total",
+        "Batched find_many queries issued by DataLoaders.",
+        [({"loader": name}, s["batches"]) for name, s in loaders.items()],
+    )
+    yield _counter(
+        "app_dataloader_primary_retries_total",
+        "Replica batches with missing keys retried on the primary.",
+        [({"loader": name}, s["primaryRetries"]) for name, s in loaders.items()],
+    )
+
+    if replica.client is not None:
+        yield _gauge(
+            "app_db_replica_healthy",
+            "1 if reads are being routed to the read replica.",
+            [({}, int(replica.healthy))],
+        )
+        if replica.lag_seconds is not None:
+            yield _gauge(
+                "app_db_replica_lag_seconds",
+                "Replication lag measured by the last replica check.",
+                [({}, replica.lag_seconds)],
+            )
+        yield _counter(
+            "app_db_replica_fallbacks_total",
+            "Replica reads that failed and were retried on the primary.",
+            [({}, replica.fallbacks)],
+        )
+
+    yield _gauge(
+        "app_email_outbox_pending",
+        "Emails waiting in the outbox queue.",
+        [({}, email_outbox.pending())],
+    )
+    yield _counter(
+        "app_email_outbox_sent_total", "Emails delivered.", [({}, email_outbox.sent)]
+    )
+    yield _counter(
+        "app_email_outbox_dropped_total",
+        "Emails dropped after retries.",
+        [({}, email_outbox.dropped)],
+    )
+
+    yield _counter("app_sweeper_runs_total", "Sweeper runs.", [({}, sweeper.runs)])
+    yield _counter(
+        "app_sweeper_deleted_rows_total",
+        "Rows deleted by the sweeper.",
+        [({}, sweeper.total_deleted)],
+    )
+
+    pubsub = hub.stats()
+    yield _gauge(
+        "app_sse_subscribers",
+        "Open pub/sub (SSE) subscriptions.",
+        [({}, pubsub["subscribers"])],
+    )
+    yield _counter(
+        "app_sse_dropped_subscribers_total",
+        "Subscribers dropped for falling behind.",
+        [({}, pubsub["droppedSubscribers"])],
+    )
+
+    yield _counter(
+        "app_application_counter_reconciles_total",
+        "Application counter reconciliations against the database.",
+        [({}, application_counters.reconciles)],
+    )
+    yield _gauge(
+        "app_application_counter_drift",
+        "Drift found by the last application counter reconciliation.",
+        [({}, application_counters.last_drift)],
+    )
+
+
+metrics.register_collector(collect_app_stats)
+
+
+def render_metrics() -> str:
+    return metrics.render()
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.modules.metrics import metrics_controller
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Dışarıya açılmamalı; reverse proxy'de sadece iç ağdan erişime izin verilecek
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(
+        metrics_controller.render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -1,54 +1,138 @@
+import os
+from collections.abc import AsyncIterator
+
 from fastapi import HTTPException, status
 
 from app.db import db
+from app.modules.user.user_schema import (
+    TeamMemberProfile,
+    User,
+    UserBatch,
+    UserPage,
+    UserRole,
+)
+from app.replica import read_db
+from app.utils.dataloader import team_member_loader, user_loader
+from app.utils.etag import parse_etag
+from app.utils.security import invalidate_user
+
+USER_PAGE_MAX_SIZE = int(os.getenv("USER_PAGE_MAX_SIZE", "100"))
+USER_EXPORT_CHUNK_SIZE = int(os.getenv("USER_EXPORT_CHUNK_SIZE", "500"))
+USER_BATCH_MAX_IDS = int(os.getenv("USER_BATCH_MAX_IDS", "100"))
+
+
+def _user_filter(role: UserRole | None, deleted: bool) -> dict:
+    where: dict = {"deletedAt": {"not": None} if deleted else None}
+    if role is not None:
+        where["role"] = role.value
+    return where
+
+
+async def _fetch_after(cursor: int | None, take: int, where: dict) -> list:
+    # keyset: id'ye göre sıralı, cursor'dan sonrası (OFFSET yok)
+    if cursor is not None:
+        where = {**where, "id": {"gt": cursor}}
+    # liste / export okumaları replica'dan (yoksa primary)
+    return await read_db.user.find_many(where=where, order={"id": "asc"}, take=take)
+
 
+async def list_users(
+    cursor: int | None = None,
+    limit: int = 50,
+    role: UserRole | None = None,
+    deleted: bool = False,
+) -> UserPage:
+    limit = min(limit, USER_PAGE_MAX_SIZE)
+    # bir fazlasını çek, sonraki sayfa var mı anlaşılsın
+    rows = await _fetch_after(cursor, limit + 1, _user_filter(role, deleted))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return UserPage(
+        items=[User.model_validate(u) for u in rows],
+        nextCursor=rows[-1].id if has_more else None,
+    )
 
-async def get_user(user_id: int):
-    user = await db.user.find_unique(where={"id": user_id})
+
+async def export_users(
+    role: UserRole | None = None, deleted: bool = False
+) -> AsyncIterator[bytes]:
+    """Bütün kullanıcıları NDJSON olarak parça parça üretir; bellekte tek chunk tutulur."""
+    where = _user_filter(role, deleted)
+    cursor = None
+    while True:
+        rows = await _fetch_after(cursor, USER_EXPORT_CHUNK_SIZE, where)
+        if not rows:
+            return
+        yield b"".join(
+            User.model_validate(u).model_dump_json().encode() + b"\n" for u in rows
+        )
+        if len(rows) < USER_EXPORT_CHUNK_SIZE:
+            return
+        cursor = rows[-1].id
+
+
+async def get_user(user_id: int) -> User:
+    user = await user_loader.load(user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    return {
-        "id": user.id,
-        "email": user.email,
-        "role": getattr(user, "role", None),
-        "key": getattr(user, "key", None),
-        "name": getattr(user, "name", None),
-        "surname": getattr(user, "surname", None),
-        "studentNumber": getattr(user, "studentNumber", None),
-        "teamMember": getattr(user, "teamMember", None) is not None,
-    }
-
-
-async def get_team_member_profile(user_id: int):
-    tm = await db.teammember.find_unique(where={"id": user_id})
+    return User.model_validate(user)
+
+
+async def get_users(ids: list[int]) -> UserBatch:
+    """N tane GET /users/{id} yerine tek find_many (DataLoader üzerinden)."""
+    ids = list(dict.fromkeys(ids))
+    users = await user_loader.load_many(ids)
+    return UserBatch(
+        items=[User.model_validate(u) for u in users if u is not None],
+        missing=[i for i, u in zip(ids, users) if u is None],
+    )
+
+
+async def get_team_member_profile(user_id: int) -> TeamMemberProfile:
+    tm = await team_member_loader.load(user_id)
     if tm is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team member profile not found",
         )
-    return {
-        "id": tm.id,
-        "workAreas": tm.workAreas,
-        "photoURL": tm.photoURL,
-        "bio": tm.bio,
-        "github": tm.github,
-        "linkedin": tm.linkedin,
-        "extraLinks": tm.extraLinks,
-        "applicationId": tm.applicationId,
-    }
-
-
-async def update_user(user_id: int, data: dict, current_user) -> dict:
-    await db.user.update(where={"id": user_id}, data=data)
-    updated = await db.user.find_unique(where={"id": user_id})
-    return {
-        "id": updated.id,
-        "email": updated.email,
-        "role": getattr(updated, "role", None),
-        "key": getattr(updated, "key", None),
-        "name": updated.name,
-        "surname": updated.surname,
-        "studentNumber": updated.studentNumber,
-    }
+    return TeamMemberProfile.model_validate(tm)
+
+
+# Bu alanlar değişince kullanıcının eski access token'ları geçersiz olmalı
+TOKEN_VERSION_FIELDS = ("role", "deletedAt")
+
+
+def _precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="User was modified by another request",
+    )
+
+
+async def update_user(
+    user_id: int, data: dict, current_user, if_match: str | None = None
+) -> User:
+    if any(field in data for field in TOKEN_VERSION_FIELDS):
+        data = {**data, "tokenVersion": {"increment": 1}}
+
+    where: dict = {"id": user_id}
+    if if_match is not None and if_match.strip() != "*":
+        # If-Match: optimistic concurrency, istemcinin gördüğü sürüm hâlâ güncelse yaz
+        expected = parse_etag(if_match)
+        if expected is None or expected[0] != user_id:
+            raise _precondition_failed()
+        where["updatedAt"] = expected[1]
+
+    # update güncel satırı döndürür; ayrıca find_unique'e gerek yok
+    updated = await db.user.update(where=where, data=data)
+    if updated is None:
+        if if_match is not None:
+            raise _precondition_failed()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    # role, key veya deletedAt (soft delete) değişmiş olabilir, cache'teki kopya bayat
+    invalidate_user(user_id)
+    return User.model_validate(updated)
@@ -2,10 +2,20 @@ from fastapi import APIRouter, Depends
 
 from app.utils.security import get_current_user, require_admin_or_self  # noqa: F401 (exported for tests)
 from app.utils.security import require_roles
-from fastapi import Path, Body
+from fastapi import Path, Body, Header, Query
+from fastapi.responses import StreamingResponse
 
 from app.modules.user import user_controller
-from app.modules.user.user_schema import User
+from app.modules.user.user_controller import USER_BATCH_MAX_IDS, USER_PAGE_MAX_SIZE
+from app.modules.user.user_schema import (
+    TeamMemberProfile,
+    User,
+    UserBatch,
+    UserPage,
+    UserRole,
+)
+from app.utils.etag import conditional_response
+from app.utils.responses import model_response
 
 router = APIRouter(
     prefix="/users",
@@ -19,18 +29,73 @@ async def admin_only(current_user=Depends(require_roles("ADMIN"))):
     """Example admin-only endpoint for testing role-based dependency."""
     return {"ok": True}
 
+
+@router.get("", response_model=UserPage)
+async def list_users(
+    cursor: int | None = Query(None, ge=0, description="Önceki sayfanın nextCursor'ı"),
+    limit: int = Query(50, ge=1, le=USER_PAGE_MAX_SIZE),
+    role: UserRole | None = None,
+    deleted: bool = Query(False, description="True: sadece soft-delete edilmişler"),
+    current_user=Depends(require_roles("ADMIN")),
+):
+    # User.key de döndüğü için toplu listeleme sadece admin'e açık (/export gibi)
+    page = await user_controller.list_users(cursor, limit, role, deleted)
+    return model_response(page, UserPage)
+
+
+@router.get("/export")
+async def export_users(
+    role: UserRole | None = None,
+    deleted: bool = False,
+    current_user=Depends(require_roles("ADMIN")),
+):
+    """Bütün kullanıcılar, satır başına bir JSON (NDJSON) olarak stream edilir."""
+    return StreamingResponse(
+        user_controller.export_users(role, deleted),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/batch", response_model=UserBatch)
+async def get_users(
+    ids: list[int] = Body(
+        ..., embed=True, min_length=1, max_length=USER_BATCH_MAX_IDS
+    ),
+    current_user=Depends(require_roles("ADMIN")),
+):
+    """Birden fazla kullanıcıyı tek istekte döner: {"ids": [3, 1, 2]}."""
+    # key alanı toplu dönmesin diye /users listesi gibi admin'e açık
+    return model_response(await user_controller.get_users(ids), UserBatch)
+
+
 @router.get("/{id}", response_model=User)
-async def get_user(id: int = Path(..., ge=1)):
-    return await user_controller.get_user(id)
+async def get_user(
+    id: int = Path(..., ge=1), if_none_match: str | None = Header(None)
+):
+    # response_model sadece dokümantasyon için; controller zaten User döndürüyor
+    user = await user_controller.get_user(id)
+    return conditional_response(user, User, if_none_match)
 
 
-@router.get("/{id}/team-member")
-async def get_team_member(id: int = Path(..., ge=1)):
-    return await user_controller.get_team_member_profile(id)
+@router.get("/{id}/team-member", response_model=TeamMemberProfile)
+async def get_team_member(
+    id: int = Path(..., ge=1), if_none_match: str | None = Header(None)
+):
+    profile = await user_controller.get_team_member_profile(id)
+    return conditional_response(profile, TeamMemberProfile, if_none_match)
 
 
 @router.patch("/{id}", response_model=User)
-async def patch_user(id: int, payload: dict = Body(...), current_user=Depends(require_admin_or_self)):
-    return await user_controller.update_user(id, payload, current_user)
+async def patch_user(
+    id: int,
+    payload: dict = Body(...),
+    current_user=Depends(require_admin_or_self),
+    if_match: str | None = Header(None, description="GET'ten alınan ETag"),
+):
+    user = await user_controller.update_user(
+        id, payload, current_user, if_match=if_match
+    )
+    # yeni sürümün ETag'i ile döner, istemci bir sonraki If-Match'te kullanır
+    return conditional_response(user, User)
 
 
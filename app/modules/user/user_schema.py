@@ -1,5 +1,6 @@
+from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserRole(str, Enum):
@@ -9,7 +10,38 @@ class UserRole(str, Enum):
 
 
 class User(BaseModel):
+    # Prisma modelinden doğrudan (attribute'lardan) validate edilebilir
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     email: str
     role: UserRole
     key: str
+    # sadece ETag için (app/utils/etag.py); response body'ye yazılmaz
+    updatedAt: datetime | None = Field(default=None, exclude=True)
+
+
+class UserPage(BaseModel):
+    items: list[User]
+    # bir sonraki sayfa için ?cursor= değeri; son sayfada None
+    nextCursor: int | None = None
+
+
+class UserBatch(BaseModel):
+    # istenen sırayla (tekrarlar bir kez); bulunamayan id'ler missing'de
+    items: list[User]
+    missing: list[int] = []
+
+
+class TeamMemberProfile(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workAreas: list[str]
+    photoURL: str | None = None
+    bio: str
+    github: str | None = None
+    linkedin: str | None = None
+    extraLinks: list[str]
+    applicationId: int | None = None
+    updatedAt: datetime | None = Field(default=None, exclude=True)
@@ -0,0 +1,255 @@
+"""
+Okuma replica'sı ve okumaların primary / replica arasında yönlendirilmesi.
+
+DATABASE_REPLICA_URL verilirse ikinci, salt okunur bir Prisma client açılır.
+Sadece okuyan sorgular db yerine read_db üzerinden yapılır:
+
+    user = await read_db.user.find_unique(where={"id": user_id})
+
+read_db.<model> şu durumlarda primary'yi (app.db.db) verir:
+  - replica tanımlı değil (ya da DB_BACKEND=memory)
+  - replica'nın son kontrolü başarısız ya da gecikmesi REPLICA_MAX_LAG_SECONDS'ı
+    aşıyor
+  - bu istek daha önce primary'e yazdı (read-your-writes, QueryStats.wrote) ya
+    da kod use_primary() bloğunda
+  - bu process'te model'e son REPLICA_STICKY_SECONDS içinde yazıldı (raw SQL
+    bütün modeller sayılır). Yazmadan hemen sonraki istek, ör. invalidate
+    edilen user_cache'in tekrar dolması, eski satırı replica'dan okumasın.
+
+Replica'ya giden bir okuma veri hatası (DataError) dışında bir hatayla düşerse
+replica sağlıksız işaretlenir ve okuma primary'de tekrarlanır. Sağlık ve
+gecikme REPLICA_CHECK_INTERVAL_SECONDS'ta bir arka planda ölçülür; düzelince
+okumalar replica'ya döner. Yazma metotları read_db üzerinden de primary'e gider.
+
+Başka bir worker'daki yazmadan sonra replica en fazla ~REPLICA_MAX_LAG_SECONDS
+eski veri görebilir (worker'lar arası cache TTL'leri gibi).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prisma.errors import DataError
+
+from app.db import (
+    DB_BACKEND,
+    RAW_METHODS,
+    WRITE_METHODS,
+    InstrumentedClient,
+    create_client,
+    current_query_stats,
+    db,
+    last_write_at,
+)
+from app.modules.health.health_queries import REPLICA_LAG_SQL
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "1"))
+REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "1"))
+REPLICA_CHECK_TIMEOUT_SECONDS = float(os.getenv("REPLICA_CHECK_TIMEOUT_SECONDS", "0.5"))
+# gecikme sınırı + kontrol aralığı: yazılan satır en geç bu sürede replica'da
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "2"))
+
+# None: istek bazında karar (QueryStats.wrote); True/False: read_route ile sabit
+_read_route: ContextVar[bool | None] = ContextVar("read_route", default=None)
+
+
+@contextmanager
+def read_route(primary: bool):
+    """Bu bloktaki read_db okumalarını primary'e (ya da uygunsa replica'ya) sabitler."""
+    token = _read_route.set(primary)
+    try:
+        yield
+    finally:
+        _read_route.reset(token)
+
+
+def use_primary():
+    """Taze okuma gereken yerler için: with use_primary(): ..."""
+    return read_route(True)
+
+
+def reads_pinned_to_primary() -> bool:
+    """Mevcut context'teki okumalar primary'e mi sabit (yazmış istek / use_primary)."""
+    route = _read_route.get()
+    if route is not None:
+        return route
+    stats = current_query_stats()
+    return stats is not None and stats.wrote
+
+
+def replica_reads_allowed() -> bool:
+    """Mevcut context'te read_db replica'ya gidebilir mi (model bazlı kontrol hariç)."""
+    return replica.available and not reads_pinned_to_primary()
+
+
+class Replica:
+    def __init__(
+        self,
+        client=None,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        interval: float = REPLICA_CHECK_INTERVAL_SECONDS,
+        timeout: float = REPLICA_CHECK_TIMEOUT_SECONDS,
+        sticky: float = REPLICA_STICKY_SECONDS,
+    ):
+        self.max_lag = max_lag
+        self.interval = interval
+        self.timeout = timeout
+        self.sticky = sticky
+        self.client = None
+        # ilk kontrol başarılı olana kadar okumalar primary'de
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.last_error: str | None = None
+        self.checks = 0
+        self.fallbacks = 0
+        self._task: asyncio.Task | None = None
+        self.configure(client)
+
+    def configure(self, client) -> None:
+        """Replica client'ını değiştirir (None: replica yok), sağlık sıfırlanır."""
+        if client is not None and not isinstance(client, InstrumentedClient):
+            client = InstrumentedClient(client, label="replica.", primary=False)
+        self.client = client
+        self.healthy = False
+        self.lag_seconds = None
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None and self.healthy
+
+    def serves(self, model: str) -> bool:
+        if not self.available or reads_pinned_to_primary():
+            return False
+        return time.monotonic() - last_write_at(model) >= self.sticky
+
+    def _unhealthy(self, error: str) -> None:
+        if self.healthy:
+            logger.warning("read replica unavailable, reading from primary: %s", error)
+        self.healthy = False
+        self.last_error = error
+
+    def mark_failed(self, exc: Exception) -> None:
+        self.fallbacks += 1
+        self._unhealthy(repr(exc))
+
+    async def check(self) -> bool:
+        if self.client is None:
+            return False
+        self.checks += 1
+        try:
+            row = await asyncio.wait_for(
+                self.client.query_first(REPLICA_LAG_SQL), self.timeout
+            )
+        except Exception as exc:  # noqa: BLE001 - replica düşerse primary'e geçilir
+            self._unhealthy(repr(exc))
+            return False
+
+        lag = row.get("lag") if row else None
+        self.lag_seconds = lag
+        if lag is None or lag > self.max_lag:
+            self._unhealthy(f"replication lag {lag}s > {self.max_lag}s")
+            return False
+        if not self.healthy:
+            logger.info("read replica healthy (lag %.3fs)", lag)
+        self.healthy, self.last_error = True, None
+        return True
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def connect(self) -> None:
+        if self.client is None:
+            return
+        try:
+            await self.client.connect()
+        except Exception as exc:  # noqa: BLE001 - replica'sız da çalışır
+            self._unhealthy(repr(exc))
+        else:
+            await self.check()
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def disconnect(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.healthy = False
+        if self.client is not None and self.client.is_connected():
+            await self.client.disconnect()
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.client is not None,
+            "healthy": self.healthy,
+            "lagSeconds": self.lag_seconds,
+            "checks": self.checks,
+            "fallbacks": self.fallbacks,
+            "lastError": self.last_error,
+        }
+
+
+class _FallbackModel:
+    """Replica'daki model; bağlantı / engine hatasında okumayı primary'de tekrarlar."""
+
+    def __init__(self, replica: Replica, name: str):
+        self._replica = replica
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        if attr in WRITE_METHODS:
+            return getattr(getattr(db, self._name), attr)
+        method = getattr(getattr(self._replica.client, self._name), attr)
+        if attr.startswith("_") or not callable(method):
+            return method
+
+        async def call(*args, **kwargs):
+            try:
+                return await method(*args, **kwargs)
+            except DataError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._replica.mark_failed(exc)
+                return await getattr(getattr(db, self._name), attr)(*args, **kwargs)
+
+        return call
+
+
+class ReadClient:
+    """db gibi kullanılır; her model erişiminde primary ya da replica seçilir."""
+
+    def __init__(self, replica: Replica):
+        self._replica = replica
+        self._models: dict[str, _FallbackModel] = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name in RAW_METHODS:
+            return getattr(db, name)
+        if not self._replica.serves(name):
+            return getattr(db, name)
+        model = self._models.get(name)
+        if model is None:
+            model = self._models[name] = _FallbackModel(self._replica, name)
+        return model
+
+
+def _create_replica_client():
+    # memory backend'de replica'ya yazan bir replikasyon yok
+    if DB_BACKEND == "memory" or not DATABASE_REPLICA_URL:
+        return None
+    return create_client(DATABASE_REPLICA_URL)
+
+
+replica = Replica(_create_replica_client())
+read_db = ReadClient(replica)
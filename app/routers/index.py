@@ -1,10 +1,17 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException
+
+from app.db import add_query_listener
+from app.utils.metrics import metrics, route_label
+from app.utils.middleware import MetricsMiddleware, SecurityHeadersMiddleware
 
 # Routerlar
 from app.modules.auth.auth_router import router as authRouter
 from app.modules.user.user_router import router as userRouter
 from app.modules.application import router as applicationRouter
+from app.modules.metrics.metrics_router import router as metricsRouter
+from app.modules.health.health_router import router as healthRouter
 
 
 def setup_app(app: FastAPI) -> None:
@@ -14,69 +21,21 @@ def setup_app(app: FastAPI) -> None:
     """
 
     # ========= MIDDLEWARE =========
-    @app.middleware("http")
-    async def simple_logging_middleware(request: Request, call_next):
-        # Buraya:
-        # - request loglama
-        # - custom header ekleme
-        # - language / tenant vs. çıkarma
-        # gibi işler konulacak
-
-        # Cookie'deki access_token bearer header'na çevrildi
-        access_token = request.cookies.get("access_token")
-
-        if access_token:
-            headers = list(request.scope.get("headers") or [])
-            has_auth = any(k.lower() == b"authorization" for k, _ in headers)
-            if not has_auth:
-                headers.append((b"authorization", f"Bearer {access_token}".encode()))
-                request.scope["headers"] = headers
-
-        # ~~SECURITY HEADERS~~
-
-        response = await call_next(request)
-
-        # 1) Temel güvenlik header'ları
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"  # clickjacking'e karşı
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # 2) HSTS / Lokal geliştirmede sorun çıkarsa kaldırılabilir
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains; preload"
-        )
-
-        # 3) Permissions-Policy (Feature-Policy)
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), "
-            "microphone=(), "
-            "camera=(), "
-            "payment=(), "
-            "fullscreen=(self)"
-            # Tarayıcı API'larını, özellikle mobil/browser'da kısıtlıyoruz.
-            # fullscreen sadece kendi siten için açık
-            # =() şeklindeki izinler yasak. Mesela mikrofon kullanılmayacak.
-        )
-
-        # 4) İzolasyon (COOP / COEP / CORP)
-        # Frontend ile uyumlu hale getirilecek
-
-        """
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-        response.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-        response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
-        """
-
-        # 5) Content Security Policy (CSP)
-        # PROJEYE göre özelleştirilecek
-
-        # response.headers["Content-Security-Policy"] = CSP_POLICY
-        return response
+    # Saf ASGI middleware (app/utils/middleware.py):
+    # - cookie'deki access_token -> Authorization: Bearer
+    # - güvenlik header'ları (X-Frame-Options, HSTS, Permissions-Policy, ...)
+    # Request loglama, language / tenant çıkarma gibi işler de buraya
+    # aynı şekilde ASGI middleware olarak eklenecek.
+    app.add_middleware(SecurityHeadersMiddleware)
+    # En dışta: route bazında süre / status / sorgu sayısı metrikleri (GET /metrics)
+    app.add_middleware(MetricsMiddleware)
+    add_query_listener(metrics.observe_db_query)
 
     # Buraya global exception handler da eklenebilir
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         # prod’da burada loglama yapılacak
+        metrics.record_exception(route_label(request.scope), exc)
         return JSONResponse(
             status_code=500,
             content={"detail": "Internal server error"},
@@ -86,3 +45,40 @@ def setup_app(app: FastAPI) -> None:
     app.include_router(authRouter)
     app.include_router(userRouter)
     app.include_router(applicationRouter)
+    app.include_router(metricsRouter)
+    app.include_router(healthRouter)
+
+
+async def warm_up_routes(app: FastAPI) -> None:
+    """
+    FastAPI route'ların dependency / body analizini ilk eşleştirmede yapıyor;
+    bunu ilk gerçek istek ödemesin diye startup'ta hiçbir route'a uymayan bir
+    istekle bütün route'lar gezilir. Doğrudan router'a gider, middleware'den
+    ve metriklerden geçmez.
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/__warm-up__",
+        "raw_path": b"/__warm-up__",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": None,
+        "server": None,
+        "app": app,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    try:
+        await app.router(scope, receive, send)
+    except HTTPException:
+        # eşleşme yok -> 404, beklenen
+        pass
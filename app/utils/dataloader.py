@@ -0,0 +1,168 @@
+"""
+DataLoader: aynı event-loop turunda gelen id sorgularını tek find_many'de toplar.
+
+Aynı anda gelen istekler (ör. bir sayfadaki birkaç üye kartı) ayrı ayrı
+find_unique yerine tek bir where={"id": {"in": [...]}} sorgusu yapar. Zaten
+yolda olan bir id için ikinci sorgu açılmaz, aynı sonucu bekler. Sonuçlar
+cache'lenmez; kullanıcı cache'i için bkz. security.user_cache.
+
+Replica varsa (app/replica.py) primary'e sabit okumalar (yazmış istek,
+use_primary) ile replica'ya gidebilenler ayrı batch'lenir; batch, yükleyen
+isteğin değil kendi yönünün context'inde çalışır.
+
+Batch boş bir contextvars.Context'te çalışır: ilk gelen isteğin context'inde
+çalışsaydı birleştirilmiş sorgu QueryStats'ta (debug query-count header'ları,
+query budget) sadece o isteğe yazılırdı. Replica'dan okunan batch'te
+bulunamayan anahtarlar primary'de bir kez daha aranır: başka bir worker'ın az
+önce yazdığı satır (ör. yeni signin olan kullanıcı) henüz replica'ya gelmemiş
+olabilir.
+"""
+
+import asyncio
+import contextvars
+import os
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
+from app.replica import read_db, read_route, replica_reads_allowed
+
+DATALOADER_MAX_BATCH_SIZE = int(os.getenv("DATALOADER_MAX_BATCH_SIZE", "100"))
+
+BatchFn = Callable[[list], Awaitable[Iterable[Any]]]
+
+
+class DataLoader:
+    """
+    batch_fn bir anahtar listesi alır ve bulunan kayıtları döner; kayıtlar
+    key_attr ile eşlenir, bulunamayan anahtarlar için load() None döner.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        key_attr: str = "id",
+        max_batch_size: int = DATALOADER_MAX_BATCH_SIZE,
+    ):
+        self.batch_fn = batch_fn
+        self.key_attr = key_attr
+        self.max_batch_size = max(max_batch_size, 1)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # primary'e sabit mi (True) -> anahtar -> future
+        self._queues: dict[bool, dict[Hashable, asyncio.Future]] = {True: {}, False: {}}
+        self._inflight: dict[bool, dict[Hashable, asyncio.Future]] = {
+            True: {},
+            False: {},
+        }
+        self._tasks: set[asyncio.Task] = set()
+        self.loads = 0
+        self.deduped = 0
+        self.batches = 0
+        self.batch_sizes: Counter[int] = Counter()
+        # replica'da bulunamayıp primary'de tekrar aranan batch'ler
+        self.primary_retries = 0
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        # Future'lar loop'a bağlı; testlerde her asyncio.run yeni loop açar
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queues = {True: {}, False: {}}
+            self._inflight = {True: {}, False: {}}
+            self._tasks = set()
+        return loop
+
+    async def load(self, key: Hashable) -> Any | None:
+        loop = self._bind()
+        self.loads += 1
+
+        primary = not replica_reads_allowed()
+        queue = self._queues[primary]
+        future = queue.get(key) or self._inflight[primary].get(key)
+        if future is None and not primary:
+            # primary'den gelecek sonuç da olur (daha taze)
+            future = self._queues[True].get(key) or self._inflight[True].get(key)
+        if future is not None:
+            self.deduped += 1
+        else:
+            future = loop.create_future()
+            if not queue:
+                # bu turdaki diğer load() çağrıları da kuyruğa girsin, sonra gönder
+                loop.call_soon(self._dispatch, primary)
+            queue[key] = future
+            if len(queue) >= self.max_batch_size:
+                self._dispatch(primary)
+
+        # bekleyenlerden biri iptal edilirse ortak future iptal olmasın
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[Any | None]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def _dispatch(self, primary: bool = True) -> None:
+        if not self._queues[primary]:
+            return
+        batch, self._queues[primary] = self._queues[primary], {}
+        self._inflight[primary].update(batch)
+        # hiçbir isteğin QueryStats'ı yok; yön read_route ile _fetch'te seçiliyor
+        task = asyncio.get_running_loop().create_task(
+            self._run(batch, primary), context=contextvars.Context()
+        )
+        # event loop task'lara zayıf referans tutuyor
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, keys: list, primary: bool) -> dict:
+        with read_route(primary):
+            rows = await self.batch_fn(keys)
+        return {getattr(row, self.key_attr): row for row in rows}
+
+    async def _run(self, batch: dict[Hashable, asyncio.Future], primary: bool) -> None:
+        self.batches += 1
+        self.batch_sizes[len(batch)] += 1
+        try:
+            found = await self._fetch(list(batch), primary)
+            missing = [key for key in batch if key not in found]
+            if missing and not primary:
+                self.primary_retries += 1
+                found.update(await self._fetch(missing, True))
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(found.get(key))
+        except Exception as exc:  # noqa: BLE001 - bekleyen her load()'a iletilir
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                    # bekleyen kalmadıysa "exception never retrieved" uyarısı çıkmasın
+                    future.exception()
+        finally:
+            inflight = self._inflight[primary]
+            for key, future in batch.items():
+                if inflight.get(key) is future:
+                    del inflight[key]
+
+    def stats(self) -> dict:
+        return {
+            "loads": self.loads,
+            "deduped": self.deduped,
+            "batches": self.batches,
+            "meanBatchSize": (
+                sum(size * n for size, n in self.batch_sizes.items()) / self.batches
+                if self.batches
+                else 0.0
+            ),
+            "batchSizes": dict(sorted(self.batch_sizes.items())),
+            "primaryRetries": self.primary_retries,
+        }
+
+
+async def _load_users(ids: list[int]):
+    return await read_db.user.find_many(where={"id": {"in": ids}})
+
+
+async def _load_team_members(ids: list[int]):
+    return await read_db.teammember.find_many(where={"id": {"in": ids}})
+
+
+user_loader = DataLoader(_load_users)
+team_member_loader = DataLoader(_load_team_members)
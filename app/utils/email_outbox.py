@@ -0,0 +1,345 @@
+"""
+Giden mailler için process içi asenkron outbox.
+
+Endpoint'ler sadece kuyruğa mesaj bırakır (enqueue); main.lifespan'de başlatılan
+worker mesajları toplu halde, kalıcı tek bir SMTP bağlantısı üzerinden gönderir.
+Geçici hatada mesaj üstel backoff ile hesaplanan bir zamana ertelenir; worker bu
+arada diğer mesajları göndermeye devam eder. Kalıcı hatalar (SMTP 5xx, alıcı
+reddi) tekrar denenmeden düşürülür. Kapanışta kuyruk boşaltılır.
+
+SMTP_HOST tanımlı değilse mailler konsola basılır (lokal geliştirme).
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import smtplib
+import ssl
+from dataclasses import dataclass
+from email.message import EmailMessage as MIMEMessage
+from typing import Self
+
+logger = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
+EMAIL_FROM = os.getenv("EMAIL_FROM", "no-reply@ozu-ai-club.local")
+EMAIL_QUEUE_MAXSIZE = int(os.getenv("EMAIL_QUEUE_MAXSIZE", "1000"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", "5"))
+EMAIL_RETRY_BACKOFF_SECONDS = float(os.getenv("EMAIL_RETRY_BACKOFF_SECONDS", "1"))
+EMAIL_DRAIN_TIMEOUT_SECONDS = float(os.getenv("EMAIL_DRAIN_TIMEOUT_SECONDS", "10"))
+
+
+class OutboxFullError(Exception):
+    """Kuyruk dolu; çağıran taraf isteği reddetmeli (ör. 503)."""
+
+
+@dataclass
+class OutgoingEmail:
+    to: str
+    subject: str
+    body: str
+    attempts: int = 0
+    # transport doldurur: tekrar denemenin anlamı yoksa True
+    permanent: bool = False
+
+
+class ConsoleTransport:
+    """SMTP yapılandırılmamışken mailleri konsola basar."""
+
+    async def send_batch(self, messages: list[OutgoingEmail]) -> list[OutgoingEmail]:
+        for message in messages:
+            print(f"[DEBUG] Mail to {message.to}: {message.subject}\n{message.body}")
+        return []
+
+    async def close(self) -> None:
+        pass
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """Alıcı reddi ve 5xx cevaplar tekrar denense de değişmez."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    # 535 login hatası yapılandırma sorunu, mesajın kendisiyle ilgili değil
+    if isinstance(exc, smtplib.SMTPAuthenticationError):
+        return False
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+class SMTPTransport:
+    """
+    Kalıcı SMTP bağlantısı. smtplib bloklayan bir kütüphane olduğu için
+    gönderim thread'de yapılır; outbox tek worker ile çalıştığından bağlantı
+    aynı anda tek yerden kullanılır.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = False,
+        timeout: float = SMTP_TIMEOUT_SECONDS,
+        sender: str = EMAIL_FROM,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.sender = sender
+        self.connections_opened = 0
+        self._conn: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            conn.starttls(context=ssl.create_default_context())
+        if self.username:
+            conn.login(self.username, self.password or "")
+        self.connections_opened += 1
+        return conn
+
+    def _build(self, message: OutgoingEmail) -> MIMEMessage:
+        mime = MIMEMessage()
+        mime["From"] = self.sender
+        mime["To"] = message.to
+        mime["Subject"] = message.subject
+        mime.set_content(message.body)
+        return mime
+
+    def _send_batch_sync(self, messages: list[OutgoingEmail]) -> list[OutgoingEmail]:
+        failed = []
+        for message in messages:
+            mime = self._build(message)
+            try:
+                if self._conn is None:
+                    self._conn = self._connect()
+                try:
+                    self._conn.send_message(mime)
+                except smtplib.SMTPServerDisconnected:
+                    # Sunucu boşta kalan bağlantıyı kapatmış olabilir, bir kez yeniden bağlan
+                    self._conn = self._connect()
+                    self._conn.send_message(mime)
+            except (smtplib.SMTPException, OSError) as exc:
+                if _is_permanent(exc):
+                    # Bağlantı sağlam, sadece bu mesaj reddedildi
+                    logger.warning("SMTP rejected mail to %s: %r", message.to, exc)
+                    message.permanent = True
+                else:
+                    logger.exception("SMTP send to %s failed", message.to)
+                    self._reset()
+                failed.append(message)
+        return failed
+
+    def _reset(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+        self._conn = None
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._reset()
+
+    async def send_batch(self, messages: list[OutgoingEmail]) -> list[OutgoingEmail]:
+        return await asyncio.to_thread(self._send_batch_sync, messages)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close_sync)
+
+
+class Reservation:
+    """
+    EmailOutbox.reserve ile ayrılmış kuyruk yeri. with bloğu put çağrılmadan
+    biterse (ör. DB yazması hata verdi) yer bırakılır.
+    """
+
+    def __init__(self, outbox: "EmailOutbox"):
+        self._outbox = outbox
+        self._open = True
+
+    def put(self, message: OutgoingEmail) -> None:
+        if not self._open:
+            raise RuntimeError("reservation already used")
+        self._open = False
+        self._outbox._reserved -= 1
+        self._outbox._queue.put_nowait(message)
+
+    def release(self) -> None:
+        if self._open:
+            self._open = False
+            self._outbox._reserved -= 1
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class EmailOutbox:
+    def __init__(
+        self,
+        transport,
+        maxsize: int = EMAIL_QUEUE_MAXSIZE,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_retries: int = EMAIL_MAX_RETRIES,
+        backoff_seconds: float = EMAIL_RETRY_BACKOFF_SECONDS,
+    ):
+        self.transport = transport
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.sent = 0
+        self.dropped = 0
+        # Sınır maxsize ile burada tutuluyor: ayrılan yerler ve tekrar
+        # denenecek mesajlar da sayılır
+        self._queue: asyncio.Queue[OutgoingEmail] = asyncio.Queue()
+        self._reserved = 0
+        # (not_before, sıra, mesaj); not_before loop.time() cinsinden
+        self._retry: list[tuple[float, int, OutgoingEmail]] = []
+        self._retry_seq = itertools.count()
+        self._worker: asyncio.Task | None = None
+
+    def _check_capacity(self) -> None:
+        if self.pending() + self._reserved >= self.maxsize:
+            raise OutboxFullError("email outbox is full")
+
+    def enqueue(self, message: OutgoingEmail) -> None:
+        self._check_capacity()
+        self._queue.put_nowait(message)
+
+    def reserve(self) -> Reservation:
+        """
+        Mesaj hazır olmadan önce kuyrukta yer ayırır; dolu ise OutboxFullError.
+        Mail'den önce yan etkisi olan iş (ör. kodu DB'ye yazmak) yapılacaksa
+        önce yer ayrılır, böylece iş yapıldıktan sonra kuyruk dolu çıkmaz.
+        """
+        self._check_capacity()
+        self._reserved += 1
+        return Reservation(self)
+
+    def pending(self) -> int:
+        return self._queue.qsize() + len(self._retry)
+
+    async def start(self) -> None:
+        if self._worker is not None:
+            return
+        # Kuyruk o anki event loop'a bağlansın; start'tan önce gelenleri taşı
+        queue: asyncio.Queue[OutgoingEmail] = asyncio.Queue()
+        while not self._queue.empty():
+            queue.put_nowait(self._queue.get_nowait())
+        # Ertelenmiş mesajlar da yeni kuyruğa; saatleri eski loop'a göreydi
+        for _, _, message in self._retry:
+            queue.put_nowait(message)
+        self._retry = []
+        self._queue = queue
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = EMAIL_DRAIN_TIMEOUT_SECONDS) -> None:
+        """Kuyruktakileri göndermeye çalışır (en fazla timeout saniye), sonra kapanır."""
+        if self._worker is None:
+            return
+        # Ertelenen mesajlar gönderilene ya da düşürülene kadar task_done
+        # çağrılmadığı için join onları da bekler
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except TimeoutError:
+            logger.warning("email outbox shutdown with %d unsent", self.pending())
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await self.transport.close()
+
+    def _due_retries(self, now: float) -> list[OutgoingEmail]:
+        due = []
+        while self._retry and self._retry[0][0] <= now and len(due) < self.batch_size:
+            due.append(heapq.heappop(self._retry)[2])
+        return due
+
+    async def _next_batch(self) -> list[OutgoingEmail]:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._due_retries(loop.time())
+            if not batch:
+                # Yeni mesaj ya da sıradaki tekrar denemenin zamanı, hangisi önce
+                timeout = self._retry[0][0] - loop.time() if self._retry else None
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    continue
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            return batch
+
+    async def _deliver(self, batch: list[OutgoingEmail]) -> int:
+        """Batch'i bir kez gönderir; tekrar denemeye ertelenen mesaj sayısını döner."""
+        try:
+            failed = await self.transport.send_batch(batch)
+        except Exception:
+            logger.exception("email batch failed")
+            failed = batch
+
+        self.sent += len(batch) - len(failed)
+        now = asyncio.get_running_loop().time()
+        deferred = 0
+        for message in failed:
+            message.attempts += 1
+            if message.permanent or message.attempts > self.max_retries:
+                self.dropped += 1
+                logger.warning(
+                    "dropping mail to %s after %d attempt(s)",
+                    message.to,
+                    message.attempts,
+                )
+                continue
+            not_before = now + self.backoff_seconds * 2 ** (message.attempts - 1)
+            heapq.heappush(self._retry, (not_before, next(self._retry_seq), message))
+            deferred += 1
+        return deferred
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            deferred = 0
+            try:
+                deferred = await self._deliver(batch)
+            finally:
+                # Ertelenenler kuyruktan çıkmış sayılmaz (stop'taki join)
+                for _ in range(len(batch) - deferred):
+                    self._queue.task_done()
+
+
+def _build_transport():
+    if not SMTP_HOST:
+        return ConsoleTransport()
+    return SMTPTransport(
+        host=SMTP_HOST,
+        port=SMTP_PORT,
+        username=SMTP_USERNAME,
+        password=SMTP_PASSWORD,
+        starttls=SMTP_STARTTLS,
+    )
+
+
+email_outbox = EmailOutbox(_build_transport())
@@ -0,0 +1,77 @@
+"""
+id + updatedAt'ten türetilen strong ETag'ler ve koşullu istek yardımcıları.
+
+ETag biçimi: "<id>-<updatedAt epoch ms>". updatedAt DB'de timestamp(3)
+olduğu için ms hassasiyeti satırın sürümünü birebir belirler; If-Match ile gelen
+değer parse edilip UPDATE ... WHERE "updatedAt" = ... koşuluna çevrilebilir.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+from app.utils.responses import model_response
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def make_etag(id: int, updated_at: datetime) -> str:
+    millis = (_as_utc(updated_at) - _EPOCH) // _MILLISECOND
+    return f'"{id}-{millis}"'
+
+
+def etag_for(obj: Any) -> str | None:
+    """updatedAt'i olmayan nesneler (ör. eski test stub'ları) için None."""
+    updated_at = getattr(obj, "updatedAt", None)
+    if updated_at is None:
+        return None
+    return make_etag(obj.id, updated_at)
+
+
+def parse_etag(value: str) -> tuple[int, datetime] | None:
+    """make_etag'in tersi; geçersiz veya weak ETag'lerde None."""
+    value = value.strip()
+    if len(value) < 2 or value[0] != '"' or value[-1] != '"':
+        return None
+    id, sep, millis = value[1:-1].partition("-")
+    if not sep or not id.isdigit() or not millis.isdigit():
+        return None
+    return int(id), _EPOCH + int(millis) * _MILLISECOND
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def if_none_match_hits(header: str | None, etag: str | None) -> bool:
+    """If-None-Match weak karşılaştırma kullanır (RFC 9110 13.1.2)."""
+    if not header or etag is None:
+        return False
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in _tags(header))
+
+
+def conditional_response(
+    content: Any, model: type[BaseModel], if_none_match: str | None = None
+) -> Response:
+    """
+    İstemcideki sürüm hâlâ güncelse gövdesiz 304, değilse ETag header'lı 200.
+    304 durumunda serileştirme hiç yapılmaz.
+    """
+    if not isinstance(content, model):
+        content = model.model_validate(content)
+    etag = etag_for(content)
+    if if_none_match_hits(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response = model_response(content, model)
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,168 @@
+"""
+JWT encode/decode backend'leri. Her backend'in arayüzü aynı:
+
+    encode(claims: dict) -> str
+    decode(token: str) -> dict      # geçersizse InvalidTokenError
+
+    JWT_BACKEND=hmac   HS256/HS384/HS512 için standart kütüphaneyle yazılmış
+                       hızlı yol (varsayılan)
+    JWT_BACKEND=jose   python-jose
+
+hmac backend'i HMAC anahtarını ve header segmentini bir kez hazırlar; her
+çağrıda sadece hazır HMAC nesnesinin kopyası kullanılır. Ürettiği token'lar
+jose'nin ürettiğiyle byte byte aynıdır, iki backend birbirinin token'ını
+çözebilir. HMAC dışı bir algoritma (RS256 vs.) seçilirse jose kullanılır.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from calendar import timegm
+from datetime import datetime
+
+HMAC_ALGORITHMS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+# jose de bu claim'lerdeki datetime'ları epoch saniyesine çeviriyor
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class ExpiredTokenError(InvalidTokenError):
+    pass
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _json(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _with_timestamps(claims: dict) -> dict:
+    claims = dict(claims)
+    for name in _TIME_CLAIMS:
+        value = claims.get(name)
+        if isinstance(value, datetime):
+            claims[name] = timegm(value.utctimetuple())
+    return claims
+
+
+def _check_times(claims: dict) -> None:
+    now = time.time()
+    exp = claims.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise InvalidTokenError("exp must be a number")
+        if exp < now:
+            raise ExpiredTokenError("token has expired")
+    nbf = claims.get("nbf")
+    if nbf is not None:
+        if not isinstance(nbf, (int, float)):
+            raise InvalidTokenError("nbf must be a number")
+        if nbf > now:
+            raise InvalidTokenError("token is not yet valid")
+
+
+class HMACBackend:
+    name = "hmac"
+
+    def __init__(self, secret: str, algorithm: str = "HS256"):
+        if algorithm not in HMAC_ALGORITHMS:
+            raise ValueError(f"unsupported HMAC algorithm: {algorithm}")
+        self.algorithm = algorithm
+        # jose ile aynı: anahtar secret string'inin utf-8 byte'ları
+        self._mac = hmac.new(secret.encode(), digestmod=HMAC_ALGORITHMS[algorithm])
+        header = {"alg": algorithm, "typ": "JWT"}
+        self._header = _b64encode(json.dumps(header, separators=(",", ":")).encode())
+
+    def _sign(self, signing_input: bytes) -> str:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return _b64encode(mac.digest())
+
+    def encode(self, claims: dict) -> str:
+        payload = _b64encode(_json(_with_timestamps(claims)))
+        signing_input = f"{self._header}.{payload}"
+        return f"{signing_input}.{self._sign(signing_input.encode())}"
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, signature = token.rsplit(".", 1)
+            header, payload = signing_input.split(".")
+        except (AttributeError, ValueError):
+            raise InvalidTokenError("malformed token")
+
+        if header != self._header:
+            # aynı algoritma, farklı yazılmış (ör. key sırası) header olabilir
+            try:
+                alg = json.loads(_b64decode(header)).get("alg")
+            except (binascii.Error, ValueError, AttributeError):
+                raise InvalidTokenError("malformed header")
+            if alg != self.algorithm:
+                raise InvalidTokenError(f"unexpected algorithm: {alg!r}")
+
+        expected = self._sign(signing_input.encode("ascii", "replace"))
+        if not hmac.compare_digest(signature.encode(), expected.encode()):
+            raise InvalidTokenError("signature verification failed")
+
+        try:
+            claims = json.loads(_b64decode(payload))
+        except (binascii.Error, ValueError):
+            raise InvalidTokenError("malformed payload")
+        if not isinstance(claims, dict):
+            raise InvalidTokenError("payload must be an object")
+        _check_times(claims)
+        return claims
+
+
+class JoseBackend:
+    name = "jose"
+
+    def __init__(self, secret: str, algorithm: str = "HS256"):
+        # sadece bu backend seçilirse gerekli
+        from jose import ExpiredSignatureError, JWTError, jwt
+
+        self._jwt = jwt
+        self._expired_error = ExpiredSignatureError
+        self._error = JWTError
+        self.secret = secret
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        except self._expired_error as exc:
+            raise ExpiredTokenError(str(exc)) from exc
+        except self._error as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+
+BACKENDS = {"hmac": HMACBackend, "jose": JoseBackend}
+
+
+def build_backend(name: str, secret: str, algorithm: str = "HS256"):
+    if name not in BACKENDS:
+        raise ValueError(
+            f"unknown JWT backend: {name!r} (expected one of {list(BACKENDS)})"
+        )
+    if name == "hmac" and algorithm not in HMAC_ALGORITHMS:
+        name = "jose"
+    return BACKENDS[name](secret, algorithm)
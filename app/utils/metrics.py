@@ -0,0 +1,228 @@
+"""
+Prometheus text formatında metrikler (prometheus_client bağımlılığı yok).
+
+Sıcak yolda kilit yok: sayaçlar event loop thread'inde, await içermeyen düz
+dict / list artırımlarıyla güncellenir. Histogramlar kümülatif olmayan bucket
+sayıları olarak tutulur; kümülatif toplamlar, etiket kaçışları ve ek
+kaynaklardan (cache, sweeper, ...) gelen değerler sadece /metrics okunurken
+hesaplanır.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+# saniye cinsinden; +Inf ayrıca eklenir
+LATENCY_BUCKETS: tuple[float, ...] = tuple(
+    float(b)
+    for b in os.getenv(
+        "METRICS_LATENCY_BUCKETS",
+        "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10",
+    ).split(",")
+)
+
+DB_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERIES_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+# eşleşmeyen path'ler (404 taramaları vs.) ayrı seri açmasın
+UNMATCHED_ROUTE = "<unmatched>"
+
+Sample = tuple[str, dict[str, str], float]
+# (isim, tip, açıklama, örnekler)
+MetricFamily = tuple[str, str, str, list[Sample]]
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+def _observe(
+    hists: dict[tuple, _Histogram], key: tuple, buckets: tuple, value: float
+) -> None:
+    hist = hists.get(key)
+    if hist is None:
+        hist = hists[key] = _Histogram(len(buckets) + 1)
+    hist.counts[bisect_left(buckets, value)] += 1
+    hist.sum += value
+
+
+def _histogram_samples(
+    hists: dict[tuple, _Histogram], label_names: tuple[str, ...], buckets: tuple
+) -> list[Sample]:
+    samples: list[Sample] = []
+    bounds = [*(repr(b) for b in buckets), "+Inf"]
+    for key, hist in list(hists.items()):
+        labels = dict(zip(label_names, key))
+        cumulative = 0
+        for le, count in zip(bounds, list(hist.counts)):
+            cumulative += count
+            samples.append(("_bucket", {**labels, "le": le}, cumulative))
+        samples.append(("_sum", labels, hist.sum))
+        samples.append(("_count", labels, cumulative))
+    return samples
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class Metrics:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.requests: defaultdict[tuple[str, str, int], int] = defaultdict(int)
+        self.latency: dict[tuple[str, str], _Histogram] = {}
+        self.exceptions: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.db_latency: dict[tuple[str], _Histogram] = {}
+        self.db_queries_per_request: dict[tuple[str, str], _Histogram] = {}
+        self.n_plus_one: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.in_flight = 0
+        self._collectors: list[Collector] = []
+        self.started_at = time.time()
+
+    # ---- sıcak yol ----
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        self.requests[(method, route, status)] += 1
+        _observe(self.latency, (method, route), self.buckets, seconds)
+
+    def observe_db_query(self, operation: str, seconds: float) -> None:
+        """app.db query listener'ı olarak kaydedilir (bkz. setup_app)."""
+        _observe(self.db_latency, (operation,), DB_LATENCY_BUCKETS, seconds)
+
+    def observe_request_queries(
+        self, method: str, route: str, count: int, repeated: list[str]
+    ) -> None:
+        _observe(
+            self.db_queries_per_request,
+            (method, route),
+            QUERIES_PER_REQUEST_BUCKETS,
+            count,
+        )
+        for operation in repeated:
+            self.n_plus_one[(route, operation)] += 1
+
+    def record_exception(self, route: str, exc: BaseException) -> None:
+        self.exceptions[(route, type(exc).__name__)] += 1
+
+    # ---- scrape ----
+
+    def register_collector(self, collector: Collector) -> None:
+        """collector() scrape anında çağrılır ve MetricFamily'ler döner."""
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.latency.clear()
+        self.exceptions.clear()
+        self.db_latency.clear()
+        self.db_queries_per_request.clear()
+        self.n_plus_one.clear()
+
+    def _families(self) -> Iterable[MetricFamily]:
+        yield (
+            "http_requests_total",
+            "counter",
+            "HTTP requests by route and status code.",
+            [
+                ("", {"method": m, "route": r, "status": str(s)}, n)
+                for (m, r, s), n in list(self.requests.items())
+            ],
+        )
+
+        yield (
+            "http_request_duration_seconds",
+            "histogram",
+            "HTTP request latency by route.",
+            _histogram_samples(self.latency, ("method", "route"), self.buckets),
+        )
+
+        yield (
+            "http_requests_in_flight",
+            "gauge",
+            "HTTP requests currently being served (SSE streams included).",
+            [("", {}, self.in_flight)],
+        )
+        yield (
+            "http_exceptions_total",
+            "counter",
+            "Unhandled exceptions caught by the global exception handler.",
+            [
+                ("", {"route": r, "exception": e}, n)
+                for (r, e), n in list(self.exceptions.items())
+            ],
+        )
+        yield (
+            "db_query_duration_seconds",
+            "histogram",
+            "Prisma query latency by operation (e.g. user.find_unique).",
+            _histogram_samples(self.db_latency, ("operation",), DB_LATENCY_BUCKETS),
+        )
+        yield (
+            "db_queries_per_request",
+            "histogram",
+            "Prisma queries issued while serving one request.",
+            _histogram_samples(
+                self.db_queries_per_request,
+                ("method", "route"),
+                QUERIES_PER_REQUEST_BUCKETS,
+            ),
+        )
+        yield (
+            "db_n_plus_one_total",
+            "counter",
+            "Requests that repeated the same query operation suspiciously often.",
+            [
+                ("", {"route": r, "operation": o}, n)
+                for (r, o), n in list(self.n_plus_one.items())
+            ],
+        )
+        yield (
+            "process_uptime_seconds",
+            "gauge",
+            "Seconds since the app process started.",
+            [("", {}, time.time() - self.started_at)],
+        )
+        for collector in self._collectors:
+            yield from collector()
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, kind, help_text, samples in self._families():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_num(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _num(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+metrics = Metrics()
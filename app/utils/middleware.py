@@ -0,0 +1,169 @@
+"""
+Saf ASGI middleware'ler.
+
+@app.middleware("http") (BaseHTTPMiddleware) her istek için ekstra task ve
+stream sarmalayıcısı açıyor, streaming response'ları da bozuyor. Buradakiler
+doğrudan ASGI seviyesinde çalışır; header değerleri import anında byte'a
+çevrilmiştir.
+"""
+
+import logging
+import os
+import time
+
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db import start_query_stats
+from app.utils.metrics import Metrics, metrics, route_label
+
+logger = logging.getLogger(__name__)
+
+# Açıkken her response'a X-DB-Query-Count / X-DB-Query-Time-Ms eklenir (sadece geliştirme)
+DB_DEBUG_HEADERS = os.getenv("DB_DEBUG_HEADERS", "").lower() in ("1", "true", "yes")
+# Tek istekte aynı sorgu bu kadar tekrarlanırsa N+1 şüphesi olarak loglanır
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+ACCESS_COOKIE_NAME = "access_token"
+_ACCESS_COOKIE_MARKER = ACCESS_COOKIE_NAME.encode() + b"="
+
+SECURITY_HEADERS: tuple[tuple[bytes, bytes], ...] = (
+    # 1) Temel güvenlik header'ları
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),  # clickjacking'e karşı
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    # 2) HSTS / Lokal geliştirmede sorun çıkarsa kaldırılabilir
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains; preload"),
+    # 3) Permissions-Policy (Feature-Policy)
+    # Tarayıcı API'larını, özellikle mobil/browser'da kısıtlıyoruz.
+    # fullscreen sadece kendi siten için açık
+    # =() şeklindeki izinler yasak. Mesela mikrofon kullanılmayacak.
+    (
+        b"permissions-policy",
+        b"geolocation=(), microphone=(), camera=(), payment=(), fullscreen=(self)",
+    ),
+    # 4) İzolasyon (COOP / COEP / CORP)
+    # Frontend ile uyumlu hale getirilecek
+    # (b"cross-origin-opener-policy", b"same-origin"),
+    # (b"cross-origin-embedder-policy", b"require-corp"),
+    # (b"cross-origin-resource-policy", b"same-origin"),
+    # 5) Content Security Policy (CSP)
+    # PROJEYE göre özelleştirilecek
+    # (b"content-security-policy", CSP_POLICY),
+)
+_SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS)
+
+
+def _promote_cookie_token(scope: Scope) -> None:
+    """Cookie'deki access_token'ı, Authorization header'ı yoksa Bearer header'a çevirir."""
+    cookie = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return
+        if name == b"cookie":
+            cookie = value
+
+    if cookie is None or _ACCESS_COOKIE_MARKER not in cookie:
+        return
+
+    token = cookie_parser(cookie.decode("latin-1")).get(ACCESS_COOKIE_NAME)
+    if token:
+        scope["headers"] = [
+            *scope["headers"],
+            (b"authorization", b"Bearer " + token.encode("latin-1")),
+        ]
+
+
+class SecurityHeadersMiddleware:
+    """Cookie -> Authorization dönüşümü ve güvenlik header'ları."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        _promote_cookie_token(scope)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    h
+                    for h in message.get("headers", ())
+                    if h[0] not in _SECURITY_HEADER_NAMES
+                ]
+                headers.extend(SECURITY_HEADERS)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class MetricsMiddleware:
+    """
+    Route bazında istek sayısı, status kodu ve süre (app/utils/metrics.py).
+    Route etiketi routing'den sonra scope["route"]'tan okunur (ör. /users/{id}).
+    İstek boyunca yapılan Prisma sorguları da sayılır (app/db.py).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        registry: Metrics = metrics,
+        debug_headers: bool = DB_DEBUG_HEADERS,
+    ) -> None:
+        self.app = app
+        self.metrics = registry
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500  # response başlamadan exception çıkarsa
+        queries = start_query_stats()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.debug_headers:
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-db-query-count", str(queries.count).encode()),
+                        (
+                            b"x-db-query-time-ms",
+                            f"{queries.total_seconds * 1000:.2f}".encode(),
+                        ),
+                    ]
+            await send(message)
+
+        registry = self.metrics
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            route = route_label(scope)
+            registry.observe_request(
+                scope["method"], route, status_code, time.perf_counter() - started
+            )
+            repeated = [
+                op
+                for op, n in queries.operations.items()
+                if n >= DB_N_PLUS_ONE_THRESHOLD
+            ]
+            if repeated:
+                logger.warning(
+                    "possible N+1 on %s %s: %s",
+                    scope["method"],
+                    route,
+                    {op: queries.operations[op] for op in repeated},
+                )
+            registry.observe_request_queries(
+                scope["method"], route, queries.count, repeated
+            )
@@ -0,0 +1,187 @@
+"""
+OpenAPI şemasının build sırasında üretilip diskten okunması.
+
+FastAPI şemayı ilk /openapi.json (ve dolayısıyla /docs) isteğinde bütün
+route'ları ve modelleri gezerek üretiyor; soğuk başlayan bir worker'da bu
+ilk isteğe ~100 ms ekliyor. Build adımında:
+
+    OPENAPI_CACHE_PATH=build/openapi.json python scripts/generate_openapi.py
+
+Çalışırken aynı OPENAPI_CACHE_PATH verilirse şema ilk istekte bu dosyadan
+okunur. Dosya yoksa ya da bu app'in route tablosundan üretilmemişse uyarı
+loglanır ve şema her zamanki gibi üretilir. Dosyaya route tablosunun özeti
+(path, method, endpoint, dokümantasyon, parametrelerin ve response model'lerin
+JSON şemaları) yazılır; info.version'ı artırmadan yapılan bir değişiklik de
+cache'i geçersiz kılar. Özet /openapi.json cevabına girmez.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from functools import cache
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+try:
+    # include_router'ı tembel yapan FastAPI sürümlerinde app.routes router'ları
+    # açmıyor; bu yardımcı her route'u etkin path / tag'leriyle verir
+    from fastapi.routing import iter_route_contexts
+except ImportError:  # pragma: no cover - eski FastAPI'de app.routes düz liste
+
+    def iter_route_contexts(routes):
+        return iter(routes)
+
+
+logger = logging.getLogger(__name__)
+
+OPENAPI_CACHE_PATH = os.getenv("OPENAPI_CACHE_PATH")
+
+
+# Dosyada şemanın yanında (üst seviyede) tutulur, _load'da çıkarılır
+ROUTES_HASH_KEY = "x-routes-hash"
+
+# Hash'e girecek, şemayı etkileyen route alanları
+_ROUTE_FIELDS = (
+    "path_format",
+    "name",
+    "summary",
+    "description",
+    "response_description",
+    "tags",
+    "deprecated",
+    "operation_id",
+    "status_code",
+    "responses",
+    "openapi_extra",
+)
+
+
+def _json_schema(annotation, mode: str = "validation") -> str:
+    try:
+        return _cached_json_schema(annotation, mode)
+    except TypeError:  # hash'lenemeyen tip
+        return _cached_json_schema.__wrapped__(annotation, mode)
+
+
+# aynı tipler (int, str, User...) çok route'ta tekrar ediyor
+@cache
+def _cached_json_schema(annotation, mode: str) -> str:
+    try:
+        schema = TypeAdapter(annotation).json_schema(mode=mode)
+    except Exception:  # noqa: BLE001 - şeması çıkmayan tip, repr'i yeterli
+        return repr(annotation)
+    return json.dumps(schema, sort_keys=True, default=repr)
+
+
+def _params(dependant) -> list:
+    # alt dependency'lerin (ör. require_roles) parametreleri de şemaya giriyor
+    params = [
+        [
+            kind,
+            param.name,
+            repr(param.field_info),
+            _json_schema(param.field_info.annotation),
+        ]
+        for kind in ("path", "query", "header", "cookie", "body")
+        for param in getattr(dependant, f"{kind}_params")
+    ]
+    for sub in dependant.dependencies:
+        params.extend(_params(sub))
+    return params
+
+
+def routes_hash(app: FastAPI) -> str:
+    """
+    Şemayı değiştiren route bilgisinin özeti. Model'lerin JSON şemaları
+    dahil; yine de bütün OpenAPI şemasını üretmekten çok daha ucuz.
+    """
+    rows: list = [
+        app.title,
+        app.version,
+        app.openapi_version,
+        app.summary,
+        app.description,
+        app.openapi_tags,
+        app.servers,
+    ]
+    for route in iter_route_contexts(app.routes):
+        original = getattr(route, "original_route", route)
+        if not isinstance(original, APIRoute) or not route.include_in_schema:
+            continue
+        endpoint = route.endpoint
+        rows.append(
+            [
+                sorted(route.methods or ()),
+                f"{endpoint.__module__}.{endpoint.__qualname__}",
+                [getattr(route, name, None) for name in _ROUTE_FIELDS],
+                _params(route.dependant),
+                _json_schema(route.response_model, mode="serialization"),
+            ]
+        )
+    return hashlib.sha256(json.dumps(rows, default=repr).encode()).hexdigest()
+
+
+def generate_openapi(app: FastAPI) -> dict:
+    """
+    Şemayı her zaman route'lardan üretir; use_openapi_cache ile sarılmış
+    app.openapi eski cache dosyasını geri okuyabileceği için build bunu kullanır.
+    """
+    return get_openapi(
+        title=app.title,
+        version=app.version,
+        openapi_version=app.openapi_version,
+        summary=app.summary,
+        description=app.description,
+        terms_of_service=app.terms_of_service,
+        contact=app.contact,
+        license_info=app.license_info,
+        routes=app.routes,
+        webhooks=app.webhooks.routes,
+        tags=app.openapi_tags,
+        servers=app.servers,
+        separate_input_output_schemas=app.separate_input_output_schemas,
+    )
+
+
+def write_openapi_cache(app: FastAPI, path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    schema = {**generate_openapi(app), ROUTES_HASH_KEY: routes_hash(app)}
+    path.write_text(json.dumps(schema, separators=(",", ":")))
+    return path
+
+
+def _load(app: FastAPI, path: Path) -> dict | None:
+    try:
+        schema = json.loads(path.read_text())
+    except FileNotFoundError:
+        logger.warning("OpenAPI cache %s not found, generating schema", path)
+        return None
+    except ValueError:
+        logger.warning("OpenAPI cache %s is not valid JSON, generating schema", path)
+        return None
+
+    # özet sadece doğrulama için, /openapi.json'a girmez
+    if schema.pop(ROUTES_HASH_KEY, None) != routes_hash(app):
+        logger.warning("OpenAPI cache %s is for other routes, ignoring", path)
+        return None
+    return schema
+
+
+def use_openapi_cache(app: FastAPI, path: str | Path | None = OPENAPI_CACHE_PATH):
+    """app.openapi'yi, şemayı önce path'ten okuyan bir sürümle değiştirir."""
+    if not path:
+        return
+    generate = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema is None:
+            app.openapi_schema = _load(app, Path(path)) or generate()
+        return app.openapi_schema
+
+    app.openapi = openapi
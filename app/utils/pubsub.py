@@ -0,0 +1,366 @@
+"""
+Process içi pub/sub hub'ı ve Server-Sent Events yardımcıları.
+
+Her abonenin sınırlı bir kuyruğu var; kuyruğu dolan (yavaş) abone atılır,
+bağlantısı kapanır ve EventSource yeniden bağlanınca listeyi baştan çeker.
+Böylece tek yavaş istemci yüzünden bellek şişmez ve yayıncı beklemez.
+
+Birden fazla worker varsa yayınlar bir transport üzerinden dağıtılır:
+
+    PUBSUB_TRANSPORT=local      tek process (varsayılan)
+    PUBSUB_TRANSPORT=postgres   Postgres LISTEN/NOTIFY (asyncpg gerekir)
+
+Postgres transport'unda yayın NOTIFY ile gider, her worker (yayıncı dahil)
+LISTEN bağlantısından alıp kendi abonelerine dağıtır. NOTIFY payload'u 8000
+byte ile sınırlı, event'ler sadece id gibi küçük alanlar taşımalı.
+
+LISTEN bağlantısı koparsa (Postgres restart, failover, idle timeout) üstel
+backoff ile yeniden bağlanılır ve LISTEN tekrar verilir. Kopukken gelen
+NOTIFY'lar kaybolduğu için o andaki aboneler kapatılır; EventSource yeniden
+bağlanınca listeyi baştan çeker (yavaş aboneyle aynı yol).
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+PUBSUB_TRANSPORT = os.getenv("PUBSUB_TRANSPORT", "local")
+PUBSUB_QUEUE_SIZE = int(os.getenv("PUBSUB_QUEUE_SIZE", "100"))
+PUBSUB_CHANNEL = os.getenv("PUBSUB_CHANNEL", "app_events")
+PUBSUB_DATABASE_URL = os.getenv("PUBSUB_DATABASE_URL") or os.getenv("DATABASE_URL")
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+PUBSUB_RECONNECT_BACKOFF_SECONDS = float(
+    os.getenv("PUBSUB_RECONNECT_BACKOFF_SECONDS", "0.5")
+)
+PUBSUB_RECONNECT_MAX_BACKOFF_SECONDS = float(
+    os.getenv("PUBSUB_RECONNECT_MAX_BACKOFF_SECONDS", "30")
+)
+# sessizce ölen (FIN gelmeyen) bağlantıyı fark etmek için periyodik SELECT 1
+PUBSUB_HEALTH_CHECK_SECONDS = float(os.getenv("PUBSUB_HEALTH_CHECK_SECONDS", "30"))
+
+
+@dataclass(frozen=True)
+class Message:
+    event: str
+    data: dict
+
+
+class Subscription:
+    def __init__(self, hub: "PubSubHub", topic: str, maxsize: int):
+        self.hub = hub
+        self.topic = topic
+        self.queue: asyncio.Queue[Message | None] = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def _offer(self, message: Message) -> bool:
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _close(self) -> None:
+        # bekleyen mesajları at, tüketiciye kapanış sinyali (None) bırak
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Message | None:
+        """Sıradaki mesaj; abonelik kapandıysa (ör. yavaş tüketici) None."""
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class LocalTransport:
+    """Tek process: yayın doğrudan bu hub'ın abonelerine gider."""
+
+    def __init__(self):
+        self._deliver: Callable[[str, Message], None] | None = None
+
+    async def start(
+        self,
+        deliver: Callable[[str, Message], None],
+        resync: Callable[[], None] | None = None,
+    ) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, topic: str, message: Message) -> None:
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+
+def _asyncpg_dsn(url: str) -> str:
+    # Prisma'ya özgü ?schema=... parametresini asyncpg tanımıyor
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "schema"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class PostgresNotifyTransport:
+    """Worker'lar arası dağıtım için Postgres LISTEN/NOTIFY."""
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = PUBSUB_CHANNEL,
+        backoff: float = PUBSUB_RECONNECT_BACKOFF_SECONDS,
+        max_backoff: float = PUBSUB_RECONNECT_MAX_BACKOFF_SECONDS,
+        health_check: float = PUBSUB_HEALTH_CHECK_SECONDS,
+        connect=None,
+    ):
+        self.dsn = _asyncpg_dsn(dsn)
+        self.channel = channel
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.health_check = health_check
+        self.reconnects = 0
+        # None: asyncpg.connect (testler sahte bağlantı verebilir)
+        self._connect = connect
+        self._conn = None
+        self._deliver: Callable[[str, Message], None] | None = None
+        self._resync: Callable[[], None] | None = None
+        self._lost: asyncio.Event | None = None
+        # asyncpg bağlantısında aynı anda tek sorgu çalışabilir: NOTIFY'lar ve
+        # health check sıraya girer ("another operation is in progress")
+        self._execute_lock: asyncio.Lock | None = None
+        self._supervisor: asyncio.Task | None = None
+
+    async def start(
+        self,
+        deliver: Callable[[str, Message], None],
+        resync: Callable[[], None] | None = None,
+    ) -> None:
+        if self._connect is None:
+            try:
+                import asyncpg  # opsiyonel bağımlılık, sadece bu transport için
+            except ImportError as exc:
+                raise RuntimeError(
+                    "PUBSUB_TRANSPORT=postgres requires the asyncpg package"
+                ) from exc
+            self._connect = asyncpg.connect
+
+        self._deliver = deliver
+        self._resync = resync
+        self._lost = asyncio.Event()
+        self._execute_lock = asyncio.Lock()
+        self._conn = await self._listen()
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+        # _on_terminated kendi kapattığımız bağlantıyı kopma saymasın
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+    async def _listen(self):
+        conn = await self._connect(self.dsn)
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+            conn.add_termination_listener(self._on_terminated)
+        except BaseException:
+            conn.terminate()
+            raise
+        return conn
+
+    def _on_terminated(self, connection) -> None:
+        if connection is self._conn:
+            self._lost.set()
+
+    async def _execute(self, conn, query: str, *args) -> None:
+        async with self._execute_lock:
+            await conn.execute(query, *args)
+
+    async def _alive(self) -> bool:
+        try:
+            await asyncio.wait_for(
+                self._execute(self._conn, "SELECT 1"), self.health_check
+            )
+            return True
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("pubsub LISTEN connection health check failed: %r", exc)
+            return False
+
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._lost.wait(), self.health_check)
+            except TimeoutError:
+                if await self._alive():
+                    continue
+            await self._reconnect()
+
+    async def _reconnect(self) -> None:
+        self._lost.clear()
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.terminate()
+        logger.warning("pubsub LISTEN connection lost, reconnecting")
+        delay = self.backoff
+        while self._conn is None:
+            try:
+                self._conn = await self._listen()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "pubsub reconnect failed: %r, retrying in %.1fs", exc, delay
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+        self.reconnects += 1
+        logger.info("pubsub LISTEN connection restored")
+        # kopukken gelen NOTIFY'lar kayboldu, aboneler listeyi yeniden çeksin
+        if self._resync is not None:
+            self._resync()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            raw = json.loads(payload)
+            message = Message(raw["event"], raw["data"])
+        except (ValueError, KeyError):
+            logger.warning("ignoring malformed pubsub payload: %r", payload)
+            return
+        if self._deliver is not None:
+            self._deliver(raw.get("topic", ""), message)
+
+    async def publish(self, topic: str, message: Message) -> None:
+        payload = json.dumps(
+            {"topic": topic, "event": message.event, "data": message.data}
+        )
+        conn = self._conn
+        if conn is None:
+            raise ConnectionError("pubsub connection is reconnecting")
+        try:
+            await self._execute(conn, "SELECT pg_notify($1, $2)", self.channel, payload)
+        except Exception:
+            if conn.is_closed() and self._lost is not None:
+                self._lost.set()
+            raise
+
+
+class PubSubHub:
+    def __init__(self, transport=None, queue_size: int = PUBSUB_QUEUE_SIZE):
+        self.transport = transport or LocalTransport()
+        self.queue_size = queue_size
+        self._topics: dict[str, set[Subscription]] = {}
+        self._started = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+        self.publish_failures = 0
+
+    async def start(self) -> None:
+        await self.transport.start(self._deliver_local, self._close_subscribers)
+        self._started = True
+
+    async def stop(self) -> None:
+        self._started = False
+        await self.transport.stop()
+        self._close_subscribers()
+
+    def _close_subscribers(self) -> None:
+        for subs in self._topics.values():
+            for sub in subs:
+                sub._close()
+        self._topics.clear()
+
+    def subscribe(self, topic: str) -> Subscription:
+        sub = Subscription(self, topic, self.queue_size)
+        self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._topics.get(sub.topic)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._topics[sub.topic]
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        if topic is not None:
+            return len(self._topics.get(topic, ()))
+        return sum(len(s) for s in self._topics.values())
+
+    def _deliver_local(self, topic: str, message: Message) -> None:
+        for sub in list(self._topics.get(topic, ())):
+            if sub._offer(message):
+                self.delivered += 1
+                continue
+            # yavaş tüketici: kuyruğu dolmuş, bağlantısını kapat
+            sub.dropped = True
+            self.dropped_subscribers += 1
+            self.unsubscribe(sub)
+            sub._close()
+
+    async def publish(self, topic: str, event: str, data: dict) -> None:
+        """Yayın hatası isteği bozmasın; event kaybolur, loglanır."""
+        if not self._started:
+            return
+        self.published += 1
+        try:
+            await self.transport.publish(topic, Message(event, data))
+        except Exception:
+            self.publish_failures += 1
+            logger.exception("pubsub publish failed (%s %s)", topic, event)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count(),
+            "published": self.published,
+            "delivered": self.delivered,
+            "droppedSubscribers": self.dropped_subscribers,
+            "publishFailures": self.publish_failures,
+        }
+
+
+def _build_transport():
+    if PUBSUB_TRANSPORT == "postgres":
+        return PostgresNotifyTransport(PUBSUB_DATABASE_URL or "")
+    return LocalTransport()
+
+
+hub = PubSubHub(_build_transport())
+
+
+def format_sse(message: Message) -> bytes:
+    data = json.dumps(message.data, separators=(",", ":"))
+    return f"event: {message.event}\ndata: {data}\n\n".encode()
+
+
+async def sse_stream(
+    sub: Subscription, heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS
+) -> AsyncIterator[bytes]:
+    """
+    Aboneliği SSE byte'larına çevirir. Mesaj yokken heartbeat yorumu gönderilir
+    ki proxy'ler bağlantıyı boşta diye kapatmasın. İstemci gidince
+    (StreamingResponse generator'ı iptal eder) abonelik kapanır.
+    """
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(sub.get(), heartbeat_seconds)
+            except TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if message is None:
+                return
+            yield format_sse(message)
+    finally:
+        sub.close()
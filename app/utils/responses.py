@@ -0,0 +1,53 @@
+"""
+Hızlı JSON response sınıfı.
+
+orjson kuruluysa onunla, değilse standart json ile encode eder. İçerik bir
+pydantic modeli ise doğrudan model_dump_json kullanılır (dict'e çevirip tekrar
+encode etmeye gerek yok).
+
+Controller zaten response modelini döndürüyorsa route içinde
+model_response(...) dönmek FastAPI'nin response_model ile ikinci kez
+validate etmesini atlar; response_model dekoratörde sadece dokümantasyon için
+kalır.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # opsiyonel bağımlılık
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode()
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Uygulamanın varsayılan response sınıfı (bkz. main.py)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(
+    content: Any, model: type[BaseModel], status_code: int = 200
+) -> FastJSONResponse:
+    """content model değilse (ör. dict) bir kez validate edilir, sonra encode edilir."""
+    if not isinstance(content, model):
+        content = model.model_validate(content, from_attributes=True)
+    return FastJSONResponse(content, status_code=status_code)
@@ -1,17 +1,61 @@
+import hashlib
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from jose import jwt, JWTError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 
-from app.db import db
+from app.utils.cache import TTLCache
+from app.utils.dataloader import user_loader
+from app.utils.jwt_codec import InvalidTokenError, build_backend
 
 JWT_SECRET_KEY = os.getenv(
     "JWT_SECRET_KEY", "a746b717be9fab1fa6ed250c50fb4eff788ac10b641755900166ddc1c707b2fc"
 )
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+# hmac: hazır anahtarlı hızlı HS256 (varsayılan), jose: python-jose
+JWT_BACKEND = os.getenv("JWT_BACKEND", "hmac")
+# doğrulanmış access token claim'leri, token'ın exp'ine kadar (0 verilirse kapanır)
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "4096"))
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+# rotate edilen token bu süre içinde tekrar gelirse replay sayılmaz (paralel refresh)
+REFRESH_TOKEN_REUSE_GRACE_SECONDS = float(
+    os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "10")
+)
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+# Açıkken access token role + tokenVersion taşır, rol kontrolleri DB'ye gitmez
+AUTH_CLAIMS_MODE = os.getenv("AUTH_CLAIMS_MODE", "false").lower() in ("1", "true", "yes")
+TOKEN_VERSION_CACHE_TTL_SECONDS = float(
+    os.getenv("TOKEN_VERSION_CACHE_TTL_SECONDS", "30")
+)
+
+# get_current_user için id -> User cache'i (0 verilirse kapanır)
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+# claims modunda id -> tokenVersion cache'i. Başka worker'daki rol değişikliği
+# en geç TOKEN_VERSION_CACHE_TTL_SECONDS sonra burada da görülür.
+token_version_cache = TTLCache(
+    maxsize=USER_CACHE_MAX_SIZE * 4, ttl=TOKEN_VERSION_CACHE_TTL_SECONDS
+)
+
+jwt_backend = build_backend(JWT_BACKEND, JWT_SECRET_KEY, JWT_ALGORITHM)
+
+# token digest'i -> claims. Kayıt token'ın exp'inde düşer, yani cache'ten
+# dönen claim'ler süresi dolmamış ve imzası bir kez doğrulanmış token'a ait.
+claims_cache = TTLCache(
+    maxsize=JWT_CLAIMS_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Claims modunda doğrulanmış access token'dan çıkan kullanıcı bilgisi."""
+
+    id: int
+    role: str
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -28,21 +72,34 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     to_encode.update({"exp": expire})
 
     # Token üretimi
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
 
+def access_token_claims(user) -> dict:
+    """
+    Access token payload'unu üretir.
+    AUTH_CLAIMS_MODE açıksa role ve tokenVersion ("ver") da eklenir.
+    """
+    claims = {"sub": str(user.id)}
+    if AUTH_CLAIMS_MODE:
+        role = getattr(user, "role", None)
+        claims["role"] = getattr(role, "value", role)
+        claims["ver"] = getattr(user, "tokenVersion", 0)
+    return claims
+
+
 def create_refresh_token(data: dict):
     expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode = data.copy()
     to_encode.update({"exp": expire})
 
-    return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    return jwt_backend.encode(to_encode)
 
 
 def verify_refresh_token(token: str):
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt_backend.decode(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -50,28 +107,44 @@ def verify_refresh_token(token: str):
                 detail="Invalid refresh token: missing subject",
             )
         return user_id
-    except JWTError:
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
 
 
-def verify_access_token(token: str):
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+def _token_digest(token: str) -> bytes:
+    # cache'te token'ın kendisi tutulmasın
+    return hashlib.sha256(token.encode()).digest()
+
+
+def decode_access_token(token: str) -> dict:
+    key = _token_digest(token)
+    payload = claims_cache.get(key)
+    if payload is None:
+        try:
+            payload = jwt_backend.decode(token)
+        except InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token: missing subject",
+                detail="Invalid or expired token",
             )
-        return user_id
-    except JWTError:
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            claims_cache.set(key, payload, ttl=exp - time.time())
+    # çağıran değiştirse bile cache'teki kopya bozulmasın
+    payload = dict(payload)
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
+            detail="Invalid token: missing subject",
         )
+    return payload
+
+
+def verify_access_token(token: str):
+    return decode_access_token(token)["sub"]
 
 
 # Urlsinden tokeni aldık
@@ -82,22 +155,80 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     # 1.token'den user_id'yi çıkar
     user_id = verify_access_token(token)
 
-    # 2.DB'de kullanıcı var mı kontrol et
-    user = await db.user.find_unique(where={"id": int(user_id)})
+    # 2.Önce cache, yoksa DB'de kullanıcı var mı kontrol et
+    user = user_cache.get(int(user_id))
+    if user is None:
+        # aynı anda gelen cache miss'ler tek find_many'de birleşir
+        user = await user_loader.load(int(user_id))
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+
+        user_cache.set(user.id, user)
+        token_version_cache.set(user.id, getattr(user, "tokenVersion", 0))
+
+    return user
+
+
+async def get_token_version(user_id: int) -> int:
+    """Kullanıcının güncel tokenVersion'ı; cache'te yoksa tek sefer DB'den okunur."""
+    version = token_version_cache.get(user_id)
+    if version is not None:
+        return version
 
+    user = user_cache.get(user_id)
     if user is None:
+        user = await user_loader.load(user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        user_cache.set(user.id, user)
+
+    version = getattr(user, "tokenVersion", 0)
+    token_version_cache.set(user_id, version)
+    return version
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)):
+    """
+    Claims modunda rol kontrolü için kullanıcıyı token'dan çıkarır.
+    role/ver taşımayan (eski) token'lar için get_current_user'a düşer.
+    """
+    payload = decode_access_token(token)
+    role, version = payload.get("role"), payload.get("ver")
+    if role is None or version is None:
+        return await get_current_user(token)
+
+    user_id = int(payload["sub"])
+    # Rol değişikliği / reset_key tokenVersion'ı artırır, eski token'lar reddedilir
+    if await get_token_version(user_id) != version:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Token has been revoked",
         )
 
-    return user
+    return TokenPrincipal(id=user_id, role=role)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user; call after any write to the user row (role, key, deletedAt...)."""
+    user_cache.invalidate(int(user_id))
+    token_version_cache.invalidate(int(user_id))
+
+
+# Rol kontrollerinin kullandığı dependency: claims modunda DB'ye gitmez
+current_principal = get_current_principal if AUTH_CLAIMS_MODE else get_current_user
 
 
 def require_roles(*roles: str):
     """Return a dependency that requires the current user to have one of the given roles."""
 
-    async def _require(current_user=Depends(get_current_user)):
+    async def _require(current_user=Depends(current_principal)):
         if getattr(current_user, "role", None) not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return current_user
@@ -105,7 +236,7 @@ def require_roles(*roles: str):
     return _require
 
 
-async def require_admin_or_self(id: int, current_user=Depends(get_current_user)):
+async def require_admin_or_self(id: int, current_user=Depends(current_principal)):
     """Dependency that allows access if current_user is admin or the same user as the path `id`."""
     if current_user.id != id and getattr(current_user, "role", None) != "ADMIN":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
@@ -0,0 +1,166 @@
+"""
+Süresi dolmuş / kullanılmış Code ve RefreshToken satırlarını temizleyen görev.
+
+main.lifespan içinde periyodik olarak çalışır. Cron ile çalıştırmak için:
+
+    python -m app.utils.sweeper
+
+Silme işlemi küçük parçalar halinde yapılır (önce id'ler okunur, sonra
+id IN (...) ile silinir) ki tek bir uzun DELETE tabloyu kilitlemesin.
+Revoke edilmiş refresh token'lar replay tespiti için revoke edildikleri andan
+(revokedAt) itibaren REVOKED_TOKEN_RETENTION_HOURS boyunca saklanır; süreyi
+createdAt'ten saymak rotate edilen eski token'ı hemen silip replay'i
+görünmez yapardı.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from app.db import db
+
+logger = logging.getLogger(__name__)
+
+SWEEPER_INTERVAL_SECONDS = float(os.getenv("SWEEPER_INTERVAL_SECONDS", "600"))
+SWEEPER_CHUNK_SIZE = int(os.getenv("SWEEPER_CHUNK_SIZE", "500"))
+REVOKED_TOKEN_RETENTION_HOURS = float(os.getenv("REVOKED_TOKEN_RETENTION_HOURS", "24"))
+
+
+@dataclass
+class SweepResult:
+    expired_codes: int = 0
+    used_codes: int = 0
+    expired_refresh_tokens: int = 0
+    revoked_refresh_tokens: int = 0
+    duration_seconds: float = 0.0
+    finished_at: datetime | None = field(default=None)
+
+    @property
+    def total(self) -> int:
+        return (
+            self.expired_codes
+            + self.used_codes
+            + self.expired_refresh_tokens
+            + self.revoked_refresh_tokens
+        )
+
+
+async def _delete_in_chunks(model, where: dict, chunk_size: int) -> int:
+    deleted = 0
+    while True:
+        rows = await model.find_many(where=where, take=chunk_size)
+        if not rows:
+            break
+        deleted += await model.delete_many(where={"id": {"in": [r.id for r in rows]}})
+        if len(rows) < chunk_size:
+            break
+    return deleted
+
+
+async def sweep_once(chunk_size: int = SWEEPER_CHUNK_SIZE) -> SweepResult:
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    revoked_before = now - timedelta(hours=REVOKED_TOKEN_RETENTION_HOURS)
+
+    result = SweepResult()
+    result.expired_codes = await _delete_in_chunks(
+        db.code, {"expiry": {"lt": now}}, chunk_size
+    )
+    result.used_codes = await _delete_in_chunks(db.code, {"used": True}, chunk_size)
+    result.expired_refresh_tokens = await _delete_in_chunks(
+        db.refreshtoken, {"expiresAt": {"lt": now}}, chunk_size
+    )
+    result.revoked_refresh_tokens = await _delete_in_chunks(
+        db.refreshtoken,
+        {"revoked": True, "revokedAt": {"lt": revoked_before}},
+        chunk_size,
+    )
+    result.duration_seconds = time.perf_counter() - started
+    result.finished_at = datetime.now(timezone.utc)
+    return result
+
+
+class Sweeper:
+    """Periyodik temizlik görevi; son çalışmanın ve toplamların sayılarını tutar."""
+
+    def __init__(
+        self,
+        interval: float = SWEEPER_INTERVAL_SECONDS,
+        chunk_size: int = SWEEPER_CHUNK_SIZE,
+    ):
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.runs = 0
+        self.failures = 0
+        self.total_deleted = 0
+        self.last_result: SweepResult | None = None
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> SweepResult:
+        result = await sweep_once(self.chunk_size)
+        self.runs += 1
+        self.total_deleted += result.total
+        self.last_result = result
+        logger.info("sweeper removed %d rows: %s", result.total, asdict(result))
+        return result
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("sweeper run failed")
+
+    def start(self) -> None:
+        # interval <= 0 ise periyodik görev kapalı (ör. cron kullanılıyorsa)
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "totalDeleted": self.total_deleted,
+            "lastRun": asdict(self.last_result) if self.last_result else None,
+        }
+
+
+sweeper = Sweeper()
+
+
+async def _main(chunk_size: int) -> None:
+    await db.connect()
+    try:
+        result = await sweep_once(chunk_size)
+    finally:
+        await db.disconnect()
+    print(
+        f"expired codes: {result.expired_codes}, used codes: {result.used_codes}, "
+        f"expired refresh tokens: {result.expired_refresh_tokens}, "
+        f"revoked refresh tokens: {result.revoked_refresh_tokens} "
+        f"({result.duration_seconds:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Delete expired/used auth rows once (for cron)."
+    )
+    parser.add_argument("--chunk-size", type=int, default=SWEEPER_CHUNK_SIZE)
+    asyncio.run(_main(parser.parse_args().chunk_size))
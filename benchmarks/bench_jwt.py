@@ -0,0 +1,59 @@
+"""
+JWT backend'lerinin encode / decode maliyeti (app/utils/jwt_codec.py) ve
+security.decode_access_token'daki claims cache'inin etkisi:
+
+    python -m benchmarks.bench_jwt --iterations 20000
+
+"cached" satırı aynı token'ın tekrar tekrar doğrulanmasıdır (tipik: bir
+istemcinin access token'ı ömrü boyunca her istekte gelir).
+"""
+
+import argparse
+import time
+from datetime import timedelta
+
+from app.utils import security
+from app.utils.jwt_codec import BACKENDS
+from benchmarks.common import print_table, summarize
+
+
+def measure(fn, iterations: int) -> dict:
+    for _ in range(min(iterations, 1000)):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def main(args: argparse.Namespace) -> None:
+    claims = {"sub": "42", "role": "MEMBER", "ver": 3}
+    rows = {}
+    for name, backend_cls in BACKENDS.items():
+        backend = backend_cls(security.JWT_SECRET_KEY, "HS256")
+        token = security.create_access_token(claims, timedelta(minutes=30))
+        rows[f"{name}: encode"] = measure(
+            lambda b=backend: b.encode({**claims, "exp": time.time() + 1800}),
+            args.iterations,
+        )
+        rows[f"{name}: decode"] = measure(
+            lambda b=backend, t=token: b.decode(t), args.iterations
+        )
+
+    token = security.create_access_token(claims, timedelta(minutes=30))
+    security.decode_access_token(token)
+    rows[f"{security.jwt_backend.name}: decode (cached)"] = measure(
+        lambda: security.decode_access_token(token), args.iterations
+    )
+
+    print_table(rows)
+    print("\nops/sec = throughput_rps")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
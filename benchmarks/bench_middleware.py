@@ -0,0 +1,107 @@
+"""
+/ping üzerinde eski BaseHTTPMiddleware ile yeni saf ASGI middleware'in req/s karşılaştırması.
+
+Veritabanı gerekmez, uygulama httpx ASGITransport ile process içinde sürülür:
+
+    python -m benchmarks.bench_middleware --requests 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.utils.middleware import SecurityHeadersMiddleware
+from benchmarks.common import print_table, summarize
+
+
+def legacy_app() -> FastAPI:
+    """Değişiklikten önceki @app.middleware("http") sürümü."""
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def simple_logging_middleware(request: Request, call_next):
+        access_token = request.cookies.get("access_token")
+        if access_token:
+            headers = list(request.scope.get("headers") or [])
+            has_auth = any(k.lower() == b"authorization" for k, _ in headers)
+            if not has_auth:
+                headers.append((b"authorization", f"Bearer {access_token}".encode()))
+                request.scope["headers"] = headers
+
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Strict-Transport-Security"] = (
+            "max-age=31536000; includeSubDomains; preload"
+        )
+        response.headers["Permissions-Policy"] = (
+            "geolocation=(), "
+            "microphone=(), "
+            "camera=(), "
+            "payment=(), "
+            "fullscreen=(self)"
+        )
+        return response
+
+    _add_ping(app)
+    return app
+
+
+def asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware)
+    _add_ping(app)
+    return app
+
+
+def _add_ping(app: FastAPI) -> None:
+    @app.get("/ping")
+    async def ping():
+        return {"message": "pong"}
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int, cookie: bool) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Cookie": "access_token=abc.def.ghi"} if cookie else {}
+    samples: list[float] = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                started = time.perf_counter()
+                res = await c.get("/ping", headers=headers)
+                samples.append(time.perf_counter() - started)
+                assert res.status_code == 200
+
+        per_worker = requests // concurrency
+        # warm-up
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        samples.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        return summarize(samples, time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    rows = {}
+    for cookie in (False, True):
+        suffix = " +cookie" if cookie else ""
+        rows[f"BaseHTTPMiddleware{suffix}"] = await drive(
+            legacy_app(), args.requests, args.concurrency, cookie
+        )
+        rows[f"pure ASGI{suffix}"] = await drive(
+            asgi_app(), args.requests, args.concurrency, cookie
+        )
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""
+İstek başına serileştirme maliyeti: eski dict + response_model + json yolu ile
+Prisma nesnesinden doğrudan model + FastJSONResponse yolunun karşılaştırması.
+
+HTTP veya veritabanı yok, sadece controller dönüşü -> response body kısmı ölçülür:
+
+    python -m benchmarks.bench_serialization --iterations 20000
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+
+from app.modules.user.user_schema import User, UserPage
+from app.utils import responses
+from app.utils.responses import FastJSONResponse, model_response
+from benchmarks.common import print_table, summarize
+
+
+def _prisma_user(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i,
+        email=f"user{i}@ozu.edu.tr",
+        role="STUDENT",
+        key=f"key-{i}",
+        name="Ad",
+        surname="Soyad",
+        studentNumber=f"S{i:06d}",
+        teamMember=None,
+    )
+
+
+def legacy_user(user) -> bytes:
+    """Değişiklikten önceki yol: elle dict, response_model validasyonu, json.dumps."""
+    content = {
+        "id": user.id,
+        "email": user.email,
+        "role": getattr(user, "role", None),
+        "key": getattr(user, "key", None),
+        "name": getattr(user, "name", None),
+        "surname": getattr(user, "surname", None),
+        "studentNumber": getattr(user, "studentNumber", None),
+        "teamMember": getattr(user, "teamMember", None) is not None,
+    }
+    validated = User.model_validate(content).model_dump(mode="json")
+    return JSONResponse(validated).body
+
+
+def fast_user(user) -> bytes:
+    return model_response(User.model_validate(user), User).body
+
+
+def legacy_page(users) -> bytes:
+    page = UserPage(items=[User.model_validate(u, from_attributes=True) for u in users])
+    validated = UserPage.model_validate(page.model_dump()).model_dump(mode="json")
+    return JSONResponse(validated).body
+
+
+def fast_page(users) -> bytes:
+    return FastJSONResponse(
+        UserPage(items=[User.model_validate(u) for u in users])
+    ).body
+
+
+def fast_dict_without_orjson(payload: dict) -> bytes:
+    orjson, responses.orjson = responses.orjson, None
+    try:
+        return FastJSONResponse(payload).body
+    finally:
+        responses.orjson = orjson
+
+
+def measure(fn, arg, iterations: int) -> dict:
+    for _ in range(min(iterations, 1000)):
+        fn(arg)
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - t)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def main(args: argparse.Namespace) -> None:
+    user = _prisma_user(1)
+    users = [_prisma_user(i) for i in range(args.page_size)]
+    payload = json.loads(legacy_page(users))
+
+    rows = {
+        "user: dict + json": measure(legacy_user, user, args.iterations),
+        "user: model + fast": measure(fast_user, user, args.iterations),
+        f"page({args.page_size}): dict + json": measure(
+            legacy_page, users, args.iterations // 10
+        ),
+        f"page({args.page_size}): model + fast": measure(
+            fast_page, users, args.iterations // 10
+        ),
+        "dict: stdlib json": measure(
+            fast_dict_without_orjson, payload, args.iterations // 10
+        ),
+    }
+    if responses.orjson is not None:
+        rows["dict: orjson"] = measure(
+            lambda p: FastJSONResponse(p).body, payload, args.iterations // 10
+        )
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,140 @@
+"""
+Soğuk başlangıç profili: her ölçüm ayrı, yeni bir Python process'inde yapılır.
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --openapi-cache build/openapi.json
+
+Raporlananlar:
+  - hazır olana kadar geçen süre, aşamalara bölünmüş: interpreter açılışı,
+    `import app.main`, lifespan startup (db.connect, outbox, pubsub, ...),
+    ilk istek (GET /ping) ve ilk GET /openapi.json
+  - `python -X importtime` çıktısından paket bazında import süreleri ve en
+    pahalı app.* modülleri
+
+DB_BACKEND verilmezse memory backend kullanılır, Postgres gerekmez.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PHASES = ("interpreter", "import", "lifespan", "first_request", "openapi")
+
+# Child process: aşama sürelerini JSON olarak stdout'a basar
+_CHILD = """
+import asyncio, json, time
+import httpx
+started = time.time()
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+
+async def boot():
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        t2 = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url="http://s") as c:
+            assert (await c.get("/ping")).status_code == 200
+            t3 = time.perf_counter()
+            assert (await c.get("/openapi.json")).status_code == 200
+            t4 = time.perf_counter()
+    return t2, t3, t4
+
+t2, t3, t4 = asyncio.run(boot())
+print(json.dumps({"started": started, "import": t1 - t0, "lifespan": t2 - t1,
+                  "first_request": t3 - t2, "openapi": t4 - t3}))
+"""
+
+
+def _child_env(args: argparse.Namespace) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DB_BACKEND", "memory")
+    env.setdefault("SWEEPER_INTERVAL_SECONDS", "3600")
+    # imajda .pyc'ler build'de yazılı olur; ölçüme derleme süresi karışmasın
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if args.openapi_cache:
+        env["OPENAPI_CACHE_PATH"] = args.openapi_cache
+    return env
+
+
+def run_once(args: argparse.Namespace) -> tuple[dict, str]:
+    spawned = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        capture_output=True,
+        text=True,
+        env=_child_env(args),
+        cwd=ROOT,
+        check=False,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+    phases = json.loads(proc.stdout.strip().splitlines()[-1])
+    # perf_counter process'ler arası karşılaştırılamaz, açılış duvar saatiyle
+    phases["interpreter"] = max(phases.pop("started") - spawned, 0.0)
+    phases["total"] = sum(phases[p] for p in PHASES)
+    return phases, proc.stderr
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(modül, self µs, kümülatif µs) listesi."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def by_package(rows: list[tuple[str, int, int]]) -> dict[str, float]:
+    totals: defaultdict[str, float] = defaultdict(float)
+    for name, self_us, _ in rows:
+        totals[name.split(".")[0]] += self_us / 1000
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def main(args: argparse.Namespace) -> None:
+    run_once(args)  # .pyc'leri yazar, sonuç sayılmaz
+    runs = [run_once(args) for _ in range(args.runs)]
+
+    print(f"time to ready, median of {args.runs} runs (ms)")
+    for phase in (*PHASES, "total"):
+        values = [phases[phase] * 1000 for phases, _ in runs]
+        print(f"  {phase:<16}{statistics.median(values):>10.1f}")
+
+    # import dökümü son çalıştırmadan (diğerleriyle aynı modüller)
+    rows = parse_importtime(runs[-1][1])
+    print(f"\nimport time by top-level package, self time (ms), top {args.top}")
+    for package, ms in list(by_package(rows).items())[: args.top]:
+        print(f"  {package:<32}{ms:>10.1f}")
+
+    app_modules = sorted(
+        (r for r in rows if r[0] == "app" or r[0].startswith("app.")),
+        key=lambda r: r[2],
+        reverse=True,
+    )
+    print(f"\napp modules by cumulative import time (ms), top {args.top}")
+    for name, self_us, cumulative_us in app_modules[: args.top]:
+        print(f"  {name:<48}{cumulative_us / 1000:>10.1f}  (self {self_us / 1000:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--openapi-cache",
+        metavar="PATH",
+        help="OPENAPI_CACHE_PATH for the child (see scripts/generate_openapi.py)",
+    )
+    main(parser.parse_args())
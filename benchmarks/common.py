@@ -0,0 +1,50 @@
+"""Benchmark scriptlerinin ortak yardımcıları (yüzdelikler, tablo çıktısı)."""
+
+import math
+import statistics
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples: list[float], elapsed: float | None = None) -> dict:
+    """Saniye cinsinden örnekleri ms cinsinden özetler."""
+    summary = {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+    if elapsed:
+        summary["throughput_rps"] = len(samples) / elapsed
+    return summary
+
+
+def print_table(rows: dict[str, dict]) -> None:
+    columns = [
+        "count",
+        "errors",
+        "throughput_rps",
+        "mean_ms",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+    ]
+    columns = [c for c in columns if any(c in r for r in rows.values())]
+    print(f"{'':<32}" + "".join(f"{c:>16}" for c in columns))
+    for name, row in rows.items():
+        cells = "".join(
+            (
+                f"{row[c]:>16.2f}"
+                if isinstance(row.get(c), float)
+                else f"{row.get(c, ''):>16}"
+            )
+            for c in columns
+        )
+        print(f"{name:<32}{cells}")
@@ -0,0 +1,12 @@
+-- Retire duplicate live verification codes, keeping the newest per email
+UPDATE "Code" SET "used" = true
+WHERE "type" = 'VERIFICATION' AND "used" = false AND "id" NOT IN (
+    SELECT DISTINCT ON ("email") "id" FROM "Code"
+    WHERE "type" = 'VERIFICATION' AND "used" = false
+    ORDER BY "email", "createdAt" DESC, "id" DESC
+);
+
+-- CreateIndex
+-- Partial unique index (not expressible in schema.prisma): at most one live
+-- verification code per email. send_code relies on it for ON CONFLICT.
+CREATE UNIQUE INDEX "Code_email_live_verification_key" ON "Code"("email") WHERE "type" = 'VERIFICATION' AND "used" = false;
@@ -0,0 +1,10 @@
+-- AlterTable
+ALTER TABLE "RefreshToken" ADD COLUMN     "familyId" TEXT;
+
+-- Existing tokens each start their own family
+UPDATE "RefreshToken" SET "familyId" = "token" WHERE "familyId" IS NULL;
+
+ALTER TABLE "RefreshToken" ALTER COLUMN "familyId" SET NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "RefreshToken_familyId_idx" ON "RefreshToken"("familyId");
@@ -0,0 +1,18 @@
+-- CreateIndex
+CREATE INDEX "Code_email_type_used_createdAt_idx" ON "Code"("email", "type", "used", "createdAt" DESC);
+
+-- CreateIndex
+CREATE INDEX "Code_expiry_idx" ON "Code"("expiry");
+
+-- CreateIndex
+CREATE INDEX "RefreshToken_userId_revoked_idx" ON "RefreshToken"("userId", "revoked");
+
+-- CreateIndex
+CREATE INDEX "RefreshToken_expiresAt_idx" ON "RefreshToken"("expiresAt");
+
+-- CreateIndex
+-- Partial indexes (not expressible in schema.prisma) for the sweeper passes
+CREATE INDEX "Code_used_idx" ON "Code"("id") WHERE "used" = true;
+
+-- CreateIndex
+CREATE INDEX "RefreshToken_revoked_createdAt_idx" ON "RefreshToken"("createdAt") WHERE "revoked" = true;
@@ -0,0 +1,8 @@
+-- CreateIndex
+CREATE INDEX "Application_createdAt_id_idx" ON "Application"("createdAt" DESC, "id" DESC);
+
+-- CreateIndex
+CREATE INDEX "Application_isRead_createdAt_id_idx" ON "Application"("isRead", "createdAt" DESC, "id" DESC);
+
+-- CreateIndex
+CREATE INDEX "Application_type_status_createdAt_id_idx" ON "Application"("type", "status", "createdAt" DESC, "id" DESC);
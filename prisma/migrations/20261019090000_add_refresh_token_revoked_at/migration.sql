@@ -0,0 +1,5 @@
+-- AlterTable
+ALTER TABLE "RefreshToken" ADD COLUMN     "revokedAt" TIMESTAMP(3);
+
+-- Already revoked tokens: revocation time unknown, treat them as revoked now
+UPDATE "RefreshToken" SET "revokedAt" = CURRENT_TIMESTAMP WHERE "revoked" = true;
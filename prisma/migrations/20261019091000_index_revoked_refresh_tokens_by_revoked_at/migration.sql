@@ -0,0 +1,7 @@
+-- DropIndex
+-- The sweeper now keeps revoked tokens for a retention window measured from "revokedAt"
+DROP INDEX IF EXISTS "RefreshToken_revoked_createdAt_idx";
+
+-- CreateIndex
+-- Partial index (not expressible in schema.prisma)
+CREATE INDEX "RefreshToken_revoked_revokedAt_idx" ON "RefreshToken"("revokedAt") WHERE "revoked" = true;
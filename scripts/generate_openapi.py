@@ -0,0 +1,31 @@
+"""
+OpenAPI şemasını build sırasında üretip diske yazar (bkz. app/utils/openapi.py):
+
+    python scripts/generate_openapi.py build/openapi.json
+    # ya da
+    OPENAPI_CACHE_PATH=build/openapi.json python scripts/generate_openapi.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+
+def main() -> None:
+    # sys.path ayarlandıktan sonra import edilmeli
+    from app.main import app
+    from app.utils.openapi import write_openapi_cache
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("OPENAPI_CACHE_PATH")
+    if not path:
+        sys.exit("usage: generate_openapi.py PATH (or set OPENAPI_CACHE_PATH)")
+
+    print(f"wrote {write_openapi_cache(app, path)}")
+
+
+if __name__ == "__main__":
+    main()
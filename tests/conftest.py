@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+
+import pytest
+
+from app import db as real_db
+from app.db import QueryStats, add_query_listener, db, remove_query_listener
+from app.memory_db import MemoryClient
+from app.replica import replica
+from app.utils.security import token_version_cache, user_cache
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Bir blok içinde yapılan Prisma sorgularını sayar ve üst sınırı aşarsa testi
+    düşürür (ör. update_user'a geri eklenen bir find_unique):
+
+        with query_budget(1) as queries:
+            client.patch("/users/3", json={...})
+    """
+
+    @contextmanager
+    def budget(max_queries: int):
+        stats = QueryStats()
+        add_query_listener(stats.record)
+        try:
+            yield stats
+        finally:
+            remove_query_listener(stats.record)
+        assert stats.count <= max_queries, (
+            f"expected at most {max_queries} queries, got {stats.count}: "
+            f"{dict(stats.operations)}"
+        )
+
+    return budget
+
+
+@pytest.fixture
+def memory_db():
+    """
+    app.db.db'nin arkasına boş bir bellek backend'i koyar; stub yazmadan çok
+    adımlı akışlar (send-code -> signin -> refresh) uçtan uca test edilebilir.
+    """
+    client = MemoryClient()
+    previous = db.swap_client(client)
+    # id'ler her testte 1'den başlıyor, önceki testin cache'i karışmasın
+    user_cache.clear()
+    token_version_cache.clear()
+    try:
+        yield client
+    finally:
+        db.swap_client(previous)
+        user_cache.clear()
+        token_version_cache.clear()
+
+
+@pytest.fixture
+def memory_replica(memory_db):
+    """
+    memory_db'nin yanına ikinci bir bellek client'ını sağlıklı okuma replica'sı
+    olarak koyar. Aralarında replikasyon yok; replica'daki satırları test yazar.
+    """
+    client = MemoryClient()
+    previous = replica.client
+    replica.configure(client)
+    replica.healthy = True
+    # önceki testlerin yazmaları sticky pencereye takılmasın
+    real_db._last_writes.clear()
+    try:
+        yield client
+    finally:
+        replica.configure(previous)
+        real_db._last_writes.clear()
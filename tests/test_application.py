@@ -25,7 +25,7 @@ def test_mark_read_success(monkeypatch):
         return SimpleNamespace(id=5, isRead=False)
 
     async def update_app(*args, **kwargs):
-        return SimpleNamespace(id=5, isRead=True)
+        return SimpleNamespace(id=5, isRead=True, type="IDEA", status="PENDING")
 
     monkeypatch.setattr(real_db.db, "application", SimpleNamespace(find_unique=find_app, update=update_app), raising=False)
 
@@ -37,3 +37,178 @@ def test_mark_read_success(monkeypatch):
     assert res.status_code == 200
     assert res.json() == {"id": 5, "isRead": True}
     app.dependency_overrides.clear()
+
+
+def _applications(ids, created_at):
+    return [
+        SimpleNamespace(
+            id=i,
+            ownerId=1,
+            type="IDEA",
+            status="PENDING",
+            isRead=False,
+            createdAt=created_at,
+            ideaApplication=SimpleNamespace(id=i, title="Fikir", description="..."),
+            teamMemberApplication=None,
+        )
+        for i in ids
+    ]
+
+
+def test_list_applications_keyset_with_filters(monkeypatch):
+    from datetime import datetime, timezone
+
+    created_at = datetime(2026, 10, 18, 9, 0, tzinfo=timezone.utc)
+    calls = []
+
+    async def find_many(**kwargs):
+        calls.append(kwargs)
+        return _applications([30, 29, 28], created_at)
+
+    monkeypatch.setattr(
+        real_db.db, "application", SimpleNamespace(find_many=find_many), raising=False
+    )
+    from app.utils.security import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+
+    res = client.get("/application", params={"limit": 2, "type": "IDEA", "isRead": False})
+    assert res.status_code == 200
+    data = res.json()
+    assert [a["id"] for a in data["items"]] == [30, 29]
+    assert data["items"][0]["ideaApplication"]["title"] == "Fikir"
+    assert calls[0]["take"] == 3
+    assert calls[0]["where"] == {"deletedAt": None, "type": "IDEA", "isRead": False}
+    assert calls[0]["include"] == {"ideaApplication": True, "teamMemberApplication": True}
+
+    res = client.get("/application", params={"cursor": data["nextCursor"]})
+    assert res.status_code == 200
+    assert calls[1]["where"]["OR"] == [
+        {"createdAt": {"lt": created_at}},
+        {"createdAt": created_at, "id": {"lt": 29}},
+    ]
+
+    assert client.get("/application", params={"cursor": "%%%"}).status_code == 400
+    app.dependency_overrides.clear()
+
+
+def test_bulk_mark_read_single_update_many(monkeypatch):
+    calls = []
+
+    async def update_many(**kwargs):
+        calls.append(kwargs)
+        return 2
+
+    monkeypatch.setattr(
+        real_db.db, "application", SimpleNamespace(update_many=update_many), raising=False
+    )
+    from app.utils.security import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+
+    res = client.patch("/application/mark-read", json={"ids": [4, 5, 5]})
+    assert res.status_code == 200
+    assert res.json() == {"updated": 2}
+    assert len(calls) == 1
+    assert sorted(calls[0]["where"]["id"]["in"]) == [4, 5]
+    assert calls[0]["data"] == {"isRead": True}
+    app.dependency_overrides.clear()
+
+
+def _group_by_rows(rows):
+    async def group_by(**kwargs):
+        return [
+            {"type": t, "status": s, "isRead": r, "_count": {"_all": n}}
+            for t, s, r, n in rows
+        ]
+
+    return group_by
+
+
+def test_counters_follow_hooks_until_reconcile(monkeypatch):
+    from app.modules.application import application_controller
+    from app.modules.application.application_counters import ApplicationCounters
+
+    counters = ApplicationCounters(reconcile_seconds=3600)
+    monkeypatch.setattr(application_controller, "application_counters", counters)
+    group_by_calls = []
+    group_by = _group_by_rows([("IDEA", "PENDING", False, 3), ("TEAM_MEMBER", "ACCEPTED", True, 2)])
+
+    async def counting_group_by(**kwargs):
+        group_by_calls.append(kwargs)
+        return await group_by(**kwargs)
+
+    async def update(where, data):
+        if "isRead" in where:
+            return SimpleNamespace(id=5, type="IDEA", status="PENDING", isRead=True)
+        return SimpleNamespace(id=5, type="IDEA", status=data["status"], isRead=True)
+
+    async def find_unique(where):
+        return SimpleNamespace(id=5, type="IDEA", status="PENDING", isRead=True, deletedAt=None)
+
+    monkeypatch.setattr(
+        real_db.db,
+        "application",
+        SimpleNamespace(group_by=counting_group_by, update=update, find_unique=find_unique),
+        raising=False,
+    )
+    from app.utils.security import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role="ADMIN")
+
+    data = client.get("/application/counters").json()
+    assert (data["total"], data["unread"]) == (5, 3)
+    assert data["byType"]["IDEA"] == {"total": 3, "unread": 3}
+
+    assert client.patch("/application/5/mark-read").status_code == 200
+    res = client.patch("/application/5/status", json={"status": "CONTACTED"})
+    assert res.json() == {"id": 5, "status": "CONTACTED"}
+
+    data = client.get("/application/counters").json()
+    assert data["unread"] == 2
+    assert data["byStatus"]["PENDING"] == {"total": 2, "unread": 2}
+    assert data["byStatus"]["CONTACTED"] == {"total": 1, "unread": 0}
+    # hook'lar sayaçları güncelledi, ikinci okuma DB'ye gitmedi
+    assert len(group_by_calls) == 1
+
+    counters.mark_stale()
+    data = client.get("/application/counters").json()
+    assert data["unread"] == 3
+    assert len(group_by_calls) == 2 and counters.last_drift == 2
+    app.dependency_overrides.clear()
+
+
+def test_update_status_lost_race_returns_conflict(monkeypatch):
+    from app.modules.application import application_controller
+
+    published = []
+
+    async def publish(*args):
+        published.append(args)
+
+    async def find_unique(where):
+        return SimpleNamespace(id=5, type="IDEA", status="PENDING", isRead=False, deletedAt=None)
+
+    # başka bir istek status'u bizden önce değiştirdi: koşullu update satır bulamaz
+    async def update(where, data):
+        return None
+
+    monkeypatch.setattr(
+        real_db.db,
+        "application",
+        SimpleNamespace(find_unique=find_unique, update=update),
+        raising=False,
+    )
+    monkeypatch.setattr(application_controller.hub, "publish", publish)
+    from app.utils.security import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role="ADMIN")
+
+    res = client.patch("/application/5/status", json={"status": "ACCEPTED"})
+    assert res.status_code == 409
+    assert published == []
+    app.dependency_overrides.clear()
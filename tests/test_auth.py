@@ -20,93 +20,98 @@ def async_fn(return_value=None):
 
 
 def test_send_code_returns_expiry(monkeypatch):
-    # Stub db.code methods
-    monkeypatch.setattr(
-        real_db.db,
-        "code",
-        SimpleNamespace(
-            find_first=async_fn(None),
-            update_many=async_fn(None),
-            delete_many=async_fn(None),
-            create=async_fn(None),
-        ),
-    )
+    # send_code tek bir raw statement çalıştırıyor
+    monkeypatch.setattr(real_db.db, "query_first", async_fn({"resend": False}))
 
     res = client.post("/auth/send-code", json={"email": "test@example.com"})
     assert res.status_code == 200
     data = res.json()
     assert "resend" in data and "expiry" in data
+    assert data["resend"] is False
 
 
-def test_signin_sets_cookies_and_returns_role(monkeypatch):
-    code = "123456"
-    hashed = _hash_code(code)
-    future = datetime.now(timezone.utc) + timedelta(minutes=5)
+def test_send_code_single_round_trip_reports_resend(monkeypatch):
+    calls = []
 
-    record = SimpleNamespace(id=1, hashedCode=hashed, expiry=future, attempts=0)
+    async def query_first(query, *args):
+        calls.append(args)
+        return {"resend": True}
 
-    async def find_first_code(*args, **kwargs):
-        return record
+    monkeypatch.setattr(real_db.db, "query_first", query_first)
 
-    async def delete_code(*args, **kwargs):
-        return None
+    res = client.post("/auth/send-code", json={"email": "test@example.com"})
+    assert res.status_code == 200
+    assert res.json()["resend"] is True
+    assert len(calls) == 1
+    assert calls[0][0] == "test@example.com"
 
-    async def find_user(*args, **kwargs):
-        return None
 
-    async def create_user(*args, **kwargs):
-        return SimpleNamespace(id=42, role="STUDENT", email="test@example.com")
+def test_send_code_returns_503_when_outbox_full(monkeypatch):
+    from app.utils.email_outbox import OutboxFullError, email_outbox
 
-    async def create_refreshtoken(*args, **kwargs):
-        return None
+    calls = []
 
-    monkeypatch.setattr(
-        real_db.db,
-        "code",
-        SimpleNamespace(find_first=find_first_code, delete=delete_code),
-    )
-    monkeypatch.setattr(
-        real_db.db, "user", SimpleNamespace(find_unique=find_user, create=create_user)
-    )
-    monkeypatch.setattr(
-        real_db.db, "refreshtoken", SimpleNamespace(create=create_refreshtoken)
-    )
+    def full():
+        raise OutboxFullError()
+
+    async def query_first(query, *args):
+        calls.append(args)
+        return {"resend": False}
+
+    monkeypatch.setattr(real_db.db, "query_first", query_first)
+    monkeypatch.setattr(email_outbox, "reserve", full)
+
+    res = client.post("/auth/send-code", json={"email": "test@example.com"})
+    assert res.status_code == 503
+    # Mail gönderilemeyecekse kod yazılmaz, eski kodlar da geçersiz kılınmaz
+    assert calls == []
+
+
+def test_signin_sets_cookies_and_returns_role(monkeypatch):
+    code = "123456"
+    calls = []
+
+    async def query_first(query, *args):
+        calls.append(args)
+        return {"id": 42, "role": "STUDENT", "tokenVersion": 0}
+
+    monkeypatch.setattr(real_db.db, "query_first", query_first)
 
     res = client.post("/auth/signin", json={"email": "test@example.com", "code": code})
     assert res.status_code == 200
     data = res.json()
     assert data.get("role") == "STUDENT"
 
+    # Tek round-trip, kod hash'lenmiş gidiyor
+    assert len(calls) == 1
+    assert calls[0][:2] == ("test@example.com", _hash_code(code))
+
     # Cookies should be set
     cookies = res.cookies
     assert "access_token" in cookies
     assert "session_id" in cookies
 
 
-def test_refresh_with_body_returns_access_token_and_sets_cookies(monkeypatch):
-    now = datetime.now(timezone.utc)
-    session = "session-abc"
-    user = SimpleNamespace(id=42, role="STUDENT", email="test@example.com")
-    token_record = SimpleNamespace(
-        id=1, token=session, revoked=False, expiresAt=now + timedelta(days=1), user=user
+def test_signin_rejects_consumed_or_expired_code(monkeypatch):
+    # Kod yoksa / süresi dolmuşsa / başka signin tükettiyse statement satır döndürmez
+    monkeypatch.setattr(real_db.db, "query_first", async_fn(None))
+
+    res = client.post(
+        "/auth/signin", json={"email": "test@example.com", "code": "123456"}
     )
+    assert res.status_code == 401
+    assert "access_token" not in res.cookies
 
-    async def find_token(*args, **kwargs):
-        return token_record
 
-    async def update_token(*args, **kwargs):
-        return None
+def test_refresh_with_body_returns_access_token_and_sets_cookies(monkeypatch):
+    session = "session-abc"
+    calls = []
 
-    async def create_token(*args, **kwargs):
-        return None
+    async def query_first(query, *args):
+        calls.append(args)
+        return {"id": 42, "role": "STUDENT", "tokenVersion": 0}
 
-    monkeypatch.setattr(
-        real_db.db,
-        "refreshtoken",
-        SimpleNamespace(
-            find_unique=find_token, update=update_token, create=create_token
-        ),
-    )
+    monkeypatch.setattr(real_db.db, "query_first", query_first)
 
     res = client.post("/auth/refresh", json={"refreshToken": session})
     assert res.status_code == 200
@@ -115,31 +120,18 @@ def test_refresh_with_body_returns_access_token_and_sets_cookies(monkeypatch):
     # cookies should be set for browser clients
     assert "access_token" in res.cookies
     assert "session_id" in res.cookies
+    # rotation tek statement, yeni token eskisinden farklı
+    assert len(calls) == 1
+    assert calls[0][0] == session
+    assert res.cookies["session_id"] != session
 
 
 def test_refresh_with_cookie_returns_access_token(monkeypatch):
-    now = datetime.now(timezone.utc)
     session = "session-cookie"
-    user = SimpleNamespace(id=42, role="STUDENT", email="test@example.com")
-    token_record = SimpleNamespace(
-        id=1, token=session, revoked=False, expiresAt=now + timedelta(days=1), user=user
-    )
-
-    async def find_token(*args, **kwargs):
-        return token_record
-
-    async def update_token(*args, **kwargs):
-        return None
-
-    async def create_token(*args, **kwargs):
-        return None
-
     monkeypatch.setattr(
         real_db.db,
-        "refreshtoken",
-        SimpleNamespace(
-            find_unique=find_token, update=update_token, create=create_token
-        ),
+        "query_first",
+        async_fn({"id": 42, "role": "STUDENT", "tokenVersion": 0}),
     )
 
     client.cookies.set("session_id", session)
@@ -149,6 +141,14 @@ def test_refresh_with_cookie_returns_access_token(monkeypatch):
     assert "accessToken" in data
 
 
+def test_refresh_with_rotated_token_is_rejected(monkeypatch):
+    # revoke edilmiş / süresi dolmuş / yeniden oynatılan token satır döndürmez
+    monkeypatch.setattr(real_db.db, "query_first", async_fn(None))
+
+    res = client.post("/auth/refresh", json={"refreshToken": "already-rotated"})
+    assert res.status_code == 401
+
+
 def test_reset_key_success_sets_cookies_and_returns_ok(monkeypatch):
     now = datetime.now(timezone.utc)
     code = "654321"
@@ -167,10 +167,13 @@ def test_reset_key_success_sets_cookies_and_returns_ok(monkeypatch):
         return user
 
     async def update_user(*args, **kwargs):
-        return None
+        return SimpleNamespace(id=99, email="reset@example.com", tokenVersion=1)
 
-    async def update_many_rt(*args, **kwargs):
-        return None
+    revoked = []
+
+    async def execute_raw(query, *args):
+        revoked.append(args)
+        return 1
 
     async def create_rt(*args, **kwargs):
         return None
@@ -184,8 +187,9 @@ def test_reset_key_success_sets_cookies_and_returns_ok(monkeypatch):
     monkeypatch.setattr(
         real_db.db,
         "refreshtoken",
-        SimpleNamespace(update_many=update_many_rt, create=create_rt),
+        SimpleNamespace(create=create_rt),
     )
+    monkeypatch.setattr(real_db.db, "execute_raw", execute_raw)
 
     res = client.post(
         "/auth/reset-key", json={"email": "reset@example.com", "code": code}
@@ -195,6 +199,8 @@ def test_reset_key_success_sets_cookies_and_returns_ok(monkeypatch):
     assert data.get("ok") is True
     assert "access_token" in res.cookies
     assert "session_id" in res.cookies
+    # eski oturumlar tek UPDATE ile kapatılır
+    assert [args[0] for args in revoked] == [99]
 
 
 def test_reset_key_user_not_found_returns_404(monkeypatch):
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.dataloader import DataLoader
+
+
+def recording_loader(calls, **kwargs):
+    async def batch_fn(ids):
+        calls.append(sorted(ids))
+        await asyncio.sleep(0)
+        return [SimpleNamespace(id=i) for i in ids if i != 404]
+
+    return DataLoader(batch_fn, **kwargs)
+
+
+def test_concurrent_loads_coalesce_into_one_batch():
+    calls = []
+    loader = recording_loader(calls)
+
+    async def scenario():
+        return await asyncio.gather(*(loader.load(i) for i in [3, 1, 2, 1, 404]))
+
+    results = asyncio.run(scenario())
+
+    assert calls == [[1, 2, 3, 404]]
+    assert [r.id if r else None for r in results] == [3, 1, 2, 1, None]
+    assert loader.stats()["deduped"] == 1
+    assert loader.stats()["batchSizes"] == {4: 1}
+
+
+def test_inflight_key_is_not_fetched_twice():
+    calls = []
+    loader = recording_loader(calls)
+
+    async def scenario():
+        first = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0)  # ilk batch yola çıktı ama henüz dönmedi
+        second = await loader.load(1)
+        return await first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first is second
+    assert calls == [[1]]
+
+
+def test_batches_are_split_at_max_batch_size():
+    calls = []
+    loader = recording_loader(calls, max_batch_size=2)
+
+    asyncio.run(loader.load_many([1, 2, 3, 4, 5]))
+
+    assert calls == [[1, 2], [3, 4], [5]]
+    assert loader.stats()["meanBatchSize"] == 5 / 3
+
+
+def test_batch_errors_reach_every_waiter():
+    async def failing(ids):
+        raise RuntimeError("db down")
+
+    loader = DataLoader(failing)
+
+    async def scenario():
+        return await asyncio.gather(
+            loader.load(1), loader.load(2), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(loader.load(3))
+
+
+def test_batch_does_not_run_in_first_callers_context():
+    from app.db import current_query_stats, start_query_stats
+
+    seen = []
+
+    async def batch_fn(ids):
+        seen.append(current_query_stats())
+        return [SimpleNamespace(id=i) for i in ids]
+
+    loader = DataLoader(batch_fn)
+
+    async def request(key):
+        # her istek kendi QueryStats'ıyla (middleware gibi)
+        start_query_stats()
+        return await loader.load(key)
+
+    async def scenario():
+        return await asyncio.gather(request(1), request(2))
+
+    results = asyncio.run(scenario())
+
+    assert [r.id for r in results] == [1, 2]
+    # birleştirilen sorgu ilk isteğe yazılmaz
+    assert seen == [None]
@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import db as real_db
+from app.db import InstrumentedClient, current_query_stats, start_query_stats
+from app.utils.metrics import Metrics
+from app.utils.middleware import MetricsMiddleware
+
+
+async def _find(**kwargs):
+    return SimpleNamespace(id=1)
+
+
+def test_model_calls_are_recorded_per_context():
+    client = InstrumentedClient(SimpleNamespace(user=SimpleNamespace(find_many=_find)))
+
+    async def scenario():
+        stats = start_query_stats()
+        await client.user.find_many(where={})
+        await client.user.find_many(where={})
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.count == 2
+    assert stats.operations == {"user.find_many": 2}
+    assert current_query_stats() is None
+
+
+def test_monkeypatch_round_trip_keeps_the_real_client_unwrapped(monkeypatch):
+    original = real_db.db._client.user
+    with monkeypatch.context() as m:
+        m.setattr(real_db.db, "user", SimpleNamespace(find_unique=_find))
+        assert real_db.db.user._target.find_unique is _find
+    # undo, proxy'nin sarmalayıcısını değil asıl nesneyi geri yazmalı
+    assert real_db.db._client.user is original
+
+
+def test_debug_headers_and_n_plus_one_metric(monkeypatch):
+    from app.utils import middleware
+
+    monkeypatch.setattr(middleware, "DB_N_PLUS_ONE_THRESHOLD", 3)
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_unique=_find))
+    registry = Metrics()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry, debug_headers=True)
+
+    @app.get("/members")
+    async def members():
+        # klasik N+1: her kart için ayrı sorgu
+        for i in range(4):
+            await real_db.db.user.find_unique(where={"id": i})
+        return {"ok": True}
+
+    res = TestClient(app).get("/members")
+
+    assert res.headers["x-db-query-count"] == "4"
+    assert float(res.headers["x-db-query-time-ms"]) >= 0
+    assert registry.n_plus_one == {("/members", "user.find_unique"): 1}
+
+
+def test_query_budget_fails_when_exceeded(query_budget):
+    client = InstrumentedClient(SimpleNamespace(user=SimpleNamespace(find_many=_find)))
+
+    with (
+        pytest.raises(AssertionError, match="at most 1 queries, got 2"),
+        query_budget(1),
+    ):
+        asyncio.run(client.user.find_many())
+        asyncio.run(client.user.find_many())
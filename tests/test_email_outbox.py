@@ -0,0 +1,204 @@
+import asyncio
+import smtplib
+
+import pytest
+
+from app.utils.email_outbox import (
+    EmailOutbox,
+    OutboxFullError,
+    OutgoingEmail,
+    SMTPTransport,
+)
+
+
+class FakeSMTPServer:
+    """aiosmtpd yerine geçen minimal SMTP sunucusu (sadece testler için)."""
+
+    def __init__(self):
+        self.messages: list[str] = []
+        self.connections = 0
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250 localhost\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = await reader.readuntil(b"\r\n.\r\n")
+                self.messages.append(data.decode())
+                writer.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def _email(i: int) -> OutgoingEmail:
+    return OutgoingEmail(to=f"user{i}@example.com", subject="Kod", body=f"{i:06d}")
+
+
+def test_outbox_sends_batches_over_one_connection():
+    async def scenario():
+        server = FakeSMTPServer()
+        port = await server.start()
+        transport = SMTPTransport("127.0.0.1", port, timeout=5)
+        outbox = EmailOutbox(transport, maxsize=50, batch_size=10)
+        await outbox.start()
+        for i in range(25):
+            outbox.enqueue(_email(i))
+        await outbox.stop()
+        await server.stop()
+        return server, outbox
+
+    server, outbox = asyncio.run(scenario())
+
+    assert len(server.messages) == 25
+    assert server.connections == 1
+    assert outbox.sent == 25 and outbox.pending() == 0
+
+
+def test_outbox_retries_failed_batch_with_backoff():
+    class FlakyTransport:
+        def __init__(self):
+            self.calls = 0
+
+        async def send_batch(self, messages):
+            self.calls += 1
+            return messages if self.calls == 1 else []
+
+        async def close(self):
+            pass
+
+    async def scenario():
+        transport = FlakyTransport()
+        outbox = EmailOutbox(transport, backoff_seconds=0.01)
+        await outbox.start()
+        outbox.enqueue(_email(1))
+        await outbox.stop()
+        return transport, outbox
+
+    transport, outbox = asyncio.run(scenario())
+
+    assert transport.calls == 2
+    assert outbox.sent == 1 and outbox.dropped == 0
+
+
+def test_outbox_rejects_when_full():
+    outbox = EmailOutbox(transport=None, maxsize=1)
+    outbox.enqueue(_email(1))
+
+    with pytest.raises(OutboxFullError):
+        outbox.enqueue(_email(2))
+
+
+def test_outbox_reservation_counts_towards_capacity():
+    outbox = EmailOutbox(transport=None, maxsize=1)
+    reservation = outbox.reserve()
+
+    with pytest.raises(OutboxFullError):
+        outbox.enqueue(_email(1))
+
+    # put edilmeden kapanan yer geri verilir
+    with reservation:
+        pass
+    with outbox.reserve() as reservation:
+        reservation.put(_email(2))
+    assert outbox.pending() == 1
+
+
+def test_outbox_retry_does_not_block_other_messages():
+    class FailFirstTransport:
+        def __init__(self):
+            self.batches = []
+
+        async def send_batch(self, messages):
+            self.batches.append([m.to for m in messages])
+            return [
+                m for m in messages if m.to == "user1@example.com" and m.attempts == 0
+            ]
+
+        async def close(self):
+            pass
+
+    async def scenario():
+        transport = FailFirstTransport()
+        outbox = EmailOutbox(transport, backoff_seconds=0.2)
+        await outbox.start()
+        outbox.enqueue(_email(1))
+        await asyncio.sleep(0.01)
+        # user1 backoff'ta beklerken user2 hemen gönderilir
+        outbox.enqueue(_email(2))
+        await asyncio.sleep(0.05)
+        sent_before_retry = outbox.sent
+        await outbox.stop()
+        return transport, outbox, sent_before_retry
+
+    transport, outbox, sent_before_retry = asyncio.run(scenario())
+
+    assert sent_before_retry == 1
+    assert transport.batches == [
+        ["user1@example.com"],
+        ["user2@example.com"],
+        ["user1@example.com"],
+    ]
+    assert outbox.sent == 2 and outbox.dropped == 0
+
+
+def test_outbox_drops_permanent_failures_without_retry():
+    class RejectingTransport:
+        def __init__(self):
+            self.calls = 0
+
+        async def send_batch(self, messages):
+            self.calls += 1
+            for message in messages:
+                message.permanent = True
+            return messages
+
+        async def close(self):
+            pass
+
+    async def scenario():
+        transport = RejectingTransport()
+        outbox = EmailOutbox(transport, backoff_seconds=0.01)
+        await outbox.start()
+        outbox.enqueue(_email(1))
+        await outbox.stop()
+        return transport, outbox
+
+    transport, outbox = asyncio.run(scenario())
+
+    assert transport.calls == 1
+    assert outbox.sent == 0 and outbox.dropped == 1
+
+
+def test_smtp_transport_marks_rejected_recipient_permanent():
+    transport = SMTPTransport("127.0.0.1", 0)
+
+    class RejectingConn:
+        def send_message(self, mime):
+            raise smtplib.SMTPRecipientsRefused({mime["To"]: (550, b"no such user")})
+
+    transport._conn = RejectingConn()
+    failed = transport._send_batch_sync([_email(1)])
+
+    assert [m.permanent for m in failed] == [True]
+    # bağlantı kapatılmaz, sonraki mesajlar aynı bağlantıdan gider
+    assert transport._conn is not None
@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.jwt_codec import (
+    ExpiredTokenError,
+    HMACBackend,
+    InvalidTokenError,
+    JoseBackend,
+    build_backend,
+)
+
+SECRET = "a746b717be9fab1fa6ed250c50fb4eff788ac10b641755900166ddc1c707b2fc"
+
+
+def _claims(minutes: int = 5) -> dict:
+    exp = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    return {"sub": "42", "role": "ADMIN", "ver": 3, "exp": exp}
+
+
+def _segment(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def test_hmac_backend_matches_jose_byte_for_byte():
+    claims = _claims()
+    fast, jose = HMACBackend(SECRET), JoseBackend(SECRET)
+
+    token = fast.encode(claims)
+
+    assert token == jose.encode(claims)
+    assert jose.decode(token)["sub"] == "42"
+    assert fast.decode(jose.encode(claims))["ver"] == 3
+
+
+@pytest.mark.parametrize("backend_cls", [HMACBackend, JoseBackend])
+def test_expired_token_is_rejected(backend_cls):
+    backend = backend_cls(SECRET)
+    token = backend.encode(_claims(minutes=-1))
+
+    with pytest.raises(ExpiredTokenError):
+        backend.decode(token)
+
+
+@pytest.mark.parametrize("backend_cls", [HMACBackend, JoseBackend])
+def test_wrong_secret_and_garbage_are_rejected(backend_cls):
+    token = backend_cls("other-secret").encode(_claims())
+
+    with pytest.raises(InvalidTokenError):
+        backend_cls(SECRET).decode(token)
+    with pytest.raises(InvalidTokenError):
+        backend_cls(SECRET).decode("not-a-token")
+
+
+def test_hmac_backend_rejects_alg_none_and_other_algorithms():
+    backend = HMACBackend(SECRET)
+    payload = _segment({"sub": "42"})
+
+    for header in ({"alg": "none", "typ": "JWT"}, {"alg": "HS512", "typ": "JWT"}):
+        with pytest.raises(InvalidTokenError):
+            backend.decode(f"{_segment(header)}.{payload}.")
+
+
+def test_hmac_backend_accepts_equivalent_header_spelling():
+    backend = HMACBackend(SECRET)
+    token = JoseBackend(SECRET).encode(_claims())
+    _, payload, _ = token.split(".")
+    header = _segment({"typ": "JWT", "alg": "HS256"})
+    signing_input = f"{header}.{payload}"
+
+    resigned = f"{signing_input}.{backend._sign(signing_input.encode())}"
+
+    assert backend.decode(resigned)["sub"] == "42"
+
+
+def test_build_backend_falls_back_to_jose_for_non_hmac_algorithms():
+    assert isinstance(build_backend("hmac", SECRET, "HS512"), HMACBackend)
+    assert isinstance(build_backend("hmac", SECRET, "RS256"), JoseBackend)
+    with pytest.raises(ValueError):
+        build_backend("pyjwt", SECRET)
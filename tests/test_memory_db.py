@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from prisma.errors import UniqueViolationError
+
+from app.main import app
+from app.memory_db import MemoryClient
+from app.modules.auth import auth_controller
+
+client = TestClient(app)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_create_applies_schema_defaults_and_unique_index():
+    db = MemoryClient()
+
+    user = run(db.user.create(data={"email": "a@example.com", "key": "k"}))
+
+    assert user.id == 1
+    assert user.role == "STUDENT"
+    assert user.tokenVersion == 0
+    assert user.deletedAt is None
+    assert user.createdAt.tzinfo is not None
+    with pytest.raises(UniqueViolationError):
+        run(db.user.create(data={"email": "a@example.com", "key": "k"}))
+    assert run(db.user.find_unique(where={"email": "a@example.com"})).id == 1
+
+
+def test_update_with_extended_where_returns_none_on_mismatch():
+    db = MemoryClient()
+    user = run(db.user.create(data={"email": "a@example.com", "key": "k"}))
+
+    stale = run(
+        db.user.update(
+            where={"id": user.id, "updatedAt": user.updatedAt - timedelta(seconds=1)},
+            data={"name": "x"},
+        )
+    )
+    updated = run(
+        db.user.update(
+            where={"id": user.id, "updatedAt": user.updatedAt},
+            data={"tokenVersion": {"increment": 1}},
+        )
+    )
+
+    assert stale is None
+    assert updated.tokenVersion == 1
+    assert run(db.user.update(where={"id": 99}, data={"name": "x"})) is None
+
+
+def test_find_many_filters_order_and_take():
+    db = MemoryClient()
+    for i in range(5):
+        run(db.user.create(data={"email": f"u{i}@example.com", "key": "k"}))
+    run(db.user.update(where={"id": 2}, data={"deletedAt": datetime.now(timezone.utc)}))
+
+    live = run(
+        db.user.find_many(
+            where={"deletedAt": None, "id": {"gt": 1}}, order={"id": "desc"}, take=2
+        )
+    )
+    by_ids = run(db.user.find_many(where={"id": {"in": [4, 2, 42]}}))
+    either = run(
+        db.user.find_many(where={"OR": [{"id": 1}, {"email": "u4@example.com"}]})
+    )
+
+    assert [u.id for u in live] == [5, 4]
+    assert sorted(u.id for u in by_ids) == [2, 4]
+    assert [u.id for u in either] == [1, 5]
+    assert run(db.user.count(where={"deletedAt": {"not": None}})) == 1
+
+
+def test_include_and_group_by():
+    db = MemoryClient()
+    owner = run(db.user.create(data={"email": "a@example.com", "key": "k"}))
+    for app_type in ("IDEA", "IDEA", "TEAM_MEMBER"):
+        run(db.application.create(data={"ownerId": owner.id, "type": app_type}))
+    run(
+        db.ideaapplication.create(
+            data={"id": 1, "title": "t", "description": "d"},
+        )
+    )
+
+    first = run(db.application.find_first(include={"ideaApplication": True}))
+    rows = run(db.application.group_by(by=["type", "isRead"], count=True))
+
+    assert first.ideaApplication.title == "t"
+    assert first.owner is None
+    assert {(r["type"], r["_count"]["_all"]) for r in rows} == {
+        ("IDEA", 2),
+        ("TEAM_MEMBER", 1),
+    }
+
+
+def test_full_auth_flow_runs_against_memory_backend(memory_db, monkeypatch):
+    monkeypatch.setattr(auth_controller, "_generate_code", lambda: "123456")
+    email = "flow@example.com"
+
+    assert client.post("/auth/send-code", json={"email": email}).status_code == 200
+    assert client.post("/auth/send-code", json={"email": email}).json()["resend"]
+    signin = client.post("/auth/signin", json={"email": email, "code": "123456"})
+    assert signin.status_code == 200
+
+    user = run(memory_db.user.find_unique(where={"email": email}))
+    token = run(memory_db.refreshtoken.find_first(where={"userId": user.id})).token
+    assert client.get(f"/users/{user.id}").json()["email"] == email
+
+    first = client.post("/auth/refresh", json={"refreshToken": token})
+    # reuse grace penceresinin dışında
+    revoked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    run(
+        memory_db.refreshtoken.update(
+            where={"token": token}, data={"revokedAt": revoked_at}
+        )
+    )
+    replay = client.post("/auth/refresh", json={"refreshToken": token})
+
+    assert first.status_code == 200
+    assert replay.status_code == 401
+    # kod tek kullanımlık, replay de bütün token ailesini düşürdü
+    assert run(memory_db.code.count()) == 0
+    assert run(memory_db.refreshtoken.count(where={"revoked": False})) == 0
+
+
+def test_revoke_user_sessions_raw_statement():
+    from app.modules.auth.auth_queries import REVOKE_USER_SESSIONS_SQL
+
+    db = MemoryClient()
+    user = run(db.user.create(data={"email": "a@example.com", "key": "k"}))
+    expires = datetime.now(timezone.utc) + timedelta(days=1)
+    for token in ("t1", "t2"):
+        run(
+            db.refreshtoken.create(
+                data={
+                    "token": token,
+                    "userId": user.id,
+                    "familyId": "f",
+                    "expiresAt": expires,
+                }
+            )
+        )
+
+    now = datetime.now(timezone.utc)
+    revoked = run(db.execute_raw(REVOKE_USER_SESSIONS_SQL, user.id, now))
+
+    assert revoked == 2
+    rows = run(db.refreshtoken.find_many(where={"userId": user.id}))
+    assert all(r.revoked and r.revokedAt is not None for r in rows)
+    assert run(db.execute_raw(REVOKE_USER_SESSIONS_SQL, user.id, now)) == 0
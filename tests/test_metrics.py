@@ -0,0 +1,73 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.metrics import Metrics, metrics
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not in metrics output")
+
+
+def test_histogram_buckets_are_cumulative_at_scrape():
+    registry = Metrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.5, 3.0):
+        registry.observe_request("GET", "/users/{id}", 200, seconds)
+    registry.observe_request("GET", "/users/{id}", 404, 0.01)
+
+    text = registry.render()
+    labels = 'method="GET",route="/users/{id}"'
+    assert (
+        _sample(text, f'http_request_duration_seconds_bucket{{{labels},le="0.1"}}') == 2
+    )
+    assert (
+        _sample(text, f'http_request_duration_seconds_bucket{{{labels},le="1.0"}}') == 4
+    )
+    assert (
+        _sample(text, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}')
+        == 5
+    )
+    assert _sample(text, f"http_request_duration_seconds_count{{{labels}}}") == 5
+    assert _sample(text, f'http_requests_total{{{labels},status="404"}}') == 1
+
+
+def test_metrics_endpoint_reports_routes_and_exceptions(monkeypatch):
+    from app.modules.user import user_controller
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(user_controller, "get_user", broken)
+    metrics.reset()
+    client = TestClient(app, raise_server_exceptions=False)
+
+    client.get("/ping")
+    assert client.get("/users/5").status_code == 500
+    client.get("/does-not-exist")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = res.text
+    assert (
+        _sample(text, 'http_requests_total{method="GET",route="/ping",status="200"}')
+        == 1
+    )
+    assert (
+        _sample(
+            text, 'http_requests_total{method="GET",route="/users/{id}",status="500"}'
+        )
+        == 1
+    )
+    assert (
+        _sample(
+            text, 'http_exceptions_total{route="/users/{id}",exception="RuntimeError"}'
+        )
+        == 1
+    )
+    assert 'route="<unmatched>",status="404"' in text
+    # scrape isteğinin kendisi hâlâ sürüyor
+    assert _sample(text, "http_requests_in_flight") == 1
+    assert "app_cache_hits_total" in text
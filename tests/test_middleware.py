@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app import db as real_db
+from app.main import app
+from app.utils import security
+from app.utils.security import create_access_token
+
+client = TestClient(app)
+
+
+def test_security_headers_on_every_response():
+    res = client.get("/ping")
+    assert res.status_code == 200
+    assert res.headers["x-content-type-options"] == "nosniff"
+    assert res.headers["x-frame-options"] == "DENY"
+    assert res.headers["referrer-policy"] == "strict-origin-when-cross-origin"
+    assert "max-age=31536000" in res.headers["strict-transport-security"]
+    assert "fullscreen=(self)" in res.headers["permissions-policy"]
+
+
+def test_access_token_cookie_becomes_bearer_header(monkeypatch):
+    async def find_users(*args, **kwargs):
+        return [SimpleNamespace(id=1, role="ADMIN")]
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_users))
+    security.invalidate_user(1)
+
+    token = create_access_token({"sub": "1"})
+    res = client.get(
+        "/users/admin-only", headers={"Cookie": f"theme=dark; access_token={token}"}
+    )
+    assert res.status_code == 200
+    security.invalidate_user(1)
+
+
+def test_request_without_token_is_unauthorized():
+    res = TestClient(app).get("/users/admin-only")
+    assert res.status_code == 401
@@ -0,0 +1,96 @@
+import json
+
+from fastapi import FastAPI
+
+from app.utils.openapi import use_openapi_cache, write_openapi_cache
+
+
+def _app(version: str = "1.0.0") -> FastAPI:
+    app = FastAPI(title="test", version=version)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    return app
+
+
+def test_schema_is_loaded_from_cache_file(tmp_path):
+    path = write_openapi_cache(_app(), tmp_path / "openapi.json")
+    cached = json.loads(path.read_text())
+    cached["paths"]["/from-cache"] = {}
+    path.write_text(json.dumps(cached))
+
+    app = _app()
+    use_openapi_cache(app, path)
+
+    assert "/from-cache" in app.openapi()["paths"]
+
+
+def test_stale_or_missing_cache_falls_back_to_generation(tmp_path):
+    path = write_openapi_cache(_app(version="0.9.0"), tmp_path / "openapi.json")
+
+    stale = _app()
+    use_openapi_cache(stale, path)
+    missing = _app()
+    use_openapi_cache(missing, tmp_path / "nope.json")
+
+    assert stale.openapi()["info"]["version"] == "1.0.0"
+    assert "/ping" in missing.openapi()["paths"]
+
+
+def test_cache_is_ignored_when_routes_change(tmp_path):
+    path = write_openapi_cache(_app(), tmp_path / "openapi.json")
+
+    # aynı title / version, ama yeni bir endpoint
+    app = _app()
+
+    @app.get("/new")
+    def new():
+        return {}
+
+    use_openapi_cache(app, path)
+
+    assert "/new" in app.openapi()["paths"]
+
+
+def test_cache_key_covers_model_field_types_and_is_not_served(tmp_path):
+    from pydantic import BaseModel
+
+    def app_with(field_type):
+        class Item(BaseModel):
+            value: field_type
+
+        app = _app()
+
+        @app.get("/item", response_model=Item)
+        def item():
+            return {"value": 1}
+
+        return app
+
+    path = write_openapi_cache(app_with(int), tmp_path / "openapi.json")
+
+    same = app_with(int)
+    use_openapi_cache(same, path)
+    changed = app_with(str)
+    use_openapi_cache(changed, path)
+
+    assert "x-routes-hash" not in same.openapi()
+    assert "x-routes-hash" not in same.openapi()["info"]
+    value = changed.openapi()["components"]["schemas"]["Item"]["properties"]["value"]
+    assert value["type"] == "string"
+
+
+def test_build_regenerates_even_when_cache_is_installed(tmp_path):
+    path = write_openapi_cache(_app(), tmp_path / "openapi.json")
+    cached = json.loads(path.read_text())
+    cached["paths"]["/from-cache"] = {}
+    path.write_text(json.dumps(cached))
+
+    # build: app import edilince OPENAPI_CACHE_PATH ile cache zaten kurulu
+    app = _app()
+    use_openapi_cache(app, path)
+    write_openapi_cache(app, path)
+
+    assert "/from-cache" not in json.loads(path.read_text())["paths"]
@@ -0,0 +1,256 @@
+import asyncio
+from types import SimpleNamespace
+
+from app import db as real_db
+from app.utils.pubsub import (
+    Message,
+    PostgresNotifyTransport,
+    PubSubHub,
+    _asyncpg_dsn,
+    sse_stream,
+)
+
+
+def test_publish_fans_out_to_topic_subscribers():
+    async def scenario():
+        hub = PubSubHub()
+        await hub.start()
+        first, second = hub.subscribe("applications"), hub.subscribe("applications")
+        other = hub.subscribe("other")
+        await hub.publish("applications", "application.read", {"ids": [1]})
+        return [first.queue.qsize(), second.queue.qsize(), other.queue.qsize()], (
+            await first.get()
+        )
+
+    sizes, message = asyncio.run(scenario())
+
+    assert sizes == [1, 1, 0]
+    assert message == Message("application.read", {"ids": [1]})
+
+
+def test_slow_subscriber_is_dropped_without_blocking_others():
+    async def scenario():
+        hub = PubSubHub(queue_size=2)
+        await hub.start()
+        slow, fast = hub.subscribe("t"), hub.subscribe("t")
+        for i in range(3):
+            await hub.publish("t", "tick", {"i": i})
+            await fast.get()
+        return hub, slow, await slow.get()
+
+    hub, slow, message = asyncio.run(scenario())
+
+    assert slow.dropped and message is None
+    assert hub.subscriber_count("t") == 1
+    assert hub.stats()["droppedSubscribers"] == 1
+
+
+def test_sse_stream_sends_heartbeats_and_events():
+    async def scenario():
+        hub = PubSubHub()
+        await hub.start()
+        sub = hub.subscribe("t")
+        stream = sse_stream(sub, heartbeat_seconds=0.01)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        await hub.publish("t", "application.created", {"id": 7})
+        chunks.append(await stream.__anext__())
+        await hub.stop()
+        chunks.extend([c async for c in stream])
+        return hub, chunks
+
+    hub, chunks = asyncio.run(scenario())
+
+    assert chunks == [
+        b"retry: 5000\n\n",
+        b": ping\n\n",
+        b'event: application.created\ndata: {"id":7}\n\n',
+    ]
+    assert hub.subscriber_count() == 0
+
+
+def test_postgres_transport_delivers_notifications():
+    delivered = []
+    transport = PostgresNotifyTransport("postgresql://u:p@db:5432/app?schema=public")
+    transport._deliver = lambda topic, message: delivered.append((topic, message))
+
+    transport._on_notify(
+        None, 1, "app_events", '{"topic":"t","event":"e","data":{"id":1}}'
+    )
+    transport._on_notify(None, 1, "app_events", "not json")
+
+    assert delivered == [("t", Message("e", {"id": 1}))]
+    assert transport.dsn == "postgresql://u:p@db:5432/app"
+    assert _asyncpg_dsn("postgresql://db/app?schema=x&sslmode=require").endswith(
+        "?sslmode=require"
+    )
+
+
+def test_mark_read_publishes_event(monkeypatch):
+    from app.modules.application import application_controller
+
+    hub = PubSubHub()
+    monkeypatch.setattr(application_controller, "hub", hub)
+
+    async def update(**kwargs):
+        return SimpleNamespace(id=5, type="IDEA", status="PENDING", isRead=True)
+
+    monkeypatch.setattr(
+        real_db.db, "application", SimpleNamespace(update=update), raising=False
+    )
+
+    async def scenario():
+        await hub.start()
+        sub = hub.subscribe(application_controller.APPLICATION_EVENTS_TOPIC)
+        await application_controller.mark_read(5)
+        return await sub.get()
+
+    assert asyncio.run(scenario()) == Message("application.read", {"ids": [5]})
+
+
+class FakeListenConnection:
+    """asyncpg bağlantısının LISTEN için kullanılan kısmı."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+        self.busy = False
+        self.executed = []
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def execute(self, *args):
+        if self.closed:
+            raise ConnectionError("connection is closed")
+        # asyncpg gibi: bağlantıda aynı anda tek sorgu
+        if self.busy:
+            raise RuntimeError("another operation is in progress")
+        self.busy = True
+        try:
+            await asyncio.sleep(0.001)
+            self.executed.append(args)
+        finally:
+            self.busy = False
+
+    def is_closed(self):
+        return self.closed
+
+    def terminate(self):
+        self.closed = True
+
+    async def close(self):
+        self.closed = True
+
+    def drop(self):
+        # sunucu bağlantıyı kapattı (restart / failover)
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+def test_postgres_transport_reconnects_and_listens_again():
+    connections = []
+    attempts = 0
+
+    async def connect(dsn):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 2:
+            raise OSError("connection refused")
+        conn = FakeListenConnection()
+        connections.append(conn)
+        return conn
+
+    async def scenario():
+        transport = PostgresNotifyTransport(
+            "postgresql://db/app", backoff=0.01, health_check=5, connect=connect
+        )
+        hub = PubSubHub(transport)
+        await hub.start()
+        sub = hub.subscribe("t")
+
+        connections[0].drop()
+        for _ in range(100):
+            if transport.reconnects:
+                break
+            await asyncio.sleep(0.01)
+
+        # yeni bağlantıda LISTEN tekrar verildi, NOTIFY'lar yine dağıtılıyor
+        notify = connections[-1].listeners["app_events"]
+        after = hub.subscribe("t")
+        notify(None, 1, "app_events", '{"topic":"t","event":"e","data":{"id":1}}')
+        await hub.publish("t", "e", {"id": 2})
+        closed = await sub.get()
+        received = await after.get()
+        await hub.stop()
+        return transport, hub, closed, received
+
+    transport, hub, closed, received = asyncio.run(scenario())
+
+    assert attempts == 3 and transport.reconnects == 1
+    assert len(connections) == 2 and connections[-1].closed
+    # kopukken kaçan event'ler için eski aboneler kapatıldı
+    assert closed is None
+    assert received == Message("e", {"id": 1})
+    assert hub.stats()["publishFailures"] == 0
+
+
+def test_postgres_transport_reconnects_when_health_check_fails():
+    connections = []
+
+    async def connect(dsn):
+        conn = FakeListenConnection()
+        connections.append(conn)
+        return conn
+
+    async def scenario():
+        transport = PostgresNotifyTransport(
+            "postgresql://db/app", backoff=0.01, health_check=0.01, connect=connect
+        )
+        await transport.start(lambda topic, message: None)
+        # FIN gelmeden ölen bağlantı: termination listener çağrılmaz
+        connections[0].closed = True
+        for _ in range(100):
+            if transport.reconnects:
+                break
+            await asyncio.sleep(0.01)
+        await transport.stop()
+        return transport
+
+    transport = asyncio.run(scenario())
+
+    assert transport.reconnects == 1
+    assert len(connections) == 2
+
+
+def test_postgres_transport_serializes_queries_on_listen_connection():
+    connections = []
+
+    async def connect(dsn):
+        conn = FakeListenConnection()
+        connections.append(conn)
+        return conn
+
+    async def scenario():
+        transport = PostgresNotifyTransport(
+            "postgresql://db/app", health_check=5, connect=connect
+        )
+        hub = PubSubHub(transport)
+        await hub.start()
+        # aynı anda gelen yayınlar ve health check aynı bağlantıyı kullanıyor
+        results = await asyncio.gather(
+            transport._alive(),
+            *(hub.publish("t", "e", {"id": i}) for i in range(10)),
+        )
+        await hub.stop()
+        return hub, results[0]
+
+    hub, alive = asyncio.run(scenario())
+
+    assert alive is True
+    assert hub.stats()["publishFailures"] == 0
+    assert len(connections[0].executed) == 11
@@ -0,0 +1,143 @@
+import asyncio
+
+from app import db as real_db
+from app.db import db, start_query_stats
+from app.modules.user import user_controller
+from app.replica import read_db, replica, use_primary
+from app.utils.dataloader import user_loader
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _seed(client, *names):
+    for name in names:
+        await client.user.create(
+            data={"email": f"{name}@example.com", "key": "k", "name": name}
+        )
+
+
+def test_reads_go_to_replica_and_writes_to_primary(memory_db, memory_replica):
+    run(_seed(memory_db, "primary"))
+    run(_seed(memory_replica, "replica"))
+
+    async def scenario():
+        read = await read_db.user.find_unique(where={"id": 1})
+        await read_db.user.update(where={"id": 1}, data={"surname": "x"})
+        return read
+
+    assert run(scenario()).name == "replica"
+    assert run(memory_db.user.find_unique(where={"id": 1})).surname == "x"
+    assert run(memory_replica.user.find_unique(where={"id": 1})).surname is None
+
+
+def test_request_that_wrote_reads_from_primary(memory_db, memory_replica, monkeypatch):
+    run(_seed(memory_db, "primary"))
+    run(_seed(memory_replica, "replica"))
+    monkeypatch.setattr(replica, "sticky", 0)
+
+    async def scenario():
+        start_query_stats()
+        before = await read_db.user.find_unique(where={"id": 1})
+        await db.user.update(where={"id": 1}, data={"surname": "x"})
+        after = await read_db.user.find_unique(where={"id": 1})
+        with use_primary():
+            pinned = await read_db.user.find_unique(where={"id": 1})
+        return before, after, pinned
+
+    before, after, pinned = run(scenario())
+
+    assert before.name == "replica"
+    assert after.name == "primary"
+    assert pinned.name == "primary"
+
+
+def test_recent_write_keeps_model_on_primary_for_sticky_window(
+    memory_db, memory_replica
+):
+    run(_seed(memory_db, "primary"))
+    run(_seed(memory_replica, "replica"))
+
+    run(db.user.update(where={"id": 1}, data={"surname": "x"}))
+
+    # başka bir istek (yeni context) ama aynı process
+    assert run(read_db.user.find_unique(where={"id": 1})).name == "primary"
+    assert replica.serves("teammember")
+
+    real_db._last_writes["user"] -= replica.sticky
+    assert run(read_db.user.find_unique(where={"id": 1})).name == "replica"
+
+
+def test_lagging_replica_is_skipped_until_it_catches_up(memory_db, memory_replica):
+    run(_seed(memory_db, "primary"))
+    run(_seed(memory_replica, "replica"))
+
+    memory_replica.replication_lag = replica.max_lag + 1
+    assert run(replica.check()) is False
+    assert run(read_db.user.find_unique(where={"id": 1})).name == "primary"
+
+    memory_replica.replication_lag = 0.0
+    assert run(replica.check()) is True
+    assert run(read_db.user.find_unique(where={"id": 1})).name == "replica"
+
+
+def test_failing_replica_falls_back_to_primary(memory_db, memory_replica, monkeypatch):
+    run(_seed(memory_db, "primary"))
+
+    async def down(**kwargs):
+        raise ConnectionError("replica down")
+
+    monkeypatch.setattr(memory_replica.user, "find_many", down)
+
+    users = run(read_db.user.find_many(where={}))
+
+    assert [u.name for u in users] == ["primary"]
+    assert not replica.healthy
+    assert replica.stats()["fallbacks"] == 1
+
+
+def test_loader_retries_keys_missing_on_replica_on_primary(memory_db, memory_replica):
+    # 2 sadece primary'de: başka worker'da yeni signin olmuş, replica'ya gelmemiş
+    run(_seed(memory_db, "p1", "p2"))
+    run(_seed(memory_replica, "r1"))
+    retries = user_loader.primary_retries
+
+    users = run(user_loader.load_many([1, 2, 3]))
+
+    assert [u.name if u else None for u in users] == ["r1", "p2", None]
+    assert user_loader.primary_retries == retries + 1
+
+
+def test_loader_batches_are_split_by_route(
+    memory_db, memory_replica, query_budget, monkeypatch
+):
+    run(_seed(memory_db, "p1", "p2"))
+    run(_seed(memory_replica, "r1", "r2"))
+    monkeypatch.setattr(replica, "sticky", 0)
+
+    async def wrote():
+        start_query_stats().wrote = True
+        return await user_controller.get_user(1)
+
+    async def clean():
+        return await user_controller.get_user(2)
+
+    async def scenario():
+        return await asyncio.gather(
+            asyncio.create_task(wrote()), asyncio.create_task(clean())
+        )
+
+    with query_budget(2) as queries:
+        primary_user, replica_user = run(scenario())
+
+    assert primary_user.email == "p1@example.com"
+    assert replica_user.email == "r2@example.com"
+    assert queries.operations == {"user.find_many": 1, "replica.user.find_many": 1}
+
+
+def test_no_replica_means_primary(memory_db):
+    run(_seed(memory_db, "primary"))
+
+    assert replica.client is None
+    assert run(read_db.user.find_unique(where={"id": 1})).name == "primary"
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+from app.modules.user.user_schema import User
+from app.utils import responses
+from app.utils.responses import FastJSONResponse, model_response
+
+
+def test_model_response_validates_dict_once():
+    res = model_response(
+        {"id": 1, "email": "a@b.com", "role": "ADMIN", "key": "k", "name": "x"}, User
+    )
+    # response_model'deki gibi fazla alanlar (name) dışarıda kalır
+    assert res.body == b'{"id":1,"email":"a@b.com","role":"ADMIN","key":"k"}'
+    assert res.media_type == "application/json"
+
+
+def test_fast_json_response_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    res = FastJSONResponse({"ad": "Şule", "n": [1, 2]})
+    assert res.body == '{"ad":"Şule","n":[1,2]}'.encode()
+
+
+def test_fast_json_response_encodes_models_directly():
+    user = User(id=1, email="a@b.com", role="STUDENT", key="k")
+    assert FastJSONResponse(user).body == user.model_dump_json().encode()
+    # orjson tarih/enum gibi tipleri de encode edebilir
+    if responses.orjson is not None:
+        when = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert (
+            FastJSONResponse({"at": when}).body == b'{"at":"2026-01-01T00:00:00+00:00"}'
+        )
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app import db as real_db
+from app.utils import security
+from app.utils.cache import TTLCache
+from app.utils.security import (
+    create_access_token,
+    get_current_principal,
+    get_current_user,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_user_cache(monkeypatch):
+    monkeypatch.setattr(security, "user_cache", TTLCache(maxsize=8, ttl=60))
+    monkeypatch.setattr(security, "token_version_cache", TTLCache(maxsize=8, ttl=60))
+    monkeypatch.setattr(security, "claims_cache", TTLCache(maxsize=8, ttl=60))
+
+
+def counting_find_users(calls):
+    async def find_users(*args, **kwargs):
+        calls.append(kwargs)
+        return [SimpleNamespace(id=7, role="STUDENT", email="c@example.com")]
+
+    return find_users
+
+
+def test_get_current_user_uses_cache(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        real_db.db, "user", SimpleNamespace(find_many=counting_find_users(calls))
+    )
+    token = create_access_token({"sub": "7"})
+
+    first = asyncio.run(get_current_user(token))
+    second = asyncio.run(get_current_user(token))
+
+    assert first is second
+    assert len(calls) == 1
+    stats = security.user_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_invalidate_user_forces_reload(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        real_db.db, "user", SimpleNamespace(find_many=counting_find_users(calls))
+    )
+    token = create_access_token({"sub": "7"})
+
+    asyncio.run(get_current_user(token))
+    security.invalidate_user(7)
+    asyncio.run(get_current_user(token))
+
+    assert len(calls) == 2
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_per_entry_ttl_is_capped_and_skips_expired():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("short", "a", ttl=-1)
+    cache.set("long", "b", ttl=3600)
+
+    assert cache.get("short") is None
+    assert cache._data["long"][0] <= time.monotonic() + 60
+
+
+def test_decode_access_token_caches_claims_until_exp(monkeypatch):
+    decodes = []
+    real_decode = security.jwt_backend.decode
+
+    def counting_decode(token):
+        decodes.append(token)
+        return real_decode(token)
+
+    monkeypatch.setattr(security.jwt_backend, "decode", counting_decode)
+    token = create_access_token({"sub": "7"})
+
+    first = security.decode_access_token(token)
+    first["sub"] = "mutated"
+    second = security.decode_access_token(token)
+
+    assert second["sub"] == "7"
+    assert len(decodes) == 1
+    # exp'e kalan süre kadar tutulur
+    assert security.claims_cache._data[security._token_digest(token)][0] <= (
+        time.monotonic() + second["exp"] - time.time() + 1
+    )
+
+
+def test_decode_access_token_rejects_tampered_token_even_if_original_cached():
+    token = create_access_token({"sub": "7"})
+    security.decode_access_token(token)
+    header, payload, signature = token.split(".")
+    forged = f"{header}.{payload}.{signature[:-2]}AA"
+
+    with pytest.raises(HTTPException) as exc:
+        security.decode_access_token(forged)
+    assert exc.value.status_code == 401
+
+
+def test_claims_principal_skips_db_when_version_cached(monkeypatch):
+    async def find_users(*args, **kwargs):
+        raise AssertionError("claims mode should not hit the database")
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_users))
+    security.token_version_cache.set(7, 3)
+    token = create_access_token({"sub": "7", "role": "ADMIN", "ver": 3})
+
+    principal = asyncio.run(get_current_principal(token))
+
+    assert principal.id == 7 and principal.role == "ADMIN"
+
+
+def test_claims_principal_rejects_stale_version(monkeypatch):
+    async def find_users(*args, **kwargs):
+        return [SimpleNamespace(id=7, role="STUDENT", tokenVersion=4)]
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_users))
+    token = create_access_token({"sub": "7", "role": "ADMIN", "ver": 3})
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_principal(token))
+    assert exc.value.status_code == 401
+
+
+def test_access_token_claims_embeds_role_and_version(monkeypatch):
+    monkeypatch.setattr(security, "AUTH_CLAIMS_MODE", True)
+    user = SimpleNamespace(id=7, role="MEMBER", tokenVersion=2)
+
+    assert security.access_token_claims(user) == {
+        "sub": "7",
+        "role": "MEMBER",
+        "ver": 2,
+    }
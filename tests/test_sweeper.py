@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+from app import db as real_db
+from app.utils.sweeper import Sweeper
+
+
+class FakeTable:
+    """find_many(take=...) + delete_many(id in ...) çağrılarını kaydeden tablo."""
+
+    def __init__(self, rows_by_filter: dict[str, int]):
+        self.remaining = dict(rows_by_filter)
+        self.deletes: list[int] = []
+        self._next_id = 0
+
+    @staticmethod
+    def _key(where: dict) -> str:
+        return ",".join(sorted(where))
+
+    async def find_many(self, where, take):
+        key = self._key(where)
+        count = min(take, self.remaining.get(key, 0))
+        self.remaining[key] = self.remaining.get(key, 0) - count
+        rows = [SimpleNamespace(id=self._next_id + i) for i in range(count)]
+        self._next_id += count
+        return rows
+
+    async def delete_many(self, where):
+        deleted = len(where["id"]["in"])
+        self.deletes.append(deleted)
+        return deleted
+
+
+def test_sweeper_deletes_in_bounded_chunks(monkeypatch):
+    codes = FakeTable({"expiry": 250, "used": 40})
+    tokens = FakeTable({"expiresAt": 0, "revoked,revokedAt": 120})
+    monkeypatch.setattr(real_db.db, "code", codes)
+    monkeypatch.setattr(real_db.db, "refreshtoken", tokens)
+
+    sweeper = Sweeper(interval=0, chunk_size=100)
+    result = asyncio.run(sweeper.run_once())
+
+    assert result.expired_codes == 250
+    assert result.used_codes == 40
+    assert result.expired_refresh_tokens == 0
+    assert result.revoked_refresh_tokens == 120
+    assert max(codes.deletes + tokens.deletes) <= 100
+    assert sweeper.stats()["totalDeleted"] == 410
@@ -1,3 +1,5 @@
+import json
+from datetime import datetime, timezone
 from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from app.main import app
@@ -7,18 +9,20 @@ client = TestClient(app)
 
 
 def test_get_user_found(monkeypatch):
-    async def find_user(*args, **kwargs):
-        return SimpleNamespace(
-            id=5,
-            email="u@example.com",
-            name="U",
-            surname="X",
-            studentNumber="123",
-            role="STUDENT",
-            key="abc",
-        )
+    async def find_users(*args, **kwargs):
+        return [
+            SimpleNamespace(
+                id=5,
+                email="u@example.com",
+                name="U",
+                surname="X",
+                studentNumber="123",
+                role="STUDENT",
+                key="abc",
+            )
+        ]
 
-    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_unique=find_user))
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_users))
 
     res = client.get("/users/5")
     assert res.status_code == 200
@@ -27,30 +31,32 @@ def test_get_user_found(monkeypatch):
 
 
 def test_get_user_not_found(monkeypatch):
-    async def find_user(*args, **kwargs):
-        return None
+    async def find_users(*args, **kwargs):
+        return []
 
-    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_unique=find_user))
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_users))
 
     res = client.get("/users/999")
     assert res.status_code == 404
 
 
 def test_get_team_member_profile(monkeypatch):
-    async def find_tm(*args, **kwargs):
-        return SimpleNamespace(
-            id=5,
-            workAreas=["BACKEND"],
-            photoURL=None,
-            bio="bio",
-            github=None,
-            linkedin=None,
-            extraLinks=[],
-            applicationId=None,
-        )
+    async def find_tms(*args, **kwargs):
+        return [
+            SimpleNamespace(
+                id=5,
+                workAreas=["BACKEND"],
+                photoURL=None,
+                bio="bio",
+                github=None,
+                linkedin=None,
+                extraLinks=[],
+                applicationId=None,
+            )
+        ]
 
     monkeypatch.setattr(
-        real_db.db, "teammember", SimpleNamespace(find_unique=find_tm), raising=False
+        real_db.db, "teammember", SimpleNamespace(find_many=find_tms), raising=False
     )
 
     res = client.get("/users/5/team-member")
@@ -104,3 +110,249 @@ def test_patch_user_success(monkeypatch):
     assert data["id"] == 3
     assert data["email"] == "u@example.com"
     app.dependency_overrides.clear()
+
+
+def _users(ids):
+    return [
+        SimpleNamespace(id=i, email=f"u{i}@example.com", role="STUDENT", key="k")
+        for i in ids
+    ]
+
+
+def test_list_users_keyset_page(monkeypatch):
+    calls = []
+
+    async def find_many(**kwargs):
+        calls.append(kwargs)
+        return _users(range(11, 11 + kwargs["take"]))
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_many))
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+
+    res = client.get("/users", params={"cursor": 10, "limit": 3, "role": "STUDENT"})
+    assert res.status_code == 200
+    data = res.json()
+    assert [u["id"] for u in data["items"]] == [11, 12, 13]
+    assert data["nextCursor"] == 13
+    assert calls[0]["take"] == 4
+    assert calls[0]["where"] == {"deletedAt": None, "role": "STUDENT", "id": {"gt": 10}}
+
+    # eski endpoint de aynı sayfa zarfını döner
+    res = client.get("/prisma-users", params={"cursor": 10, "limit": 3})
+    assert res.status_code == 200
+    assert set(res.json()) == {"items", "nextCursor"}
+    app.dependency_overrides.clear()
+
+
+def test_list_users_requires_admin(monkeypatch):
+    async def find_many(**kwargs):
+        return _users([1])
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_many))
+
+    # liste key alanını da döndüğü için anonim erişim yok
+    assert client.get("/users").status_code == 401
+    assert client.get("/prisma-users").status_code == 401
+
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=5, role="STUDENT"
+    )
+    assert client.get("/users").status_code == 403
+    assert client.get("/prisma-users").status_code == 403
+    app.dependency_overrides.clear()
+
+
+def test_list_users_rejects_oversized_page():
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+    res = client.get("/users", params={"limit": 10_000})
+    assert res.status_code == 422
+    app.dependency_overrides.clear()
+
+
+def test_export_users_streams_ndjson_for_admin(monkeypatch):
+    from app.modules.user import user_controller
+
+    monkeypatch.setattr(user_controller, "USER_EXPORT_CHUNK_SIZE", 2)
+    pages = [_users([1, 2]), _users([3])]
+
+    async def find_many(**kwargs):
+        return pages.pop(0)
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_many))
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+
+    res = client.get("/users/export")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = res.text.strip().split("\n")
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+    app.dependency_overrides.clear()
+
+
+def _versioned_user(**overrides):
+    fields = {
+        "id": 5,
+        "email": "u@example.com",
+        "role": "STUDENT",
+        "key": "abc",
+        "updatedAt": datetime(2026, 10, 18, 9, 0, 0, 123000, tzinfo=timezone.utc),
+    }
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+def test_get_user_etag_and_not_modified(monkeypatch):
+    async def find_users(*args, **kwargs):
+        return [_versioned_user()]
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_users))
+
+    res = client.get("/users/5")
+    etag = res.headers["etag"]
+    assert res.status_code == 200
+    assert etag == '"5-1792314000123"'
+    assert "updatedAt" not in res.json()
+
+    res = client.get("/users/5", headers={"If-None-Match": f"W/{etag}"})
+    assert res.status_code == 304
+    assert res.content == b""
+    assert res.headers["etag"] == etag
+
+
+def test_patch_user_if_match_conditions_update(monkeypatch):
+    calls = []
+
+    async def update(where, data):
+        calls.append(where)
+        return _versioned_user(
+            updatedAt=datetime(2026, 10, 18, 9, 5, tzinfo=timezone.utc)
+        )
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(update=update))
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=5, role="STUDENT"
+    )
+
+    res = client.patch(
+        "/users/5", json={"name": "New"}, headers={"If-Match": '"5-1792314000123"'}
+    )
+    assert res.status_code == 200
+    assert res.headers["etag"] == '"5-1792314300000"'
+    assert calls[0]["updatedAt"] == datetime(
+        2026, 10, 18, 9, 0, 0, 123000, tzinfo=timezone.utc
+    )
+
+    # başka bir istek araya girmiş: koşullu update satır bulamaz
+    async def stale_update(where, data):
+        return None
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(update=stale_update))
+    res = client.patch(
+        "/users/5", json={"name": "New"}, headers={"If-Match": '"5-1792314000123"'}
+    )
+    assert res.status_code == 412
+
+    res = client.patch("/users/5", json={"name": "New"}, headers={"If-Match": '"6-1"'})
+    assert res.status_code == 412
+    app.dependency_overrides.clear()
+
+
+def test_batch_users_single_query_in_requested_order(monkeypatch):
+    calls = []
+
+    async def find_many(**kwargs):
+        calls.append(kwargs)
+        # DB sırası istenen sıradan farklı olabilir
+        return _users(sorted(i for i in kwargs["where"]["id"]["in"] if i != 404))
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_many))
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+
+    res = client.post("/users/batch", json={"ids": [7, 404, 3, 7]})
+    assert res.status_code == 200
+    data = res.json()
+    assert [u["id"] for u in data["items"]] == [7, 3]
+    assert data["missing"] == [404]
+    assert len(calls) == 1
+    app.dependency_overrides.clear()
+
+
+def test_batch_users_requires_admin(monkeypatch):
+    async def find_many(**kwargs):
+        return _users([5])
+
+    monkeypatch.setattr(real_db.db, "user", SimpleNamespace(find_many=find_many))
+
+    assert client.post("/users/batch", json={"ids": [5]}).status_code == 401
+
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=5, role="STUDENT"
+    )
+    assert client.post("/users/batch", json={"ids": [5]}).status_code == 403
+    app.dependency_overrides.clear()
+
+
+def test_batch_users_caps_number_of_ids():
+    from app.modules.user.user_controller import USER_BATCH_MAX_IDS
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+    res = client.post(
+        "/users/batch", json={"ids": list(range(1, USER_BATCH_MAX_IDS + 2))}
+    )
+    assert res.status_code == 422
+    assert client.post("/users/batch", json={"ids": []}).status_code == 422
+    app.dependency_overrides.clear()
+
+
+def test_user_endpoints_query_budget(monkeypatch, query_budget):
+    async def find_many(**kwargs):
+        return [_versioned_user()]
+
+    async def update(where, data):
+        return _versioned_user()
+
+    monkeypatch.setattr(
+        real_db.db, "user", SimpleNamespace(find_many=find_many, update=update)
+    )
+    from app.modules.user.user_router import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=5, role="STUDENT"
+    )
+
+    # update'in döndürdüğü satır kullanılır, ayrıca find_unique yok
+    with query_budget(1):
+        assert client.patch("/users/5", json={"name": "New"}).status_code == 200
+    with query_budget(1):
+        assert client.get("/users/5").status_code == 200
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, role="ADMIN"
+    )
+    with query_budget(1):
+        assert client.post("/users/batch", json={"ids": [5, 6, 7]}).status_code == 200
+    app.dependency_overrides.clear()